@@ -1,29 +1,105 @@
 import gradio as gr
 import os
-from crewai import Agent, Task
-from src.agents import AgentFactory
-from src.crew import CrewFactory
-from config.llm_config import get_llm
+import threading
+from config.performance_config import (
+    RESULT_CACHE_CONFIG, WORKER_POOL_CONFIG, VALIDATION_CONFIG, CHECKPOINT_CONFIG, COMPACTION_CONFIG,
+    EXECUTION_MODE_CONFIG, TELEMETRY_CONFIG, STARTUP_CONFIG, ADMISSION_CONFIG, PRECOMPUTE_CONFIG
+)
+from src.result_store import ResultStore, make_result_key, result_tier, get_prompt_config_hash
+from src.checkpoints import CheckpointStore
+from utils.title_index import normalize_title
+from src.worker_pool import CrewWorkerPool, QueueFullError, CrewCancelledError
+from src.admission import AdmissionController, AdmissionRejected
+from src.precompute import PrecomputeJob
+from src.validation import TitleValidator
+from src.progress import ProgressReporter, format_progress, format_wait, format_queue, install_token_streaming
+from utils.rate_limiter import get_rate_limiter
 from utils.retry_utils import retry_on_exception
+from utils.readiness import Readiness
+from utils.telemetry import (
+    Trace, span, record_cache, mark_tasks_started, register_gauge, register_readiness, configure_trace_log,
+    start_metrics_server
+)
+
+# CrewAI, crewai_tools and LiteLLM take seconds to import, so the modules that need them
+# (config.llm_config, src.agents, src.crew, src.compaction, src.fast_pipeline) are imported
+# by the warm-up thread and inside the functions that use them
+
+# Default model, used to check the configuration at startup
+MODEL_NAME = "openai/gpt-4.1-nano"
+
+# Models of every agent profile; part of the result cache key (set during warm-up)
+MODEL_SIGNATURE = None
 
-# Initialize variables for dynamic LLM configuration
-llm = None
-agent_factory = None
-crew_factory = None
+# Pool of crew workers; each worker builds its own LLM, agents and tools
+worker_pool = None
+
+# Cheap pre-flight check run before any crew is built (None when disabled)
+title_validator = None
+
+# Bounded queue in front of new crew runs, with positions and wait estimates (None when disabled)
+admission = None
+if ADMISSION_CONFIG["enabled"]:
+    admission = AdmissionController.from_config(ADMISSION_CONFIG)
+    register_gauge("insight_admission_running", "Crew runs holding an admission slot.", lambda: admission.running)
+    register_gauge("insight_admission_queued", "Requests waiting in the admission queue.", lambda: admission.queued)
+
+def create_crew_factory(verbose=True):
+    """Create an isolated LLM, agent factory, and crew factory for one crew worker."""
+    from config.llm_config import get_profile_llm
+    from src.agents import AgentFactory
+    from src.crew import CrewFactory
+    from src.compaction import ResearchCompactor
+    from src.fast_pipeline import FastPipeline
+    
+    # Stream completions when CrewAI exposes token events, so the UI can show them live
+    stream = install_token_streaming()
+    
+    # Each agent gets the model of its profile: small models for research, a bigger one for synthesis
+    agent_llms = {
+        name: get_profile_llm(name, verbose=verbose, stream=stream)
+        for name in ("info_gatherer", "insight_analyst", "discussion_facilitator")
+    }
+    
+    # Create agent factory
+    agent_factory = AgentFactory(agent_llms["info_gatherer"], agent_llms=agent_llms)
+    
+    # Condense research before the later tasks read it
+    compactor = None
+    if COMPACTION_CONFIG["enabled"]:
+        compaction_llm = get_profile_llm("research_compaction", verbose=verbose)
+        compactor = ResearchCompactor(compaction_llm, max_tokens=compaction_llm.max_tokens)
+    
+    # Single-call pipeline for the "fast" and "auto" modes, grounded by one batched research fetch
+    fast_llm = get_profile_llm("fast_pipeline", verbose=verbose, stream=stream)
+    research_tool = agent_factory.research_tool if EXECUTION_MODE_CONFIG["fast_research"] else None
+    fast_pipeline = FastPipeline(fast_llm, research_tool=research_tool)
+    
+    # Create crew factory
+    return CrewFactory(agent_factory, compactor=compactor, fast_pipeline=fast_pipeline)
 
 def initialize_llm(verbose=True):
-    """Initialize the LLM, agent factory, and crew factory with GPT-4o."""
-    global llm, agent_factory, crew_factory
+    """Check the LLM configuration and start the crew worker pool."""
+    global worker_pool, title_validator
     
     try:
-        # Initialize GPT-4.1-nano LLM
-        llm = get_llm(provider="openai", model_name="openai/gpt-4.1-nano", verbose=verbose)
+        from config.llm_config import get_llm, get_profile_llm
+        
+        # Fail early on configuration problems such as a missing API key
+        get_llm(provider="openai", model_name=MODEL_NAME, verbose=verbose)
         
-        # Create agent factory
-        agent_factory = AgentFactory(llm)
+        if VALIDATION_CONFIG["enabled"]:
+            validation_llm = get_profile_llm("title_validation", verbose=verbose)
+            title_validator = TitleValidator.from_config(VALIDATION_CONFIG, validation_llm)
         
-        # Create crew factory
-        crew_factory = CrewFactory(agent_factory)
+        worker_pool = CrewWorkerPool(
+            lambda: create_crew_factory(verbose=verbose),
+            num_workers=WORKER_POOL_CONFIG["num_workers"],
+            max_queue=WORKER_POOL_CONFIG["max_queue"],
+            request_timeout=WORKER_POOL_CONFIG["request_timeout_seconds"]
+        )
+        register_gauge("insight_crew_jobs_queued", "Requests waiting for a crew worker.", lambda: worker_pool.queued)
+        register_gauge("insight_crew_jobs_active", "Requests running on a crew worker.", lambda: worker_pool.active)
         
         return True, "LLM initialized successfully"
         
@@ -36,24 +112,160 @@ def initialize_llm(verbose=True):
         traceback.print_exc()
         return False, error_message
 
-# Initialize with GPT-4o
-initialize_llm()
+# Persistent result cache in front of the crew (None when disabled or unavailable)
+result_store = None
+
+# Per-task checkpoints so retries and re-runs resume from the last finished task
+checkpoint_store = None
+
+# Background analyses of popular titles (None until started, or when disabled)
+precompute_job = None
 
-@retry_on_exception(max_retries=5, initial_delay=5.0, backoff_factor=3.0)
-def run_insight_facilitator_crew(media_title, media_type="book or movie", verbose=True):
-    """Run an Insight Facilitator crew for a book or movie."""
+# Start-up progress; the UI binds before the LLMs, worker pool and caches exist
+readiness = Readiness()
+register_readiness(lambda: (readiness.ready, readiness.status()))
+register_gauge("insight_ready", "1 once start-up has finished and analyses can run.",
+               lambda: 1.0 if readiness.ready else 0.0)
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+
+def warm_up(verbose=True):
+    """Import the crew modules, then build the LLM check, worker pool and caches."""
+    global MODEL_SIGNATURE, result_store, checkpoint_store
+    
+    try:
+        with readiness.step("import_crew_modules"):
+            from config.llm_config import get_model_signature
+            import src.agents, src.crew, src.fast_pipeline
+        MODEL_SIGNATURE = get_model_signature()
+        
+        with readiness.step("open_caches"):
+            if RESULT_CACHE_CONFIG["enabled"]:
+                try:
+                    result_store = ResultStore.from_config(RESULT_CACHE_CONFIG, MODEL_SIGNATURE)
+                except Exception as e:
+                    print(f"Result cache disabled: {str(e)}")
+            if CHECKPOINT_CONFIG["enabled"]:
+                try:
+                    checkpoint_store = CheckpointStore.from_config(CHECKPOINT_CONFIG)
+                except Exception as e:
+                    print(f"Task checkpoints disabled: {str(e)}")
+        
+        with readiness.step("initialize_llm"):
+            initialized, message = initialize_llm(verbose=verbose)
+        if not initialized:
+            raise RuntimeError(message)
+        readiness.mark_ready()
+        print(f"Analysis service ready after {readiness.ready_after:.1f}s: {readiness.steps}")
+    except Exception as e:
+        readiness.mark_failed(e)
+
+def start_warmup(verbose=True):
+    """Run warm_up on a background thread, unless it is running or has succeeded."""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is not None and readiness.state == "failed" and not _warmup_thread.is_alive():
+            # A failed start-up (e.g. a missing key fixed since) is retried by the next request
+            readiness.reset()
+            _warmup_thread = None
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=warm_up, kwargs={"verbose": verbose}, name="warm-up", daemon=True)
+            _warmup_thread.start()
+
+def ensure_ready(timeout=None):
+    """Start the warm-up if needed and wait for it, returning True once analyses can run."""
+    start_warmup()
+    return readiness.wait(STARTUP_CONFIG["ready_timeout_seconds"] if timeout is None else timeout)
+
+if not STARTUP_CONFIG["lazy"]:
+    # Eager start-up: everything is built before the UI is created
+    ensure_ready()
+
+def request_key_for(media_title, media_type, mode="deep"):
+    """Return the key shared by a request's cached result and, for deep runs, its task checkpoints."""
+    if result_store is not None:
+        return result_store.key_for(media_title, media_type, mode)
+    return make_result_key(normalize_title(media_title), media_type, MODEL_SIGNATURE, get_prompt_config_hash(),
+                           result_tier(mode))
+
+# Jittered backoff that honours Retry-After, stays within the request's time budget,
+# and fails fast while OpenAI keeps failing for every crew in the process
+@retry_on_exception(max_retries=5, initial_delay=5.0, backoff_factor=3.0, max_delay=60.0, jitter="full",
+                    deadline=WORKER_POOL_CONFIG["request_timeout_seconds"], circuit_breaker="openai")
+def run_insight_facilitator_crew(crew_factory, media_title, media_type="book or movie", verbose=True,
+                                 reporter=None, job=None):
+    """Run an Insight Facilitator crew for a book or movie, resuming from saved task outputs."""
     print(f"Starting analysis of {media_type}: {media_title}")
     
+    # Every attempt reloads checkpoints, so a retry skips the tasks that already finished
+    completed_outputs = {}
+    checkpoint_callback = None
+    if checkpoint_store is not None:
+        request_key = request_key_for(media_title, media_type)
+        completed_outputs = checkpoint_store.load(request_key, upto="create_questions")
+        checkpoint_callback = lambda task_name, output: checkpoint_store.save(request_key, task_name, output)
+        if completed_outputs:
+            print(f"Resuming after completed tasks: {', '.join(completed_outputs)}")
+    
+    task_callback = None
+    step_callback = None
+    if reporter is not None:
+        reporter.started(completed_stages=len(completed_outputs))
+        task_callback = reporter.task_completed
+    if job is not None:
+        # Stop between agent steps once the request is cancelled or out of time
+        job.check_cancelled()
+        step_callback = job.check_cancelled
+    
     # Create an Insight Facilitator crew with the specific media type
-    insight_crew = crew_factory.create_insight_facilitator_crew(media_title, media_type=media_type, verbose=verbose)
+    insight_crew = crew_factory.create_insight_facilitator_crew(
+        media_title, media_type=media_type, verbose=verbose,
+        task_callback=task_callback, step_callback=step_callback,
+        completed_outputs=completed_outputs, checkpoint_callback=checkpoint_callback
+    )
     
     # Run the crew
     print("Insight Facilitator crew created, starting kickoff...")
-    result = insight_crew.kickoff()
+    mark_tasks_started()
+    with span("crew", "kickoff", resumed_tasks=len(completed_outputs)):
+        result = insight_crew.kickoff()
     print("Insight Facilitator analysis completed successfully")
     
     return result
 
+@retry_on_exception(max_retries=3, initial_delay=5.0, backoff_factor=3.0, max_delay=60.0, jitter="full",
+                    deadline=WORKER_POOL_CONFIG["request_timeout_seconds"], circuit_breaker="openai")
+def run_fast_analysis(crew_factory, media_title, media_type="book or movie", reporter=None, job=None):
+    """Write the discussion questions in a single pass, without the three-agent crew."""
+    print(f"Starting fast analysis of {media_type}: {media_title}")
+    if job is not None:
+        job.check_cancelled()
+    with span("crew", "fast_pipeline"):
+        return crew_factory.fast_pipeline.run(media_title, media_type=media_type, reporter=reporter, job=job)
+
+def run_analysis(crew_factory, media_title, media_type, mode="deep", reporter=None, job=None):
+    """Run the selected execution mode, escalating from fast to the full crew when needed."""
+    from src.fast_pipeline import check_questions_output
+    
+    fast_pipeline = crew_factory.fast_pipeline
+    # Without research the fast answer has no Sources and auto would always escalate
+    if fast_pipeline is not None and (mode == "fast" or (mode == "auto" and fast_pipeline.can_research)):
+        result = str(run_fast_analysis(crew_factory, media_title, media_type=media_type, reporter=reporter, job=job))
+        problem = None if "VALIDATION_FAILED" in result else check_questions_output(result)
+        if problem is None or mode == "fast":
+            return result
+        print(f"Fast analysis of {media_title} rejected ({problem}); escalating to the full crew")
+    return run_insight_facilitator_crew(crew_factory, media_title, media_type=media_type, reporter=reporter, job=job)
+
+def parse_mode(mode_label):
+    """Map a UI mode label such as "⚡ Fast" to an execution mode."""
+    from src.fast_pipeline import EXECUTION_MODES
+    
+    for mode in EXECUTION_MODES:
+        if mode_label and mode in mode_label.lower():
+            return mode
+    return EXECUTION_MODE_CONFIG["default_mode"] if EXECUTION_MODE_CONFIG["default_mode"] in EXECUTION_MODES else "deep"
+
 # Create a simple theme with minimal customization
 theme = gr.themes.Soft(
     primary_hue="blue",
@@ -67,21 +279,189 @@ css_path = os.path.join(os.path.dirname(__file__), "static", "styles.css")
 with open(css_path, "r") as f:
     custom_css = f.read()
 
-# Function to generate insights
-def generate_insights(title, media_type):
-    """Generate insights and discussion questions for the given title"""
+def _wait_for_admission(reporter, tickets, mode):
+    """Take an admission ticket and wait in line for a running slot, reporting the position."""
+    ticket = admission.admit(mode)
+    tickets.append(ticket)
+    position = ticket.position()
+    while position is not None:
+        if reporter is not None:
+            reporter.queued(position, ticket.estimated_wait())
+        ticket.wait(1.0)
+        position = ticket.position()
+    if ticket.cancelled:
+        raise CrewCancelledError("The request was cancelled while waiting in line")
+    return ticket
+
+def _run_with_cache(title, media_type, reporter, jobs, tickets=None, regenerate=False, mode="deep", cancelled=None):
+    """
+    Run the analysis on the worker pool, going through the result cache when enabled.
+    
+    With a tickets list and admission control, the caller that starts the crew run waits
+    for an admission slot first; callers sharing its run never take one.
+    """
+    def run():
+        if worker_pool is None:
+            raise RuntimeError("The analysis service is not available. Please check the server configuration.")
+        
+        def crew_job(crew_factory, job):
+            if reporter is not None:
+                reporter.activate()
+            return run_analysis(
+                crew_factory, title, media_type=media_type, mode=mode, reporter=reporter, job=job
+            )
+        
+        ticket = None
+        if admission is not None and tickets is not None:
+            ticket = _wait_for_admission(reporter, tickets, mode)
+        completed = False
+        try:
+            job = worker_pool.submit(crew_job)
+            jobs.append(job)
+            result = job.result()
+            completed = True
+            return result
+        finally:
+            if ticket is not None:
+                ticket.release(completed=completed)
+    
+    if result_store is None:
+        return str(run()), False
+    # A regeneration or refresh replaces the cached result, still as the one run other callers share
+    return result_store.get_or_run(title, media_type, run, mode=mode, cancelled=cancelled, force=regenerate)
+
+def _stream_analysis(title, media_type, regenerate=False, mode_label=None, session_id=None):
+    """Run or fetch an analysis, yielding progress, streamed tokens and the final result"""
+    claimed_session = False
     try:
         if not title or title.strip() == "":
-            return "Please enter a book or movie title."
+            yield "Please enter a book or movie title."
+            return
+        
+        # One request at a time per browser session; repeated clicks are dropped
+        if admission is not None:
+            if not admission.claim_session(session_id):
+                yield "Your previous request is still running. Its results will appear here when it finishes."
+                return
+            claimed_session = True
+        
+        # Requests that arrive during start-up wait for the warm-up thread
+        if not readiness.ready:
+            start_warmup()
+            yield format_progress(0, "Starting up the analysis service...")
+            if not readiness.wait(STARTUP_CONFIG["ready_timeout_seconds"]):
+                reason = readiness.error or "start-up is taking longer than expected"
+                yield f"The analysis service is not available ({reason}). Please try again shortly."
+                return
         
         # Strip emoji from media_type
         clean_media_type = "Book" if "Book" in media_type else "Movie"
-            
-        print(f"Starting analysis of {clean_media_type}: {title}")
-        # Pass the specific media type to the crew factory
-        result = run_insight_facilitator_crew(title, media_type=clean_media_type)
+        # Regenerating always runs the full crew: only it resumes from the research and insights checkpoints
+        mode = "deep" if regenerate else parse_mode(mode_label)
+        
+        # One trace per request: spans, tokens, cache results and retries, logged as JSON at the end
+        trace = Trace(title=title.strip(), media_type=clean_media_type, mode=mode, regenerate=regenerate)
+        
+        # Cache hits are served immediately without starting a worker
+        if result_store is not None and not regenerate:
+            cached = result_store.get(title, clean_media_type, mode)
+            record_cache("result", cached is not None, trace=trace)
+            if cached is not None:
+                print(f"Served {clean_media_type}: {title} from the result cache")
+                if TELEMETRY_CONFIG["enabled"]:
+                    trace.finish("ok")
+                yield cached
+                return
         
-        return result
+        # Reject titles that are not real books or movies before building any agents
+        if title_validator is not None:
+            yield format_progress(0, "Checking the title...")
+            with span("validation", "title"):
+                check = title_validator.validate(title, clean_media_type)
+            record_cache("validation", check.cached, trace=trace)
+            if not check.valid:
+                if TELEMETRY_CONFIG["enabled"]:
+                    trace.finish("invalid_title")
+                yield check.message
+                return
+        
+        print(f"Starting analysis of {clean_media_type}: {title} (request {trace.request_id})")
+        reporter = ProgressReporter()
+        jobs = []
+        tickets = []
+        disconnected = threading.Event()
+        
+        def work():
+            # The worker job copies this thread's context, so its spans land in this trace
+            trace.activate()
+            try:
+                # Only a request that starts a new crew run waits for an admission slot
+                result, _ = _run_with_cache(title, clean_media_type, reporter, jobs, tickets, regenerate=regenerate,
+                                            mode=mode, cancelled=disconnected)
+                if title_validator is not None and "VALIDATION_FAILED" not in result:
+                    title_validator.mark_valid(title, clean_media_type)
+                if TELEMETRY_CONFIG["enabled"]:
+                    trace.finish("validation_failed" if "VALIDATION_FAILED" in result else "ok")
+                reporter.finish(result)
+            except Exception as e:
+                if TELEMETRY_CONFIG["enabled"]:
+                    status = "rejected" if isinstance(e, AdmissionRejected) else "error"
+                    trace.finish(status, error=f"{type(e).__name__}: {str(e)}")
+                reporter.fail(e)
+        
+        note = "Waiting for the crew to start (an identical request may already be running)..."
+        if admission is not None:
+            # Where this request will join the line; updated once it has a ticket
+            busy = admission.queued > 0 or admission.running >= admission.max_running
+            position = admission.queued if busy else None
+            note = format_queue(position, admission.estimate_wait(admission.queued) if busy else 0.0,
+                                admission.typical_run_seconds(mode))
+        threading.Thread(target=work, name="insight-request", daemon=True).start()
+        llm_limiter = get_rate_limiter("llm")
+        if llm_limiter is not None and llm_limiter.estimated_wait() >= 1.0:
+            note = format_wait("llm", llm_limiter.estimated_wait())
+        yield format_progress(0, note)
+        
+        streamed = ""
+        try:
+            for kind, payload in reporter:
+                if kind == "started":
+                    streamed = ""
+                    yield format_progress(payload)
+                elif kind == "task":
+                    yield format_progress(reporter.completed_stages)
+                elif kind == "wait":
+                    yield format_progress(reporter.completed_stages, format_wait(*payload))
+                elif kind == "queued":
+                    yield format_progress(0, format_queue(*payload, admission.typical_run_seconds(mode)))
+                elif kind == "token":
+                    # Final questions arrive token by token once the last agent starts answering
+                    streamed += payload
+                    yield streamed
+                elif kind == "done":
+                    yield payload
+                elif kind == "error":
+                    raise payload
+        finally:
+            # The browser disconnected or the run ended: stop waiting on a run shared with others,
+            # and stop our own crew (or give up the place in line) once nobody else is waiting for it
+            disconnected.set()
+            cancel = None
+            if jobs and not jobs[0].future.done():
+                cancel = jobs[0].cancel
+            elif tickets and not tickets[0].running and not tickets[0].released:
+                cancel = tickets[0].cancel
+            if cancel is not None:
+                def stop():
+                    print(f"Cancelling analysis of {clean_media_type}: {title}")
+                    cancel()
+                if result_store is None:
+                    stop()
+                else:
+                    result_store.abandon(title, clean_media_type, stop, mode=mode)
+    except (QueueFullError, TimeoutError, AdmissionRejected) as e:
+        print(f"Analysis of {title} not completed: {str(e)}")
+        yield str(e)
     except Exception as e:
         import traceback
         error_message = f"Error generating insights: {str(e)}"
@@ -91,7 +471,103 @@ def generate_insights(title, media_type):
         # Provide more user-friendly error message
         error_msg = f"Error: {str(e)}. Please try again or try a different title."
         print(error_msg)
-        return error_msg
+        yield error_msg
+    finally:
+        if claimed_session:
+            admission.release_session(session_id)
+
+def analyze_title(title, media_type, mode="deep", refresh=False, precompute=False):
+    """
+    Run or fetch one analysis without streaming, as batch and precompute jobs do.
+
+    Args:
+        refresh: Run even if a result is cached, replacing it (used before a result expires).
+        precompute: Mark the trace as a background precompute rather than a batch run.
+
+    Returns:
+        A (status, result) tuple; status is "ok", "cached", "invalid_title" or "validation_failed".
+        Errors are raised to the caller.
+    """
+    if not ensure_ready():
+        raise RuntimeError(f"The analysis service is not available: {readiness.error or 'start-up timed out'}")
+    origin = {"precompute": True} if precompute else {"batch": True}
+    trace = Trace(title=title, media_type=media_type, mode=mode, refresh=refresh, **origin)
+    if result_store is not None and not refresh:
+        cached = result_store.get(title, media_type, mode)
+        record_cache("result", cached is not None, trace=trace)
+        if cached is not None:
+            if TELEMETRY_CONFIG["enabled"]:
+                trace.finish("ok")
+            return "cached", cached
+    
+    if title_validator is not None:
+        with span("validation", "title"):
+            check = title_validator.validate(title, media_type)
+        record_cache("validation", check.cached, trace=trace)
+        if not check.valid:
+            if TELEMETRY_CONFIG["enabled"]:
+                trace.finish("invalid_title")
+            return "invalid_title", check.message
+    
+    trace.activate()
+    try:
+        result, _ = _run_with_cache(title, media_type, None, [], regenerate=refresh, mode=mode)
+    except Exception as e:
+        if TELEMETRY_CONFIG["enabled"]:
+            trace.finish("error", error=f"{type(e).__name__}: {str(e)}")
+        raise
+    status = "validation_failed" if "VALIDATION_FAILED" in result else "ok"
+    if title_validator is not None and status == "ok":
+        title_validator.mark_valid(title, media_type)
+    if TELEMETRY_CONFIG["enabled"]:
+        trace.finish(status)
+    return status, result
+
+def _claim_idle_capacity():
+    """Return a release callable if a background run may start now without delaying users, else None."""
+    reserve = PRECOMPUTE_CONFIG["reserve_slots"]
+    if admission is not None:
+        ticket = admission.try_admit_idle(reserve, PRECOMPUTE_CONFIG["mode"])
+        # Background runs do not count towards the run-time estimate users see
+        return None if ticket is None else (lambda: ticket.release(completed=False))
+    if worker_pool is not None and worker_pool.queued == 0 and worker_pool.active + 1 + reserve <= worker_pool.num_workers:
+        return lambda: None
+    return None
+
+def start_precompute():
+    """Start the background job that keeps popular titles in the result store."""
+    global precompute_job
+    if not PRECOMPUTE_CONFIG["enabled"] or precompute_job is not None:
+        return
+    
+    def analyze(title, media_type, refresh):
+        status, _ = analyze_title(title, media_type, mode=PRECOMPUTE_CONFIG["mode"], refresh=refresh, precompute=True)
+        return status
+    
+    def stored_at(title, media_type):
+        if result_store is None:
+            return None
+        return result_store.stored_at(title, media_type, PRECOMPUTE_CONFIG["mode"])
+    
+    precompute_job = PrecomputeJob.from_config(PRECOMPUTE_CONFIG, analyze, stored_at, _claim_idle_capacity,
+                                               ttl_seconds=RESULT_CACHE_CONFIG["ttl_seconds"])
+    register_gauge("insight_precompute_runs", "Background precompute analyses that stored a new result since start-up.",
+                   lambda: float(precompute_job.counts["computed"] + precompute_job.counts["refreshed"]))
+    # Without a result store there is nowhere to keep precomputed results
+    precompute_job.start(wait_ready=lambda: ensure_ready() and result_store is not None)
+    print(f"Background precompute every {PRECOMPUTE_CONFIG['interval_seconds']}s "
+          f"for up to {PRECOMPUTE_CONFIG['max_titles']} titles")
+
+# Function to generate insights
+def generate_insights(title, media_type, mode_label=None, request: gr.Request = None):
+    """Generate insights and discussion questions for the given title"""
+    session_id = getattr(request, "session_hash", None)
+    yield from _stream_analysis(title, media_type, mode_label=mode_label, session_id=session_id)
+
+def regenerate_questions(title, media_type, request: gr.Request = None):
+    """Write new discussion questions, reusing the saved research and insights when available"""
+    session_id = getattr(request, "session_hash", None)
+    yield from _stream_analysis(title, media_type, regenerate=True, session_id=session_id)
 
 
 
@@ -120,17 +596,32 @@ with gr.Blocks(title="Insight Facilitator", theme=theme, css=custom_css) as demo
             show_label=False
         )
         
+        # Auto answers in one pass and falls back to the full three-agent crew when needed
+        mode_labels = {"auto": "✨ Auto", "fast": "⚡ Fast", "deep": "🔍 Deep"}
+        execution_mode = gr.Radio(
+            list(mode_labels.values()),
+            label="",
+            value=mode_labels.get(EXECUTION_MODE_CONFIG["default_mode"], mode_labels["deep"]),
+            show_label=False
+        )
+        
         insight_button = gr.Button(
             "Generate Insights & Discussion Questions", 
             variant="primary",
             size="lg"
         )
+        
+        regenerate_button = gr.Button(
+            "Regenerate Questions",
+            variant="secondary",
+            size="sm"
+        )
 
     # Results section
     with gr.Group():
         gr.Markdown("<h3 class='section-heading'>Results</h3>")
         insight_output = gr.Textbox(
-            value="Insights and discussion questions will appear here in ~30 seconds after you click the button...", 
+            value="Insights and discussion questions will appear here after you click the button, with your place in line and an estimated time while you wait...", 
             lines=15, 
             show_label=False,
             container=False
@@ -147,15 +638,41 @@ with gr.Blocks(title="Insight Facilitator", theme=theme, css=custom_css) as demo
     """)
 
     # Connect UI components to functions
+    # Let enough requests through to fill the crew workers and their queue; cache hits are cheap.
+    # With admission control the app queues and rejects crew runs itself, so Gradio does not limit
+    # them and every request sees its own place in line
+    crew_concurrency = WORKER_POOL_CONFIG["num_workers"] + WORKER_POOL_CONFIG["max_queue"]
+    if admission is not None:
+        crew_concurrency = None
     insight_button.click(
         fn=generate_insights,
+        inputs=[media_title, media_type, execution_mode],
+        outputs=[insight_output],
+        concurrency_limit=crew_concurrency,
+        concurrency_id="crew"
+    )
+    
+    # Always a deep run, which re-runs only the final task when research and insights are checkpointed
+    regenerate_button.click(
+        fn=regenerate_questions,
         inputs=[media_title, media_type],
-        outputs=[insight_output]
+        outputs=[insight_output],
+        concurrency_limit=crew_concurrency,
+        concurrency_id="crew"
     )
 
 # Launch the app
 if __name__ == "__main__":
     import os
+    if TELEMETRY_CONFIG["enabled"]:
+        configure_trace_log(TELEMETRY_CONFIG["trace_log_path"])
+    if TELEMETRY_CONFIG["metrics_enabled"]:
+        # Prometheus scrapes /metrics on its own port next to the Gradio app
+        start_metrics_server(TELEMETRY_CONFIG["metrics_host"], TELEMETRY_CONFIG["metrics_port"])
+    # Build the crews in the background while the UI binds; /ready reports when they are done
+    start_warmup()
+    # Keeps popular titles warm on capacity interactive users leave idle
+    start_precompute()
     # Check if running on Hugging Face Spaces
     if "SPACE_ID" in os.environ:
         demo.launch()
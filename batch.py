@@ -0,0 +1,178 @@
+"""
+Batch analysis of many titles from the command line.
+
+Reads (title, media_type) rows from a CSV file (with a "title" column and an
+optional "media_type" column) or a JSONL file, runs them concurrently through
+the same worker pool, caches and rate limiters as the web app, and appends one
+JSON line per finished title to the output file as soon as it completes.
+Re-running with the same output file resumes: titles already written with a
+final status are skipped, and titles that failed are tried again.
+
+Usage:
+    python batch.py titles.csv results.jsonl [--media-type Book] [--mode auto|fast|deep] [--concurrency N]
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Statuses that count as done when resuming; errors are retried
+FINAL_STATUSES = ("ok", "cached", "invalid_title", "validation_failed")
+
+
+def parse_media_type(value, default="Book"):
+    """Map free-form media types such as "movie", "Film" or "🎬 Movie" to Book or Movie."""
+    value = (value or default).lower()
+    return "Movie" if "movie" in value or "film" in value else "Book"
+
+
+def read_titles(path, default_media_type="Book"):
+    """Read (title, media_type) pairs from a CSV or JSONL file, skipping blank titles."""
+    rows = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f)
+        for record in records:
+            fields = {str(key).strip().lower(): value for key, value in record.items() if key}
+            title = (fields.get("title") or "").strip()
+            if title:
+                rows.append((title, parse_media_type(fields.get("media_type") or fields.get("type"),
+                                                     default_media_type)))
+    return rows
+
+
+def read_completed(path):
+    """Return the keys already written to the output file with a final status."""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by a crash is retried
+                continue
+            if record.get("status") in FINAL_STATUSES:
+                completed.add(record["key"])
+    return completed
+
+
+class ResultWriter:
+    """Appends result lines to a JSONL file from many threads, flushing each one to disk."""
+
+    def __init__(self, path):
+        # Start on a fresh line after a line cut short by a crash
+        with open(path, "ab+") as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or JSONL file of titles")
+    parser.add_argument("output", help="JSONL file results are appended to")
+    parser.add_argument("--media-type", default="Book", help="media type for rows without one (default Book)")
+    parser.add_argument("--mode", choices=("auto", "fast", "deep"), default=None,
+                        help="execution mode (default EXECUTION_MODE)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="titles analysed at once (default CREW_WORKERS)")
+    args = parser.parse_args(argv)
+
+    # Imported here so --help works without the app's dependencies and API keys
+    import app
+    from config.performance_config import WORKER_POOL_CONFIG, TELEMETRY_CONFIG
+    from utils.telemetry import configure_trace_log
+
+    if not app.ensure_ready():
+        print(f"The analysis service is not available: {app.readiness.error or 'start-up timed out'}")
+        return 1
+    if TELEMETRY_CONFIG["enabled"]:
+        configure_trace_log(TELEMETRY_CONFIG["trace_log_path"])
+
+    mode = args.mode or app.parse_mode(None)
+    # More titles at once than the pool can hold would be rejected with QueueFullError
+    concurrency = min(args.concurrency or WORKER_POOL_CONFIG["num_workers"],
+                      WORKER_POOL_CONFIG["num_workers"] + WORKER_POOL_CONFIG["max_queue"])
+
+    # One run per request key; titles already finished in an earlier run are skipped
+    completed = read_completed(args.output)
+    pending, seen = [], set()
+    for title, media_type in read_titles(args.input, parse_media_type(args.media_type)):
+        key = app.request_key_for(title, media_type, mode)
+        if key not in seen and key not in completed:
+            pending.append((key, title, media_type))
+        seen.add(key)
+    skipped = len(seen) - len(pending)
+    print(f"{len(pending)} titles to analyse ({skipped} already done) in {mode} mode, {concurrency} at a time")
+
+    writer = ResultWriter(args.output)
+    counts = {}
+    start = time.monotonic()
+
+    def analyse(key, title, media_type):
+        started = time.monotonic()
+        record = {"key": key, "title": title, "media_type": media_type, "mode": mode}
+        try:
+            record["status"], record["result"] = app.analyze_title(title, media_type, mode=mode)
+        except Exception as e:
+            record["status"], record["error"] = "error", f"{type(e).__name__}: {str(e)}"
+        record["duration"] = round(time.monotonic() - started, 2)
+        record["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        writer.write(record)
+        return record
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+    futures = [executor.submit(analyse, *item) for item in pending]
+    try:
+        for done, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+            elapsed = time.monotonic() - start
+            rate = done / elapsed * 60
+            eta = format_duration((len(pending) - done) / done * elapsed)
+            print(f"[{done}/{len(pending)}] {record['status']:<17} {record['title']} ({record['media_type']}) "
+                  f"in {record['duration']:.1f}s | {rate:.1f} titles/min, ETA {eta}")
+    except KeyboardInterrupt:
+        print("Interrupted; waiting for the running titles to be saved (press Ctrl+C again to quit now).")
+        executor.shutdown(wait=True, cancel_futures=True)
+        writer.close()
+        return 130
+    executor.shutdown()
+    writer.close()
+
+    elapsed = time.monotonic() - start
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items())) or "nothing to do"
+    print(f"Finished in {format_duration(elapsed)}: {summary}")
+    return 1 if counts.get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
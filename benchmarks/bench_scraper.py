@@ -0,0 +1,107 @@
+"""
+Microbenchmark: streaming HTML extraction vs. the original BeautifulSoup path.
+
+Usage:
+    python -m benchmarks.bench_scraper [saved_page.html ...] [--repeat N] [--max-chars N]
+
+Without arguments, every *.html file in benchmarks/pages/ is used; if there are
+none, a synthetic multi-megabyte page is generated.
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import tracemalloc
+from tools.html_extractor import extract_text_streaming
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+CHUNK_SIZE = 16384
+
+
+def baseline_extract(html_bytes, max_content_length):
+    """The extraction EnhancedScrapeWebsiteTool used before streaming: full tree, then truncate."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_bytes.decode("utf-8", errors="replace"), "html.parser")
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text(separator="\n", strip=True)
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = "\n".join(chunk for chunk in chunks if chunk)
+    if len(text) > max_content_length:
+        text = text[:max_content_length] + "\n\n[Content truncated due to length...]\n"
+    return text
+
+
+def streaming_extract(html_bytes, max_content_length):
+    """The current streaming extraction, fed in network-sized chunks."""
+    chunks = (html_bytes[i:i + CHUNK_SIZE] for i in range(0, len(html_bytes), CHUNK_SIZE))
+    return extract_text_streaming(chunks, max_chars=max_content_length).text
+
+
+def synthetic_page(target_bytes=3 * 1024 * 1024):
+    """Build a large page shaped like an encyclopedia article with heavy chrome."""
+    parts = ["<html><head><title>Synthetic Page</title><style>", "body{margin:0}" * 2000, "</style></head><body>"]
+    parts.append("<nav>" + "".join(f"<a href='/link{i}'>Link {i}</a>" for i in range(3000)) + "</nav>")
+    parts.append("<script>" + "var x = 1;" * 20000 + "</script>")
+    paragraph = ("<p>The novel explores ambition, memory and the cost of reinvention, following its "
+                 "narrator through a summer of parties and quiet betrayals.</p>")
+    body = []
+    size = sum(len(part) for part in parts)
+    while size < target_bytes:
+        body.append(paragraph)
+        size += len(paragraph)
+    parts.extend(body)
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+def measure(func, html_bytes, max_chars, repeat):
+    """Return (best seconds, peak traced bytes) over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html_bytes, max_chars)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(html_bytes, max_chars)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="Saved HTML pages to benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-chars", type=int, default=4000)
+    args = parser.parse_args(argv)
+
+    paths = args.pages or sorted(glob.glob(os.path.join(PAGES_DIR, "*.html")))
+    pages = [(os.path.basename(path), open(path, "rb").read()) for path in paths]
+    if not pages:
+        pages = [("synthetic", synthetic_page())]
+
+    try:
+        import bs4  # noqa: F401
+        has_baseline = True
+    except ImportError:
+        print("beautifulsoup4 is not installed; only the streaming extractor is measured.")
+        has_baseline = False
+
+    print(f"{'page':<28}{'size':>10}{'impl':>12}{'best ms':>12}{'peak MB':>10}")
+    for name, html_bytes in pages:
+        implementations = [("streaming", streaming_extract)]
+        if has_baseline:
+            implementations.insert(0, ("baseline", baseline_extract))
+        for label, func in implementations:
+            seconds, peak = measure(func, html_bytes, args.max_chars, args.repeat)
+            print(f"{name[:27]:<28}{len(html_bytes) / 1024:>8.0f}KB{label:>12}"
+                  f"{seconds * 1000:>12.1f}{peak / 1024 / 1024:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Offline benchmark of the search cache.
+
+Replays a research workload against the fake Serper server in
+benchmarks/fake_services.py: concurrent users look up titles with skewed
+popularity, and each lookup runs the research searches for the title at once,
+written with varying case, spacing and punctuation. The same workload runs
+three times - straight to the server, with in-flight coalescing only, and with
+the disk cache - and the report shows upstream searches, hit rate and search
+latency for each. Results are saved to benchmarks/results/ as JSON.
+
+Usage:
+    python -m benchmarks.bench_search_cache [--users N] [--lookups N] [--titles N]
+                                            [--search-latency S] [--ttl S]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.fake_services import FakeSearchSettings, FakeServices
+from benchmarks.load_test import RESULTS_DIR, git_commit, summarize
+from config.agent_config import RESEARCH_QUERIES
+from utils.disk_cache import DiskCache
+from utils.search_cache import SearchCache
+
+
+def query_variant(query, rng):
+    """Write a query the way different agents and users do: other case, spacing or punctuation."""
+    variants = (query, query.lower(), query.title(), query.upper(), f"  {query}  ",
+                query.replace(" ", "  "), f"{query}?", query.replace(" ", ", ", 1))
+    return rng.choice(variants)
+
+
+def build_workload(args):
+    """Return one list of lookups (lists of search queries) per user."""
+    rng = random.Random(args.seed)
+    titles = [f"Benchmark Title {index}" for index in range(args.titles)]
+    # Zipf-like popularity: a few titles get most of the lookups
+    weights = [1 / (rank + 1) ** args.skew for rank in range(len(titles))]
+    workload = []
+    for _ in range(args.users):
+        lookups = []
+        for title in rng.choices(titles, weights, k=args.lookups):
+            media_type = rng.choice(("book", "movie"))
+            lookups.append([query_variant(spec["query"].format(title=title, media_type=media_type), rng)
+                            for spec in RESEARCH_QUERIES])
+        workload.append(lookups)
+    return workload
+
+
+def upstream_search(serper_url, query):
+    request = urllib.request.Request(
+        f"{serper_url}/search", data=json.dumps({"q": query}).encode("utf-8"),
+        headers={"X-API-KEY": "offline-benchmark", "Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def run_phase(name, services, workload, search_cache):
+    """Replay the workload, returning per-search latencies, sources and upstream calls."""
+    services.search_settings.calls = 0
+    latencies, sources, lock = [], {}, threading.Lock()
+
+    def search(query):
+        start = time.monotonic()
+        if search_cache is None:
+            upstream_search(services.serper_url, query)
+            source = "miss"
+        else:
+            _, source = search_cache.search(query, lambda: upstream_search(services.serper_url, query),
+                                            search_type="search", n_results=10)
+        with lock:
+            latencies.append(time.monotonic() - start)
+            sources[source] = sources.get(source, 0) + 1
+
+    def run_user(lookups):
+        # The research tool runs a title's searches at once
+        with ThreadPoolExecutor(max_workers=len(RESEARCH_QUERIES)) as executor:
+            for queries in lookups:
+                list(executor.map(search, queries))
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(workload)) as executor:
+        list(executor.map(run_user, workload))
+    wall_seconds = time.monotonic() - start
+    searches = len(latencies)
+    return {
+        "phase": name,
+        "searches": searches,
+        "upstream_calls": services.search_settings.calls,
+        "hit_rate": round(1 - services.search_settings.calls / searches, 3) if searches else 0.0,
+        "sources": sources,
+        "wall_seconds": round(wall_seconds, 3),
+        "latency": summarize(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=8, help="concurrent simulated users")
+    parser.add_argument("--lookups", type=int, default=10, help="title lookups per user")
+    parser.add_argument("--titles", type=int, default=20, help="distinct titles in the workload")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of title popularity")
+    parser.add_argument("--search-latency", type=float, default=0.4, help="fake Serper latency in seconds")
+    parser.add_argument("--search-jitter", type=float, default=0.2)
+    parser.add_argument("--ttl", type=float, default=3600.0, help="search cache TTL in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    services = FakeServices(search_settings=FakeSearchSettings(args.search_latency, args.search_jitter)).start()
+    workload = build_workload(args)
+    work_dir = tempfile.mkdtemp(prefix="insight-search-cache-")
+    try:
+        phases = [
+            run_phase("uncached", services, workload, None),
+            run_phase("coalesced", services, workload, SearchCache()),
+            run_phase("disk cache", services, workload, SearchCache(DiskCache(
+                os.path.join(work_dir, "search_cache.sqlite3"), table="searches", ttl_seconds=args.ttl))),
+        ]
+    finally:
+        services.stop()
+
+    baseline = phases[0]
+    print(f"{baseline['searches']} searches from {args.users} users over {args.titles} titles "
+          f"(fake Serper latency {args.search_latency:.2f}s)\n")
+    print(f"{'Phase':<14}{'upstream':>10}{'hit rate':>10}{'p50 s':>9}{'p95 s':>9}{'mean s':>9}{'wall s':>9}")
+    for phase in phases:
+        latency = phase["latency"]
+        print(f"{phase['phase']:<14}{phase['upstream_calls']:>10}{phase['hit_rate']:>10.0%}{latency['p50']:>9}"
+              f"{latency['p95']:>9}{latency['mean']:>9}{phase['wall_seconds']:>9}")
+    cached = phases[-1]
+    saved = 1 - cached["latency"]["mean"] / baseline["latency"]["mean"] if baseline["latency"]["mean"] else 0.0
+    print(f"\nDisk cache: {baseline['upstream_calls'] - cached['upstream_calls']} fewer upstream searches, "
+          f"mean search latency {saved:.0%} lower ({cached['sources']})")
+
+    if not args.no_save:
+        result = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": {key: value for key, value in vars(args).items() if key != "no_save"},
+            "phases": phases,
+        }
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"search-cache-{time.strftime('%Y%m%d-%H%M%S')}-{result['commit']}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Saved results to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Start-up profile and regression check.
+
+Imports the app in a fresh interpreter under `python -X importtime` and
+reports the wall time of the import, the packages that cost the most, and the
+slowest direct imports. With --ready it also waits for the background warm-up
+and reports how long each warm-up step took.
+
+The check fails (exit status 1) if a heavy crew module (crewai, crewai_tools,
+litellm) is loaded by the import while LAZY_STARTUP is on, if the import takes
+longer than --max-import-seconds, or if it got slower than --max-regression
+compared with a previous result.
+
+Usage:
+    python -m benchmarks.bench_startup [--ready] [--repeat N] [--max-import-seconds S]
+                                       [--compare benchmarks/results/<previous>.json]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+HEAVY_MODULES = ("crewai", "crewai_tools", "litellm")
+
+# Runs in the child interpreter: import the module, then optionally wait for the warm-up
+CHILD = """
+import sys, json, time
+module, wait_ready, heavy = sys.argv[1], sys.argv[2] == "1", sys.argv[3].split(",")
+start = time.perf_counter()
+__import__(module)
+result = {"import_seconds": time.perf_counter() - start,
+          "heavy_modules": sorted(name for name in heavy if name in sys.modules)}
+if wait_ready:
+    app = sys.modules[module]
+    start = time.perf_counter()
+    result["ready"] = app.ensure_ready()
+    result["ready_seconds"] = time.perf_counter() - start
+    result["readiness"] = app.readiness.status()
+print("STARTUP_RESULT " + json.dumps(result))
+"""
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr):
+    """Return (self_us, cumulative_us, depth, module) tuples from -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(self_us), int(cumulative_us), (len(indent) - 1) // 2, name))
+    return entries
+
+
+def profile_once(module, wait_ready):
+    env = dict(os.environ, LAZY_STARTUP=os.getenv("LAZY_STARTUP", "1"))
+    # The warm-up only checks that a key is configured; no request is made
+    env.setdefault("OPENAI_API_KEY", "sk-startup-profile")
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, module, "1" if wait_ready else "0", ",".join(HEAVY_MODULES)],
+        cwd=REPO_DIR, env=env, capture_output=True, text=True
+    )
+    lines = [line for line in process.stdout.splitlines() if line.startswith("STARTUP_RESULT ")]
+    if process.returncode != 0 or not lines:
+        raise RuntimeError(f"Importing {module} failed:\n{process.stderr[-2000:]}")
+    result = json.loads(lines[-1].split(" ", 1)[1])
+    result["imports"] = parse_importtime(process.stderr)
+    return result
+
+
+def module_subtree(entries, module):
+    """Return the module's own entry followed by everything it imported (skipping interpreter start-up)."""
+    positions = [index for index, entry in enumerate(entries) if entry[3] == module]
+    if not positions:
+        return []
+    # A module's imports are listed right before it, each more deeply indented
+    end = positions[-1]
+    depth = entries[end][2]
+    start = end
+    while start > 0 and entries[start - 1][2] > depth:
+        start -= 1
+    return [entries[end]] + entries[start:end]
+
+
+def summarize_imports(entries, module, top):
+    """Total self time per top-level package, and the slowest imports made directly by the module."""
+    entries = module_subtree(entries, module)
+    depth = entries[0][2] if entries else 0
+    by_package = {}
+    for self_us, _, _, name in entries:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    packages = sorted(by_package.items(), key=lambda item: -item[1])[:top]
+    direct = sorted((entry for entry in entries if entry[2] == depth + 1), key=lambda entry: -entry[1])[:top]
+    return {
+        "packages_ms": {package: round(us / 1000, 1) for package, us in packages},
+        "direct_imports_ms": {name: round(cumulative / 1000, 1) for _, cumulative, _, name in direct},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app", help="module to import (default app)")
+    parser.add_argument("--ready", action="store_true", help="also wait for the warm-up and time its steps")
+    parser.add_argument("--repeat", type=int, default=3, help="runs; the median import time is reported")
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--max-import-seconds", type=float, default=None)
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="allowed slowdown against --compare (0.25 = 25%%)")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    runs = [profile_once(args.module, args.ready) for _ in range(args.repeat)]
+    import_seconds = statistics.median(run["import_seconds"] for run in runs)
+    median_run = min(runs, key=lambda run: abs(run["import_seconds"] - import_seconds))
+    lazy = os.getenv("LAZY_STARTUP", "1").lower() not in ("0", "false", "no", "off")
+    result = {
+        "commit": subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                 capture_output=True, text=True).stdout.strip() or "unknown",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "module": args.module,
+        "lazy": lazy,
+        "import_seconds": round(import_seconds, 3),
+        "import_seconds_runs": [round(run["import_seconds"], 3) for run in runs],
+        "heavy_modules": median_run["heavy_modules"],
+        **summarize_imports(median_run["imports"], args.module, args.top),
+    }
+    if args.ready:
+        result["ready"] = median_run["ready"]
+        result["ready_seconds"] = round(median_run["ready_seconds"], 3)
+        result["readiness"] = median_run["readiness"]
+
+    print(f"import {args.module}: {result['import_seconds']:.2f}s (median of {args.repeat}: "
+          f"{', '.join(f'{seconds:.2f}' for seconds in result['import_seconds_runs'])})")
+    print(f"Heavy modules loaded at import: {', '.join(result['heavy_modules']) or 'none'}")
+    print(f"\n{'Package (self time)':<40}{'ms':>10}")
+    for package, ms in result["packages_ms"].items():
+        print(f"{package:<40}{ms:>10}")
+    print(f"\n{'Direct import (cumulative)':<40}{'ms':>10}")
+    for name, ms in result["direct_imports_ms"].items():
+        print(f"{name[:39]:<40}{ms:>10}")
+    if args.ready:
+        print(f"\nReady: {result['ready']} after a further {result['ready_seconds']:.2f}s, "
+              f"steps {result['readiness']['steps']}")
+
+    failures = []
+    if lazy and result["heavy_modules"]:
+        failures.append(f"LAZY_STARTUP is on but the import loaded {', '.join(result['heavy_modules'])}")
+    if args.max_import_seconds is not None and import_seconds > args.max_import_seconds:
+        failures.append(f"import took {import_seconds:.2f}s, over the {args.max_import_seconds:.2f}s limit")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        change = (import_seconds - previous["import_seconds"]) / previous["import_seconds"]
+        print(f"\nCompared with {previous['commit']}: {previous['import_seconds']:.2f}s -> "
+              f"{import_seconds:.2f}s ({change:+.0%})")
+        if change > args.max_regression:
+            failures.append(f"import is {change:.0%} slower than {previous['commit']}")
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"startup-{time.strftime('%Y%m%d-%H%M%S')}-{result['commit']}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved results to {path}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
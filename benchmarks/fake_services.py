@@ -0,0 +1,367 @@
+"""
+Local stand-ins for the services the app calls, for offline benchmarks.
+
+- FakeOpenAIHandler: an OpenAI-compatible /v1/chat/completions endpoint with
+  configurable latency, token rate and 429 injection. It answers the prompts
+  this app sends (title validation, compaction, fast mode, and the three crew
+  agents in ReAct format, including one Batch Research Tool call) with canned
+  text of realistic size.
+- FakeSerperHandler: a Serper /search endpoint whose results link to the page server.
+- PageHandler: serves saved HTML pages from benchmarks/pages/ (or a synthetic
+  article) with ETag revalidation, like a real site.
+
+Usage:
+    python -m benchmarks.fake_services [--llm-latency S] [--token-rate N] [--error-rate P]
+"""
+
+import re
+import sys
+import json
+import time
+import glob
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from benchmarks.bench_scraper import PAGES_DIR, synthetic_page
+
+_URL = re.compile(r"https?://[^\s\"'<>\\]+")
+_TITLE = re.compile(r"Title: (.+?), Type: (Book|Movie)")
+_QUOTED = re.compile(r"(?:^Is|about the \w+) \"([^\"\n]+)\"|titled: ([^\n]+)", re.MULTILINE)
+
+
+class FakeLLMSettings:
+    """Behaviour of the fake OpenAI endpoint, shared by all its handler threads."""
+
+    def __init__(self, latency: float = 0.3, jitter: float = 0.1, token_rate: float = 200.0,
+                 error_rate: float = 0.0, retry_after: float = 1.0, seed: Optional[int] = None):
+        """
+        Initialize the FakeLLMSettings.
+
+        Args:
+            latency: Seconds before the first token (time to first byte).
+            jitter: Random extra latency, uniformly up to this many seconds.
+            token_rate: Completion tokens generated per second.
+            error_rate: Fraction of calls answered with 429 Too Many Requests.
+            retry_after: Value of the Retry-After header on injected 429s.
+            seed: Optional random seed for reproducible runs.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.token_rate = token_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.rate_limited = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def draw(self) -> float:
+        with self.lock:
+            return self.random.random()
+
+
+class FakeSearchSettings:
+    """Behaviour of the fake Serper endpoint, with a count of the searches it answered."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0):
+        """
+        Initialize the FakeSearchSettings.
+
+        Args:
+            latency: Seconds each search takes.
+            jitter: Random extra latency, uniformly up to this many seconds.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        self.calls = 0
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _find_title(text: str) -> str:
+    match = _TITLE.search(text) or _QUOTED.search(text)
+    return next(group for group in match.groups() if group).strip() if match else "the work"
+
+
+def _questions(title: str) -> str:
+    return "\n".join(
+        f"{index}. In {title}, the tension between ambition and belonging shapes theme number {index}, "
+        f"revealing how characters trade integrity for recognition. How does this choice change the way "
+        f"the work judges its characters and the society around them?"
+        for index in range(1, 9)
+    )
+
+
+def _insights(title: str) -> str:
+    return "\n\n".join(
+        f"Insight {index}: Theme {index} of {title}\nThe work uses its central relationships to examine how "
+        f"desire, memory and social class distort moral judgment, and invites the reader to weigh "
+        f"sympathy against accountability in the choices of its main characters."
+        for index in range(1, 9)
+    )
+
+
+def _answer(messages: List[Dict[str, str]]) -> str:
+    """Return the completion this app would expect for a prompt."""
+    text = "\n".join(str(message.get("content", "")) for message in messages)
+    last = str(messages[-1].get("content", "")) if messages else ""
+    system = next((str(message.get("content", "")) for message in messages if message.get("role") == "system"), "")
+    title = _find_title(text)
+    urls = list(dict.fromkeys(url.rstrip(".,);") for url in _URL.findall(text)))
+    sources = "\n".join(f"• {url}" for url in urls[:6]) or "• https://en.wikipedia.org/wiki/Main_Page"
+
+    if "VALID or INVALID" in last:
+        return "VALID"
+    if last.startswith("Condense the research notes"):
+        return (f"Key facts: {title} is a widely read work.\nPlot: The protagonist pursues an idealized past.\n"
+                "Themes:\n- Ambition\n- Class\n- Memory\nCharacters:\n- The narrator, an observer who changes\n"
+                "Significance: Regarded as a classic and widely taught.")
+    if "Write exactly 8 intellectually stimulating discussion questions" in last:
+        return _questions(title)
+
+    # CrewAI agents: the system prompt names the role and lists the tools
+    if "You are Information Gatherer" in system and "Batch Research Tool" in system and "Observation:" not in text:
+        media_type = "Movie" if "Type: Movie" in text else "Book"
+        return ("Thought: I should research the title with the batch research tool first.\n"
+                "Action: Batch Research Tool\n"
+                f"Action Input: {json.dumps({'title': title, 'media_type': media_type})}")
+    if "You are Information Gatherer" in system:
+        summary = (f"{title} follows a narrator drawn into the world of a wealthy neighbour. "
+                   "Major themes include ambition, class and the unreliability of memory. " * 6)
+        return f"Thought: I now can give a great answer\nFinal Answer: {summary}\n\nSources:\n{sources}"
+    if "You are Insight Analyst" in system:
+        return f"Thought: I now can give a great answer\nFinal Answer: {_insights(title)}"
+    if "You are Discussion Facilitator" in system:
+        return f"Thought: I now can give a great answer\nFinal Answer: {_questions(title)}\n\nSources\n{sources}"
+    return "Thought: I now can give a great answer\nFinal Answer: Done."
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat completions endpoint."""
+
+    settings = FakeLLMSettings()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        settings = self.settings
+        with settings.lock:
+            settings.calls += 1
+
+        if settings.draw() < settings.error_rate:
+            with settings.lock:
+                settings.rate_limited += 1
+            self._send_json(429, {"error": {
+                "message": f"Rate limit reached for requests. Please try again in {settings.retry_after:g}s.",
+                "type": "requests", "code": "rate_limit_exceeded"
+            }}, headers={"Retry-After": f"{settings.retry_after:g}"})
+            return
+
+        messages = request.get("messages", [])
+        answer = _answer(messages)
+        prompt_tokens = sum(_tokens(str(message.get("content", ""))) for message in messages)
+        completion_tokens = _tokens(answer)
+        with settings.lock:
+            settings.prompt_tokens += prompt_tokens
+            settings.completion_tokens += completion_tokens
+
+        time.sleep(settings.latency + settings.jitter * settings.draw())
+        model = request.get("model", "gpt-4.1-nano")
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+
+        if request.get("stream"):
+            self._stream(answer, model, usage, settings.token_rate)
+            return
+
+        time.sleep(completion_tokens / settings.token_rate)
+        self._send_json(200, {
+            "id": f"chatcmpl-{settings.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+            "usage": usage,
+        })
+
+    def _stream(self, answer: str, model: str, usage: dict, token_rate: float) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        pieces = re.findall(r"\S*\s*", answer)
+        for index, piece in enumerate(pieces):
+            if not piece:
+                continue
+            chunk = {"id": "chatcmpl-stream", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            time.sleep(_tokens(piece) / token_rate)
+        final = {"id": "chatcmpl-stream", "object": "chat.completion.chunk", "created": int(time.time()),
+                 "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+        self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+
+class FakeSerperHandler(BaseHTTPRequestHandler):
+    """Serper /search endpoint returning links to the local page server."""
+
+    pages_base_url = "http://127.0.0.1:0/pages"
+    results_per_query = 5
+    search = FakeSearchSettings()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        query = request.get("q", "")
+        with self.search.lock:
+            self.search.calls += 1
+        time.sleep(self.search.latency + self.search.jitter * random.random())
+        slug = re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-")[:60] or "page"
+        organic = [
+            {"title": f"{query} - result {index}", "link": f"{self.pages_base_url}/{slug}-{index}.html",
+             "snippet": f"An overview of {query}, its themes and its reception.", "position": index}
+            for index in range(1, self.results_per_query + 1)
+        ]
+        body = json.dumps({"searchParameters": {"q": query}, "organic": organic}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves saved HTML pages with ETag validators."""
+
+    pages: List[bytes] = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if not self.pages:
+            self.send_error(404)
+            return
+        page = self.pages[int(hashlib.md5(self.path.encode("utf-8")).hexdigest(), 16) % len(self.pages)]
+        etag = '"' + hashlib.md5(page).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(page)
+
+
+def load_pages() -> List[bytes]:
+    """Return the saved pages in benchmarks/pages/, or one synthetic article."""
+    pages = [open(path, "rb").read() for path in sorted(glob.glob(f"{PAGES_DIR}/*.html"))]
+    return pages or [synthetic_page(target_bytes=300 * 1024)]
+
+
+class FakeServices:
+    """Runs the fake OpenAI, Serper and page servers on free local ports."""
+
+    def __init__(self, settings: Optional[FakeLLMSettings] = None, host: str = "127.0.0.1",
+                 search_settings: Optional[FakeSearchSettings] = None):
+        """
+        Initialize the FakeServices.
+
+        Args:
+            settings: Behaviour of the fake OpenAI endpoint.
+            host: Interface the servers bind to.
+            search_settings: Behaviour of the fake Serper endpoint.
+        """
+        self.settings = settings or FakeLLMSettings()
+        self.search_settings = search_settings or FakeSearchSettings()
+        self.host = host
+        self._servers: List[ThreadingHTTPServer] = []
+
+    def _serve(self, handler) -> str:
+        server = ThreadingHTTPServer((self.host, 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f"fake-{handler.__name__}", daemon=True).start()
+        self._servers.append(server)
+        return f"http://{self.host}:{server.server_address[1]}"
+
+    def start(self) -> "FakeServices":
+        """Start all three servers and remember their base URLs."""
+        PageHandler.pages = load_pages()
+        self.pages_url = self._serve(PageHandler)
+        serper = type("BoundSerperHandler", (FakeSerperHandler,),
+                      {"pages_base_url": f"{self.pages_url}/pages", "search": self.search_settings})
+        self.serper_url = self._serve(serper)
+        openai = type("BoundOpenAIHandler", (FakeOpenAIHandler,), {"settings": self.settings})
+        self.openai_url = self._serve(openai) + "/v1"
+        return self
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables that point the app at these servers."""
+        return {
+            "OPENAI_API_KEY": "sk-offline-benchmark",
+            "OPENAI_API_BASE": self.openai_url,
+            "OPENAI_BASE_URL": self.openai_url,
+            "SERPER_API_KEY": "offline-benchmark",
+            "SERPER_BASE_URL": self.serper_url,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--token-rate", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    services = FakeServices(FakeLLMSettings(args.llm_latency, token_rate=args.token_rate,
+                                            error_rate=args.error_rate)).start()
+    for name, value in services.environment().items():
+        print(f"export {name}={value}")
+    print("Serving until interrupted...", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        services.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
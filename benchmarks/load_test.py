@@ -0,0 +1,210 @@
+"""
+Offline end-to-end load test.
+
+Runs the real app pipeline (title validation, worker pool, crew or fast mode,
+scraping, caching) against the local fake OpenAI, Serper and page servers in
+benchmarks/fake_services.py, so no API keys or network access are needed.
+Simulates N concurrent users and reports end-to-end latency percentiles,
+throughput, error counts and a per-stage breakdown built from the request
+traces. Each run is saved to benchmarks/results/ as JSON so runs can be
+compared across commits.
+
+Usage:
+    python -m benchmarks.load_test [--users N] [--requests N] [--mode auto|fast|deep]
+                                   [--llm-latency S] [--token-rate N] [--error-rate P]
+                                   [--compare benchmarks/results/<previous>.json]
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.fake_services import FakeLLMSettings, FakeServices
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+MODE_LABELS = {"auto": "✨ Auto", "fast": "⚡ Fast", "deep": "🔍 Deep"}
+
+
+def percentile(values, quantile):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, max(0, math.ceil(quantile * len(ordered)) - 1))], 3)
+
+
+def summarize(values):
+    return {"count": len(values), "mean": round(sum(values) / len(values), 3) if values else None,
+            "p50": percentile(values, 0.5), "p95": percentile(values, 0.95), "max": percentile(values, 1.0)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def prepare_environment(services, work_dir, args):
+    """Point the app at the fake services and at a throwaway cache before it is imported."""
+    os.environ.update(services.environment())
+    os.environ.update({
+        "INSIGHT_CACHE_DIR": os.path.join(work_dir, "cache"),
+        "RESULT_CACHE_ENABLED": "1" if args.warm else "0",
+        "TASK_CHECKPOINTS_ENABLED": "1" if args.warm else "0",
+        "TITLE_INDEX_ENABLED": "0",
+        "METRICS_ENABLED": "0",
+        "EXECUTION_MODE": args.mode,
+        "CREW_WORKERS": str(args.workers or args.users),
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    })
+
+
+def run_user(app, check_questions_output, user, args):
+    """Send one simulated user's requests one after another and time each one."""
+    samples = []
+    for index in range(args.requests):
+        # Unique titles keep the result cache from answering, unless --warm repeats them
+        title = f"Benchmark Title {index}" if args.warm else f"Benchmark Title {user}-{index}"
+        start = time.monotonic()
+        output, error = "", None
+        try:
+            for output in app.generate_insights(title, "📖 Book", MODE_LABELS[args.mode]):
+                pass
+        except Exception as e:
+            error = repr(e)
+        latency = time.monotonic() - start
+        problem = error or check_questions_output(output)
+        samples.append({"user": user, "title": title, "latency": round(latency, 3),
+                        "ok": problem is None, "problem": problem})
+    return samples
+
+
+def stage_breakdown(trace_path):
+    """Summarize the per-request traces by span kind and by span name."""
+    by_kind, by_span, statuses = {}, {}, {}
+    with open(trace_path, encoding="utf-8") as f:
+        traces = [json.loads(line) for line in f if line.startswith("{")]
+    for trace in traces:
+        statuses[trace["status"]] = statuses.get(trace["status"], 0) + 1
+        for kind, seconds in trace.get("time_by_kind", {}).items():
+            by_kind.setdefault(kind, []).append(seconds)
+        for span in trace.get("spans", []):
+            by_span.setdefault(f"{span['kind']}:{span['name']}", []).append(span["duration"])
+    return {
+        "requests_by_status": statuses,
+        "time_by_kind": {kind: summarize(values) for kind, values in sorted(by_kind.items())},
+        "spans": {name: summarize(values) for name, values in sorted(by_span.items())},
+    }
+
+
+def print_report(result):
+    summary = result["summary"]
+    print(f"\n{summary['requests']} requests from {result['config']['users']} users "
+          f"in {summary['wall_seconds']:.1f}s ({summary['throughput_rpm']:.1f} requests/min)")
+    print(f"Errors or invalid output: {summary['failed']}")
+    print("Latency (s): " + "  ".join(f"{key}={summary[key]}" for key in ("p50", "p90", "p95", "p99", "max")))
+    print(f"Fake LLM: {result['fake_llm']['calls']} calls, {result['fake_llm']['rate_limited']} answered 429")
+    print(f"\n{'Stage (total per request)':<40}{'mean':>8}{'p50':>8}{'p95':>8}")
+    for name, stats in result["stages"]["time_by_kind"].items():
+        print(f"{name:<40}{stats['mean']:>8}{stats['p50']:>8}{stats['p95']:>8}")
+    print(f"\n{'Span':<40}{'count':>8}{'mean':>8}{'p95':>8}")
+    for name, stats in result["stages"]["spans"].items():
+        print(f"{name[:39]:<40}{stats['count']:>8}{stats['mean']:>8}{stats['p95']:>8}")
+
+
+def print_comparison(result, previous):
+    print(f"\nCompared with {previous['commit']} ({previous['timestamp']}):")
+    for key in ("p50", "p90", "p95", "p99", "throughput_rpm", "failed"):
+        old, new = previous["summary"].get(key), result["summary"].get(key)
+        if old is None or new is None:
+            continue
+        change = f" ({(new - old) / old:+.0%})" if old else ""
+        print(f"  {key:<16}{old:>10} -> {new:<10}{change}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=4, help="concurrent simulated users")
+    parser.add_argument("--requests", type=int, default=3, help="requests per user")
+    parser.add_argument("--mode", choices=sorted(MODE_LABELS), default="deep")
+    parser.add_argument("--workers", type=int, default=None, help="crew workers (default: one per user)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="fake LLM time to first token in seconds")
+    parser.add_argument("--token-rate", type=float, default=200.0, help="fake LLM completion tokens per second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of LLM calls answered with 429")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--warm", action="store_true", help="keep result caches on and repeat titles across users")
+    parser.add_argument("--label", default="", help="free-form note saved with the results")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    settings = FakeLLMSettings(args.llm_latency, token_rate=args.token_rate,
+                               error_rate=args.error_rate, seed=args.seed)
+    services = FakeServices(settings).start()
+    work_dir = tempfile.mkdtemp(prefix="insight-load-test-")
+    trace_path = os.path.join(work_dir, "traces.jsonl")
+    prepare_environment(services, work_dir, args)
+
+    # Imported late so the app reads the environment prepared above
+    import app
+    from src.fast_pipeline import check_questions_output
+    from utils.telemetry import configure_trace_log
+    configure_trace_log(trace_path)
+    if not app.ensure_ready():
+        print(f"The app did not start: {app.readiness.error}")
+        services.stop()
+        return 1
+
+    print(f"Running {args.users} users x {args.requests} requests in {args.mode} mode...")
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        samples = [sample for user_samples in executor.map(lambda user: run_user(app, check_questions_output, user, args),
+                                                           range(args.users))
+                   for sample in user_samples]
+    wall_seconds = time.monotonic() - start
+    services.stop()
+
+    latencies = [sample["latency"] for sample in samples]
+    result = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "label": args.label,
+        "config": {key: value for key, value in vars(args).items() if key not in ("compare", "no_save")},
+        "summary": {
+            "requests": len(samples),
+            "failed": sum(1 for sample in samples if not sample["ok"]),
+            "wall_seconds": round(wall_seconds, 3),
+            "throughput_rpm": round(len(samples) / wall_seconds * 60, 2),
+            "mean": round(sum(latencies) / len(latencies), 3),
+            **{f"p{int(q * 100)}": percentile(latencies, q) for q in (0.5, 0.9, 0.95, 0.99)},
+            "max": percentile(latencies, 1.0),
+        },
+        "fake_llm": {"calls": settings.calls, "rate_limited": settings.rate_limited,
+                     "prompt_tokens": settings.prompt_tokens, "completion_tokens": settings.completion_tokens},
+        "stages": stage_breakdown(trace_path),
+        "failures": [sample for sample in samples if not sample["ok"]][:10],
+    }
+    print_report(result)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(result, json.load(f))
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{result['commit']}-{args.mode}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved results to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import os
 from typing import Dict, List, Any
 
 # Insight Facilitator agent configurations
@@ -19,6 +20,71 @@ DISCUSSION_FACILITATOR_CONFIG = {
     "backstory": "You are an experienced discussion group moderator with a background in philosophy and critical thinking. You excel at crafting questions that spark intellectually stimulating conversations, challenge assumptions, and reveal deeper meanings in the material. Your questions encourage analytical thinking, critical examination, and philosophical exploration. Regardless of whether discussing a book or movie, you focus on the core ideas, ethical dimensions, philosophical concepts, character psychology, societal implications, and thematic substance. Your goal is to facilitate discussions that explore the intellectual depth of the content rather than focusing on medium-specific techniques.",
 }
 
+# Model profile per agent (and the single-call fast pipeline, title validation and research
+# compaction). Cheap stages use the smallest model; the synthesis stages get a bigger one.
+# When a model's rolling p95 latency or error rate degrades, calls fail over to
+# fallback_model. timeout is per LLM call, in seconds.
+MODEL_PROFILES = {
+    "info_gatherer": {
+        "model": "openai/gpt-4.1-nano",
+        "fallback_model": "openai/gpt-4.1-mini",
+        "max_tokens": 1000,
+        "temperature": 0.3,
+        "timeout": 60,
+    },
+    "insight_analyst": {
+        "model": "openai/gpt-4.1-mini",
+        "fallback_model": "openai/gpt-4.1-nano",
+        "max_tokens": 1200,
+        "temperature": 0.7,
+        "timeout": 90,
+    },
+    "discussion_facilitator": {
+        "model": "openai/gpt-4.1-nano",
+        "fallback_model": "openai/gpt-4.1-mini",
+        "max_tokens": 1000,
+        "temperature": 0.7,
+        "timeout": 60,
+    },
+    "fast_pipeline": {
+        "model": "openai/gpt-4.1-mini",
+        "fallback_model": "openai/gpt-4.1-nano",
+        "max_tokens": 1500,
+        "temperature": 0.7,
+        "timeout": 90,
+    },
+    # One-word VALID/INVALID verdict before any agents are built
+    "title_validation": {
+        "model": os.getenv("TITLE_VALIDATION_MODEL", "openai/gpt-4.1-nano"),
+        "fallback_model": "openai/gpt-4.1-mini",
+        "max_tokens": int(os.getenv("TITLE_VALIDATION_MAX_TOKENS", "5")),
+        "temperature": 0.0,
+        "timeout": 20,
+    },
+    # Condenses research before the insights and questions tasks read it; max_tokens is the digest budget
+    "research_compaction": {
+        "model": os.getenv("CONTEXT_COMPACTION_MODEL", "openai/gpt-4.1-nano"),
+        "fallback_model": "openai/gpt-4.1-mini",
+        "max_tokens": int(os.getenv("CONTEXT_COMPACTION_MAX_TOKENS", "600")),
+        "temperature": 0.0,
+        "timeout": 60,
+    },
+}
+
+# Focus areas of the research_media task, used to rank scraped page content by relevance
+RESEARCH_FOCUS_AREAS = [
+    "plot", "themes", "characters", "character development", "philosophical concepts",
+    "cultural significance", "historical significance", "societal implications",
+    "critical reception", "intellectual impact", "meaning", "summary",
+]
+
+# Searches run together by the batched research tool, each paired with the aspect its pages are ranked for
+RESEARCH_QUERIES = [
+    {"query": "{title} {media_type} plot summary", "focus": "plot summary characters"},
+    {"query": "{title} {media_type} themes analysis meaning", "focus": "themes meaning philosophical concepts symbolism"},
+    {"query": "{title} {media_type} critical reception cultural significance", "focus": "critical reception cultural historical significance impact"},
+]
+
 # Task configurations
 TASK_CONFIGS = {
     # Insight Facilitator task configurations
@@ -5,12 +5,183 @@ Optimized for Hugging Face Spaces deployment.
 """
 
 import os
+import time
+from typing import NamedTuple
 from dotenv import load_dotenv
 from crewai import LLM
+from config.agent_config import MODEL_PROFILES
+from config.performance_config import RATE_LIMIT_CONFIG, MODEL_ROUTING_CONFIG, HEDGING_CONFIG
+from utils.rate_limiter import configure_rate_limiters, get_rate_limiter
+from utils.model_health import get_model_health
+from utils.deadline import remaining_time
+from utils.hedging import HedgeBudget, hedged_call
+from utils.telemetry import span, record_tokens
 
 # Load environment variables - only needs to happen once
 load_dotenv()
 
+# Shared limiters for every LLM and search call in this process
+if RATE_LIMIT_CONFIG["enabled"]:
+    configure_rate_limiters(RATE_LIMIT_CONFIG["limits"])
+
+# Caps hedged duplicates at a fraction of all LLM calls in this process
+_hedge_budget = HedgeBudget(max_extra_ratio=HEDGING_CONFIG["max_extra_ratio"])
+
+def estimate_tokens(messages):
+    """Roughly estimate the tokens in a prompt (about 4 characters per token)."""
+    if isinstance(messages, str):
+        return len(messages) // 4 + 1
+    return sum(len(str(message.get("content", ""))) // 4 + 4 for message in messages)
+
+class TokenUsage(NamedTuple):
+    """Tokens of one LLM call; estimated is True when the provider reported no usage."""
+    prompt_tokens: int
+    completion_tokens: int
+    estimated: bool
+
+class _UsageRecorder:
+    """Callback that keeps the usage CrewAI reads from the LiteLLM response of one call."""
+    
+    # Deliberately not a LiteLLM CustomLogger: LiteLLM's callback list is process-wide, so
+    # only CrewAI's own per-call loop over the callbacks argument reaches this object
+    def __init__(self):
+        self.usage = None
+    
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        usage = response_obj.get("usage") if isinstance(response_obj, dict) else getattr(response_obj, "usage", None)
+        if isinstance(usage, dict):
+            prompt_tokens, completion_tokens = usage.get("prompt_tokens"), usage.get("completion_tokens")
+        else:
+            prompt_tokens = getattr(usage, "prompt_tokens", None)
+            completion_tokens = getattr(usage, "completion_tokens", None)
+        if prompt_tokens is not None and completion_tokens is not None:
+            self.usage = TokenUsage(int(prompt_tokens), int(completion_tokens), False)
+
+def _with_callback(callback, args, kwargs):
+    """Return LLM.call arguments with callback added to its callbacks argument."""
+    if len(args) >= 2:
+        # Positional call(messages, tools, callbacks, available_functions)
+        args = list(args)
+        args[1] = list(args[1] or []) + [callback]
+        return tuple(args), kwargs
+    kwargs = dict(kwargs)
+    kwargs["callbacks"] = list(kwargs.get("callbacks") or []) + [callback]
+    return args, kwargs
+
+class RateLimitedLLM(LLM):
+    """LLM that waits on the shared "llm" rate limiter before every call."""
+    
+    def _reserve(self, messages):
+        """Wait on the limiter for this call's tokens, returning the reservation to settle (or None)."""
+        limiter = get_rate_limiter("llm")
+        if limiter is None:
+            return None
+        # Reserve prompt plus the largest possible completion, then settle on real usage
+        estimated = estimate_tokens(messages) + (self.max_tokens or 0)
+        limiter.acquire(estimated)
+        return limiter, estimated
+    
+    def _upstream_call(self, messages, reservation, *args, **kwargs):
+        """
+        Make the model call itself, after _reserve, and settle the reservation.
+        
+        Returns:
+            The response and its TokenUsage: the provider's usage when reported,
+            otherwise an estimate from the prompt and response lengths.
+        """
+        recorder = _UsageRecorder()
+        args, kwargs = _with_callback(recorder, args, kwargs)
+        result = LLM.call(self, messages, *args, **kwargs)
+        usage = recorder.usage or TokenUsage(estimate_tokens(messages), estimate_tokens(str(result)), True)
+        if reservation is not None:
+            limiter, estimated = reservation
+            limiter.record_usage(estimated, usage.prompt_tokens + usage.completion_tokens)
+        return result, usage
+    
+    def call(self, messages, *args, **kwargs):
+        result, _ = self._upstream_call(messages, self._reserve(messages), *args, **kwargs)
+        return result
+
+def is_model_degraded(model):
+    """Return True if a model's rolling p95 latency or error rate is over the routing limits."""
+    return get_model_health(model, MODEL_ROUTING_CONFIG["window_seconds"]).degraded(
+        min_samples=MODEL_ROUTING_CONFIG["min_samples"],
+        max_error_rate=MODEL_ROUTING_CONFIG["max_error_rate"],
+        max_p95_latency=MODEL_ROUTING_CONFIG["max_p95_latency_seconds"]
+    )
+
+class RoutedLLM(RateLimitedLLM):
+    """Rate-limited LLM with per-call deadlines, optional hedging, health tracking and fallback."""
+    
+    def __init__(self, *args, fallback=None, hedge=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Another RoutedLLM (without its own fallback) used while this model is degraded
+        self.fallback = fallback
+        # Non-streaming twin used for hedged duplicates, so only one call streams tokens
+        self.hedge = hedge
+    
+    def _hedge_delay(self, health):
+        """Return how long to wait before hedging, or None when hedging does not apply."""
+        if self.hedge is None or not HEDGING_CONFIG["enabled"]:
+            return None
+        latency = health.latency_percentile(HEDGING_CONFIG["percentile"], HEDGING_CONFIG["min_samples"])
+        if latency is None:
+            return None
+        return max(HEDGING_CONFIG["min_delay_seconds"], latency)
+    
+    def _primary_call(self, messages, *args, **kwargs):
+        health = get_model_health(self.model, MODEL_ROUTING_CONFIG["window_seconds"])
+        # Never wait on a model call past the deadline of the request it belongs to
+        timeout = remaining_time()
+        if timeout is not None and timeout <= 0:
+            raise TimeoutError("The request has no time left for another model call")
+        hedge_delay = self._hedge_delay(health)
+        
+        with span("llm", self.model) as fields:
+            # Rate-limiter waits say nothing about the model, so the clock that feeds
+            # health and hedge delays starts only once the call may go upstream
+            reservation = self._reserve(messages)
+            timeout = remaining_time()
+            if timeout is not None and timeout <= 0:
+                raise TimeoutError("The request ran out of time waiting on the rate limiter")
+            start = time.monotonic()
+            try:
+                if timeout is None and hedge_delay is None:
+                    result, usage = self._upstream_call(messages, reservation, *args, **kwargs)
+                else:
+                    hedge_func = None
+                    if self.hedge is not None:
+                        hedge_func = lambda: self.hedge._upstream_call(
+                            messages, self.hedge._reserve(messages), *args, **kwargs)
+                    result, usage = hedged_call(
+                        lambda: self._upstream_call(messages, reservation, *args, **kwargs),
+                        hedge_func=hedge_func,
+                        hedge_delay=hedge_delay,
+                        timeout=timeout,
+                        budget=_hedge_budget
+                    )
+            except Exception:
+                health.record(time.monotonic() - start, ok=False)
+                raise
+            fields.update(usage._asdict())
+        health.record(time.monotonic() - start, ok=True)
+        record_tokens(self.model, usage.prompt_tokens, usage.completion_tokens, estimated=usage.estimated)
+        return result
+    
+    def call(self, messages, *args, **kwargs):
+        if self.fallback is None:
+            return self._primary_call(messages, *args, **kwargs)
+        
+        # Skip a degraded primary until its bad samples age out of the health window
+        if is_model_degraded(self.model) and not is_model_degraded(self.fallback.model):
+            return self.fallback.call(messages, *args, **kwargs)
+        try:
+            return self._primary_call(messages, *args, **kwargs)
+        except Exception as e:
+            if is_model_degraded(self.fallback.model):
+                raise
+            print(f"{self.model} call failed ({str(e)}); retrying with {self.fallback.model}")
+            return self.fallback.call(messages, *args, **kwargs)
 
 
 def is_openai_api_key_valid():
@@ -22,7 +193,8 @@ def is_openai_api_key_valid():
         return True
     return False
 
-def get_llm(provider="openai", model_name=None, verbose=False):
+def get_llm(provider="openai", model_name=None, verbose=False, stream=False,
+            temperature=0.7, max_tokens=1000, timeout=None, fallback_model=None):
     """
     Get a configured LLM instance.
     
@@ -31,6 +203,11 @@ def get_llm(provider="openai", model_name=None, verbose=False):
         model_name: Optional override for the model name.
                    If None, uses the default model.
         verbose: Whether to print verbose information about the LLM configuration.
+        stream: Whether to stream completions so tokens can be shown as they arrive.
+        temperature: Sampling temperature.
+        max_tokens: Maximum number of tokens per completion.
+        timeout: Optional per-call timeout in seconds.
+        fallback_model: Optional model used while the primary model is degraded.
         
     Returns:
         A configured LLM instance.
@@ -67,10 +244,34 @@ def get_llm(provider="openai", model_name=None, verbose=False):
         
         # Configure the LLM with OpenAI using the format from documentation
         # The model parameter should include the provider prefix: "openai/model-name"
-        llm = LLM(
+        llm_kwargs = {}
+        if stream:
+            llm_kwargs["stream"] = True
+        if timeout:
+            llm_kwargs["timeout"] = timeout
+        # An OpenAI-compatible endpoint override, e.g. the offline benchmark's fake server
+        api_base = os.getenv('OPENAI_API_BASE')
+        if api_base:
+            llm_kwargs["base_url"] = api_base
+        def make_hedge(model):
+            # Hedged duplicates never stream, so the UI only ever sees one call's tokens
+            if not HEDGING_CONFIG["enabled"]:
+                return None
+            hedge_kwargs = {key: value for key, value in llm_kwargs.items() if key != "stream"}
+            return RateLimitedLLM(model=model, temperature=temperature, max_tokens=max_tokens, **hedge_kwargs)
+        
+        # Track health per model and fail over to the fallback when the primary degrades
+        fallback = None
+        if MODEL_ROUTING_CONFIG["enabled"] and fallback_model and fallback_model != openai_model:
+            fallback = RoutedLLM(model=fallback_model, temperature=temperature, max_tokens=max_tokens,
+                                 hedge=make_hedge(fallback_model), **llm_kwargs)
+        llm = RoutedLLM(
             model=openai_model,  # Already includes "openai/" prefix
-            temperature=0.7,
-            max_tokens=1000
+            temperature=temperature,
+            max_tokens=max_tokens,
+            fallback=fallback,
+            hedge=make_hedge(openai_model),
+            **llm_kwargs
         )
         
         if verbose:
@@ -81,3 +282,34 @@ def get_llm(provider="openai", model_name=None, verbose=False):
         if verbose:
             print(error_message)
         raise ValueError(error_message)
+
+def get_profile_llm(profile_name, verbose=False, stream=False):
+    """
+    Get an LLM configured from a MODEL_PROFILES entry.
+    
+    Args:
+        profile_name: Key of the profile in config/agent_config.MODEL_PROFILES.
+        verbose: Whether to print verbose information about the LLM configuration.
+        stream: Whether to stream completions so tokens can be shown as they arrive.
+        
+    Returns:
+        A configured LLM instance with the profile's fallback model.
+    """
+    profile = MODEL_PROFILES[profile_name]
+    return get_llm(
+        provider="openai",
+        model_name=profile["model"],
+        verbose=verbose,
+        stream=stream,
+        temperature=profile["temperature"],
+        max_tokens=profile["max_tokens"],
+        timeout=profile.get("timeout"),
+        fallback_model=profile.get("fallback_model")
+    )
+
+def get_model_signature():
+    """Return a stable description of every profile's models, fallback included, for result cache keys."""
+    return ",".join(
+        f"{name}={profile['model']}|{profile.get('fallback_model') or ''}"
+        for name, profile in sorted(MODEL_PROFILES.items())
+    )
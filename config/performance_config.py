@@ -0,0 +1,202 @@
+"""
+Performance and caching configuration.
+Every value can be overridden with an environment variable so deployments
+(e.g. Hugging Face Spaces secrets) can tune them without code changes.
+"""
+
+import os
+from dotenv import load_dotenv
+from utils.config import BASE_DIR
+
+# Make .env overrides visible regardless of import order
+load_dotenv()
+
+
+def _env_int(name, default):
+    """Read an integer environment variable, falling back to the default."""
+    value = os.getenv(name)
+    try:
+        return int(value) if value not in (None, "") else default
+    except ValueError:
+        return default
+
+
+def _env_float(name, default):
+    """Read a float environment variable, falling back to the default."""
+    value = os.getenv(name)
+    try:
+        return float(value) if value not in (None, "") else default
+    except ValueError:
+        return default
+
+
+def _env_bool(name, default):
+    """Read a boolean environment variable ("1", "true", "yes", "on")."""
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Directory for all on-disk caches and stores
+CACHE_DIR = os.getenv("INSIGHT_CACHE_DIR", os.path.join(BASE_DIR, ".cache"))
+
+# Finished crew results, keyed on title + media type + model + prompt config
+RESULT_CACHE_CONFIG = {
+    "enabled": _env_bool("RESULT_CACHE_ENABLED", True),
+    "path": os.path.join(CACHE_DIR, "results.sqlite3"),
+    "ttl_seconds": _env_int("RESULT_CACHE_TTL_SECONDS", 7 * 24 * 3600),
+    "max_entries": _env_int("RESULT_CACHE_MAX_ENTRIES", 5000),
+    "max_bytes": _env_int("RESULT_CACHE_MAX_BYTES", 100 * 1024 * 1024),
+    # Resolve title variants ("Great Gatsby (novel)") to one canonical key
+    "title_index_enabled": _env_bool("TITLE_INDEX_ENABLED", True),
+    "title_match_threshold": _env_float("TITLE_MATCH_THRESHOLD", 0.8),
+}
+
+# Crew worker pool: each worker owns its own LLM, agents and tools
+WORKER_POOL_CONFIG = {
+    "num_workers": _env_int("CREW_WORKERS", 2),
+    "max_queue": _env_int("CREW_QUEUE_SIZE", 8),
+    "request_timeout_seconds": _env_float("CREW_REQUEST_TIMEOUT_SECONDS", 600.0),
+}
+
+# Pre-flight check that the input is a real book or movie before any agents are built
+VALIDATION_CONFIG = {
+    "enabled": _env_bool("TITLE_VALIDATION_ENABLED", True),
+    "path": os.path.join(CACHE_DIR, "results.sqlite3"),
+    "valid_ttl_seconds": _env_int("TITLE_VALIDATION_VALID_TTL_SECONDS", 30 * 24 * 3600),
+    "invalid_ttl_seconds": _env_int("TITLE_VALIDATION_INVALID_TTL_SECONDS", 24 * 3600),
+}
+
+# Per-task crew checkpoints, so retries resume instead of re-running finished tasks
+CHECKPOINT_CONFIG = {
+    "enabled": _env_bool("TASK_CHECKPOINTS_ENABLED", True),
+    "path": os.path.join(CACHE_DIR, "results.sqlite3"),
+    "ttl_seconds": _env_int("TASK_CHECKPOINT_TTL_SECONDS", 7 * 24 * 3600),
+    "max_entries": _env_int("TASK_CHECKPOINT_MAX_ENTRIES", 15000),
+    "max_bytes": _env_int("TASK_CHECKPOINT_MAX_BYTES", 200 * 1024 * 1024),
+}
+
+# Process-wide client-side rate limits shared by every crew (None disables a limit)
+RATE_LIMIT_CONFIG = {
+    "enabled": _env_bool("RATE_LIMIT_ENABLED", True),
+    "limits": {
+        "llm": {
+            "requests_per_minute": _env_float("LLM_REQUESTS_PER_MINUTE", 500),
+            "tokens_per_minute": _env_float("LLM_TOKENS_PER_MINUTE", 200000),
+        },
+        "serper": {
+            "requests_per_minute": _env_float("SERPER_REQUESTS_PER_MINUTE", 60),
+            "tokens_per_minute": None,
+        },
+    },
+}
+
+# Shared HTTP session and on-disk cache of scraped page text
+HTTP_CACHE_CONFIG = {
+    "enabled": _env_bool("HTTP_CACHE_ENABLED", True),
+    "path": os.path.join(CACHE_DIR, "http_cache.sqlite3"),
+    "fresh_seconds": _env_int("HTTP_CACHE_FRESH_SECONDS", 24 * 3600),
+    "max_age_seconds": _env_int("HTTP_CACHE_MAX_AGE_SECONDS", 30 * 24 * 3600),
+    "max_entries": _env_int("HTTP_CACHE_MAX_ENTRIES", 20000),
+    "max_bytes": _env_int("HTTP_CACHE_MAX_BYTES", 200 * 1024 * 1024),
+    "pool_maxsize": _env_int("HTTP_POOL_MAXSIZE", 32),
+}
+
+# On-disk cache of Serper search results keyed by normalized query; identical searches in flight are coalesced
+SEARCH_CACHE_CONFIG = {
+    "enabled": _env_bool("SEARCH_CACHE_ENABLED", True),
+    "path": os.path.join(CACHE_DIR, "search_cache.sqlite3"),
+    "ttl_seconds": _env_int("SEARCH_CACHE_TTL_SECONDS", 7 * 24 * 3600),
+    "max_entries": _env_int("SEARCH_CACHE_MAX_ENTRIES", 20000),
+    "max_bytes": _env_int("SEARCH_CACHE_MAX_BYTES", 50 * 1024 * 1024),
+}
+
+# Batched research: parallel searches, URL dedupe and concurrent scraping in one tool call
+RESEARCH_FANOUT_CONFIG = {
+    "enabled": _env_bool("RESEARCH_FANOUT_ENABLED", True),
+    "max_urls": _env_int("RESEARCH_FANOUT_MAX_URLS", 5),
+    "max_workers": _env_int("RESEARCH_FANOUT_MAX_WORKERS", 4),
+    "page_chars": _env_int("RESEARCH_FANOUT_PAGE_CHARS", 2500),
+    "timeout_seconds": _env_float("RESEARCH_FANOUT_TIMEOUT_SECONDS", 45.0),
+}
+
+# Research output is condensed before the insights and questions tasks read it; the model
+# and token budget come from the "research_compaction" profile in config/agent_config.py
+COMPACTION_CONFIG = {
+    "enabled": _env_bool("CONTEXT_COMPACTION_ENABLED", True),
+}
+
+# Execution mode: "deep" (the three-agent crew, the default), or the opt-in "fast"
+# (one structured generation) and "auto" (fast first, escalating to deep when the
+# output is malformed or nothing could be researched)
+EXECUTION_MODE_CONFIG = {
+    "default_mode": os.getenv("EXECUTION_MODE", "deep").strip().lower(),
+    "fast_research": _env_bool("FAST_MODE_RESEARCH", True),
+}
+
+# Model routing: per-model health over a rolling window, and when to fail over to a profile's fallback
+MODEL_ROUTING_CONFIG = {
+    "enabled": _env_bool("MODEL_ROUTING_ENABLED", True),
+    "window_seconds": _env_float("MODEL_HEALTH_WINDOW_SECONDS", 300.0),
+    "min_samples": _env_int("MODEL_HEALTH_MIN_SAMPLES", 5),
+    "max_error_rate": _env_float("MODEL_MAX_ERROR_RATE", 0.5),
+    "max_p95_latency_seconds": _env_float("MODEL_MAX_P95_LATENCY_SECONDS", 45.0),
+}
+
+# Opt-in hedging: a duplicate LLM call is launched when the first is slower than this latency
+# percentile of the model's recent calls; the first response wins. Every LLM call inside a
+# request is also bounded by the request's remaining time budget.
+HEDGING_CONFIG = {
+    "enabled": _env_bool("LLM_HEDGING_ENABLED", False),
+    "percentile": _env_float("LLM_HEDGE_PERCENTILE", 0.95),
+    "min_samples": _env_int("LLM_HEDGE_MIN_SAMPLES", 10),
+    "min_delay_seconds": _env_float("LLM_HEDGE_MIN_DELAY_SECONDS", 2.0),
+    "max_extra_ratio": _env_float("LLM_HEDGE_MAX_EXTRA_RATIO", 0.1),
+}
+
+# Per-request traces (one JSON line per request) and the Prometheus /metrics endpoint
+TELEMETRY_CONFIG = {
+    "enabled": _env_bool("TELEMETRY_ENABLED", True),
+    "trace_log_path": os.getenv("TELEMETRY_TRACE_LOG") or None,
+    "metrics_enabled": _env_bool("METRICS_ENABLED", True),
+    "metrics_host": os.getenv("METRICS_HOST", "0.0.0.0"),
+    "metrics_port": _env_int("METRICS_PORT", 9464),
+}
+
+# Start-up: bind the UI first and build LLMs, crews and caches on a background warm-up thread
+STARTUP_CONFIG = {
+    "lazy": _env_bool("LAZY_STARTUP", True),
+    "ready_timeout_seconds": _env_float("STARTUP_READY_TIMEOUT_SECONDS", 120.0),
+}
+
+# Admission control in front of crew runs: bounded FIFO queue with positions and wait estimates
+ADMISSION_CONFIG = {
+    "enabled": _env_bool("ADMISSION_ENABLED", True),
+    "max_running": _env_int("ADMISSION_MAX_RUNNING", WORKER_POOL_CONFIG["num_workers"]),
+    "max_queued": _env_int("ADMISSION_MAX_QUEUED", WORKER_POOL_CONFIG["max_queue"]),
+    "max_wait_seconds": _env_float("ADMISSION_MAX_WAIT_SECONDS", 300.0),
+    "default_run_seconds": _env_float("ADMISSION_DEFAULT_RUN_SECONDS", 60.0),
+    "history": _env_int("ADMISSION_HISTORY", 50),
+}
+
+# Background precompute: keep popular titles (a ranked list plus recent demand in the trace log) in the
+# result store, refreshing results before they expire. Runs only on capacity left idle by interactive users
+PRECOMPUTE_CONFIG = {
+    "enabled": _env_bool("PRECOMPUTE_ENABLED", False),
+    "titles_path": os.getenv("PRECOMPUTE_TITLES_PATH") or os.path.join(BASE_DIR, "config", "popular_titles.csv"),
+    "request_log_path": os.getenv("PRECOMPUTE_REQUEST_LOG") or TELEMETRY_CONFIG["trace_log_path"],
+    # Results are kept per mode, so precompute in the mode users get by default
+    "mode": (os.getenv("PRECOMPUTE_MODE") or EXECUTION_MODE_CONFIG["default_mode"]).strip().lower(),
+    "max_titles": _env_int("PRECOMPUTE_MAX_TITLES", 200),
+    "list_weight": _env_float("PRECOMPUTE_LIST_WEIGHT", 5.0),
+    "demand_window_seconds": _env_int("PRECOMPUTE_DEMAND_WINDOW_SECONDS", 7 * 24 * 3600),
+    "demand_half_life_seconds": _env_int("PRECOMPUTE_DEMAND_HALF_LIFE_SECONDS", 2 * 24 * 3600),
+    "refresh_before_seconds": _env_int("PRECOMPUTE_REFRESH_BEFORE_SECONDS", 24 * 3600),
+    "interval_seconds": _env_int("PRECOMPUTE_INTERVAL_SECONDS", 3600),
+    "max_runs_per_cycle": _env_int("PRECOMPUTE_MAX_RUNS_PER_CYCLE", 20),
+    "min_gap_seconds": _env_float("PRECOMPUTE_MIN_GAP_SECONDS", 30.0),
+    "idle_poll_seconds": _env_float("PRECOMPUTE_IDLE_POLL_SECONDS", 5.0),
+    # Running slots always left free for interactive requests
+    "reserve_slots": _env_int("PRECOMPUTE_RESERVE_SLOTS", 1),
+}
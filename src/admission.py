@@ -0,0 +1,246 @@
+"""
+Admission control for crew runs.
+Requests that need a new crew run take a ticket. Tickets run in FIFO order
+with at most max_running at once; the rest wait in a bounded queue and see
+their position and an estimated start time built from recent run durations,
+kept separately per execution mode since a deep crew run takes far longer
+than a fast one.
+A request is turned away instead of queued when the queue is full or its
+estimated wait is over the limit, and a session may only have one request
+in progress at a time.
+"""
+
+import time
+import heapq
+import threading
+import logging
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Set
+from src.progress import format_duration
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is turned away; the message is shown to the user."""
+    pass
+
+
+class Ticket:
+    """One request's place in the admission queue, and then its running slot."""
+
+    def __init__(self, controller: "AdmissionController", mode: str = "deep"):
+        self._controller = controller
+        self.mode = mode
+        self._granted = threading.Event()
+        self.enqueued = time.monotonic()
+        self.started: Optional[float] = None
+        self.cancelled = False
+        self.released = False
+
+    @property
+    def running(self) -> bool:
+        return self.started is not None
+
+    def position(self) -> Optional[int]:
+        """Return how many tickets are ahead of this one, or None once it is running."""
+        return self._controller._position(self)
+
+    def estimated_wait(self) -> float:
+        """Return the estimated seconds until this ticket starts (0 once running)."""
+        position = self.position()
+        return 0.0 if position is None else self._controller.estimate_wait(position)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the ticket may run or is cancelled, returning False on timeout."""
+        return self._granted.wait(timeout)
+
+    def cancel(self) -> None:
+        """Leave the queue without running, e.g. when the user disconnects."""
+        self._controller._release(self, cancelled=True)
+
+    def release(self, completed: bool = True) -> None:
+        """Free the running slot; completed runs update the duration estimate for their mode."""
+        self._controller._release(self, completed=completed)
+
+
+class AdmissionController:
+    """Bounded FIFO admission of crew runs with queue positions and wait estimates."""
+
+    def __init__(self, max_running: int = 2, max_queued: int = 8, max_wait_seconds: Optional[float] = 300.0,
+                 default_run_seconds: float = 60.0, history: int = 50):
+        """
+        Initialize the AdmissionController.
+
+        Args:
+            max_running: Crew runs allowed at once (normally the number of crew workers).
+            max_queued: Tickets allowed to wait for a running slot.
+            max_wait_seconds: Requests whose estimated wait is longer are rejected. None disables the check.
+            default_run_seconds: Run duration assumed until runs have been measured.
+            history: Number of recent run durations per execution mode the estimate is based on.
+        """
+        self.max_running = max(1, max_running)
+        self.max_queued = max(0, max_queued)
+        self.max_wait_seconds = max_wait_seconds
+        self.default_run_seconds = default_run_seconds
+        self._durations: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=history))
+        self._waiting: Deque[Ticket] = deque()
+        self._running: List[Ticket] = []
+        self._sessions: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "AdmissionController":
+        """Create an AdmissionController from an ADMISSION_CONFIG-style dictionary."""
+        return cls(
+            max_running=config["max_running"],
+            max_queued=config["max_queued"],
+            max_wait_seconds=config["max_wait_seconds"],
+            default_run_seconds=config["default_run_seconds"],
+            history=config["history"]
+        )
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiting)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def typical_run_seconds(self, mode: str = "deep") -> float:
+        """Return the median of recent run durations in a mode, or the default before any were measured."""
+        with self._lock:
+            return self._typical(mode)
+
+    def _typical(self, mode: str) -> float:
+        # Called with the lock held
+        durations = sorted(self._durations.get(mode, ()))
+        if not durations:
+            return self.default_run_seconds
+        return durations[len(durations) // 2]
+
+    def estimate_wait(self, position: int) -> float:
+        """
+        Estimate the seconds until the ticket at a queue position starts.
+
+        Running slots free up after the typical run duration of their mode (less the
+        time a run has already taken); each ticket ahead then occupies the first free
+        slot for the typical duration of its own mode.
+        """
+        now = time.monotonic()
+        with self._lock:
+            free_at = []
+            for ticket in self._running:
+                typical = self._typical(ticket.mode)
+                free_at.append(max(typical - (now - ticket.started), 0.1 * typical))
+            ahead = [self._typical(ticket.mode) for ticket in list(self._waiting)[:position]]
+            # Positions past the end of the queue are counted as deep runs
+            ahead += [self._typical("deep")] * (position - len(ahead))
+        free_at += [0.0] * (self.max_running - len(free_at))
+        heapq.heapify(free_at)
+        for run_seconds in ahead:
+            heapq.heappush(free_at, heapq.heappop(free_at) + run_seconds)
+        return free_at[0]
+
+    def claim_session(self, session_id: Optional[str]) -> bool:
+        """Mark a session as having a request in progress; False if it already has one."""
+        if not session_id:
+            return True
+        with self._lock:
+            if session_id in self._sessions:
+                return False
+            self._sessions.add(session_id)
+            return True
+
+    def release_session(self, session_id: Optional[str]) -> None:
+        with self._lock:
+            self._sessions.discard(session_id)
+
+    def admit(self, mode: str = "deep") -> Ticket:
+        """
+        Queue a new crew run.
+
+        Args:
+            mode: The run's execution mode, whose run durations it is measured against.
+
+        Returns:
+            A Ticket; call wait() until it may run and release() once the run ends.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the estimated wait is over the limit.
+        """
+        with self._lock:
+            position = len(self._waiting)
+            immediate = not self._waiting and len(self._running) < self.max_running
+            if not immediate and position >= self.max_queued:
+                logger.info(f"Rejected a request: {len(self._running)} running, {position} waiting")
+                raise AdmissionRejected(
+                    f"The service is at capacity ({len(self._running)} analyses running and {position} waiting). "
+                    "Please try again in a few minutes."
+                )
+        if not immediate and self.max_wait_seconds is not None:
+            wait = self.estimate_wait(position)
+            if wait > self.max_wait_seconds:
+                logger.info(f"Rejected a request with an estimated wait of {wait:.0f}s")
+                raise AdmissionRejected(
+                    f"The service is very busy: the estimated wait is {format_duration(wait)}. "
+                    "Please try again later."
+                )
+        ticket = Ticket(self, mode)
+        with self._lock:
+            self._waiting.append(ticket)
+            self._dispatch()
+        return ticket
+
+    def try_admit_idle(self, reserve: int = 1, mode: str = "deep") -> Optional[Ticket]:
+        """
+        Start a background run only if nobody is waiting and a slot is free beyond the reserve.
+
+        Args:
+            reserve: Running slots that must stay free for interactive requests.
+            mode: The run's execution mode, used to estimate when its slot frees up.
+
+        Returns:
+            A running Ticket to release when the run ends, or None if the service is busy.
+        """
+        with self._lock:
+            if self._waiting or len(self._running) + 1 + reserve > self.max_running:
+                return None
+            ticket = Ticket(self, mode)
+            ticket.started = time.monotonic()
+            self._running.append(ticket)
+            ticket._granted.set()
+            return ticket
+
+    def _dispatch(self) -> None:
+        # Called with the lock held: start waiting tickets while slots are free
+        while self._waiting and len(self._running) < self.max_running:
+            ticket = self._waiting.popleft()
+            ticket.started = time.monotonic()
+            self._running.append(ticket)
+            ticket._granted.set()
+
+    def _position(self, ticket: Ticket) -> Optional[int]:
+        with self._lock:
+            try:
+                return self._waiting.index(ticket)
+            except ValueError:
+                return None
+
+    def _release(self, ticket: Ticket, completed: bool = False, cancelled: bool = False) -> None:
+        with self._lock:
+            if ticket.released:
+                return
+            ticket.released = True
+            if ticket in self._running:
+                self._running.remove(ticket)
+                if completed and not cancelled:
+                    self._durations[ticket.mode].append(time.monotonic() - ticket.started)
+            elif ticket in self._waiting:
+                self._waiting.remove(ticket)
+            if cancelled:
+                ticket.cancelled = True
+                ticket._granted.set()
+            self._dispatch()
+
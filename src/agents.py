@@ -1,52 +1,69 @@
 from crewai import Agent, LLM
 from tools.web_scraping_tool import EnhancedScrapeWebsiteTool
-from crewai_tools import SerperDevTool
+from tools.search_tool import RateLimitedSerperDevTool
+from tools.research_tool import BatchResearchTool
 from config.agent_config import (
     INFO_GATHERER_CONFIG, INSIGHT_ANALYST_CONFIG, DISCUSSION_FACILITATOR_CONFIG
 )
+from config.performance_config import RESEARCH_FANOUT_CONFIG
 import os
 
 class AgentFactory:
     """Factory class for creating agents."""
     
-    def __init__(self, llm):
+    def __init__(self, llm, agent_llms=None):
         """
         Initialize the AgentFactory.
         
         Args:
             llm: The language model to use for the agents.
+            agent_llms: Optional dict mapping agent profile names (MODEL_PROFILES keys such as
+                        "insight_analyst") to the LLM that agent should use instead of llm.
         """
         self.llm = llm
+        self.agent_llms = agent_llms or {}
         
         # Initialize tools
         self.web_scraping_tool = EnhancedScrapeWebsiteTool()
         
         # Initialize SerperDevTool with API key from environment variable
         serper_api_key = os.getenv('SERPER_API_KEY')
-        if serper_api_key:
-            self.search_tool = SerperDevTool(api_key=serper_api_key)
+        serper_base_url = os.getenv('SERPER_BASE_URL')
+        if serper_api_key and serper_base_url:
+            self.search_tool = RateLimitedSerperDevTool(api_key=serper_api_key, base_url=serper_base_url)
+        elif serper_api_key:
+            self.search_tool = RateLimitedSerperDevTool(api_key=serper_api_key)
         else:
             # If no API key, create a placeholder that will show an error message
             self.search_tool = None
+        
+        # Batched research needs search results to fan out from
+        if self.search_tool is not None and RESEARCH_FANOUT_CONFIG["enabled"]:
+            self.research_tool = BatchResearchTool(self.search_tool, self.web_scraping_tool)
+        else:
+            self.research_tool = None
     
     # Insight Facilitator agents
     def create_info_gatherer(self, verbose=False):
         """Create an information gatherer agent for books and movies."""
         # Prepare tools list, excluding None values
-        tools = [tool for tool in [self.search_tool, self.web_scraping_tool] if tool is not None]
+        tools = [tool for tool in [self.research_tool, self.search_tool, self.web_scraping_tool] if tool is not None]
         
         # If no search tool is available, add a warning to the backstory
         backstory = INFO_GATHERER_CONFIG["backstory"]
         if self.search_tool is None:
             backstory += "\n\nNOTE: You do not have access to a search tool because no Serper API key was provided. "
             backstory += "You will need to rely on your existing knowledge and the web scraping tool."
+        elif self.research_tool is not None:
+            backstory += "\n\nStart by calling the Batch Research Tool once with the title and media type: it searches and "
+            backstory += "reads several sources in parallel. Only use the search or scraping tools afterwards to fill specific gaps."
         
         return Agent(
             role=INFO_GATHERER_CONFIG["role"],
             goal=INFO_GATHERER_CONFIG["goal"],
             backstory=backstory,
             verbose=verbose,
-            llm=self.llm,
+            llm=self.agent_llms.get("info_gatherer", self.llm),
             tools=tools
         )
     
@@ -60,7 +77,7 @@ class AgentFactory:
             goal=INSIGHT_ANALYST_CONFIG["goal"],
             backstory=INSIGHT_ANALYST_CONFIG["backstory"],
             verbose=verbose,
-            llm=self.llm,
+            llm=self.agent_llms.get("insight_analyst", self.llm),
             tools=tools
         )
     
@@ -73,5 +90,5 @@ class AgentFactory:
             goal=DISCUSSION_FACILITATOR_CONFIG["goal"],
             backstory=DISCUSSION_FACILITATOR_CONFIG["backstory"],
             verbose=verbose,
-            llm=self.llm
+            llm=self.agent_llms.get("discussion_facilitator", self.llm)
         )
@@ -0,0 +1,78 @@
+"""
+Task-level checkpoints for Insight Facilitator crews.
+Each finished task's output is saved per request, so retries and later runs
+resume from the last completed task instead of starting the crew over.
+"""
+
+import logging
+from typing import Any, Dict
+from utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Sequential task order of the Insight Facilitator crew (TASK_CONFIGS keys)
+TASK_ORDER = ["research_media", "analyze_insights", "create_questions"]
+
+
+class CheckpointStore:
+    """Disk-backed store of completed task outputs keyed by request."""
+
+    def __init__(self, cache: DiskCache):
+        """
+        Initialize the CheckpointStore.
+
+        Args:
+            cache: The DiskCache holding task outputs.
+        """
+        self.cache = cache
+
+    @classmethod
+    def from_config(cls, config: dict) -> "CheckpointStore":
+        """Create a CheckpointStore from a CHECKPOINT_CONFIG-style dictionary."""
+        cache = DiskCache(
+            config["path"],
+            table="task_checkpoints",
+            ttl_seconds=config["ttl_seconds"],
+            max_entries=config["max_entries"],
+            max_bytes=config["max_bytes"]
+        )
+        return cls(cache)
+
+    @staticmethod
+    def _key(request_key: str, task_name: str) -> str:
+        return f"{request_key}:{task_name}"
+
+    def save(self, request_key: str, task_name: str, output: Any) -> None:
+        """Save a finished task's output; validation failures are not checkpointed."""
+        text = str(getattr(output, "raw", output))
+        if not text or "VALIDATION_FAILED" in text:
+            return
+        self.cache.set(self._key(request_key, task_name), text)
+        logger.info(f"Checkpointed {task_name} for request {request_key[:12]}")
+
+    def load(self, request_key: str, upto: str = None) -> Dict[str, str]:
+        """
+        Return the saved outputs of the leading completed tasks of a request.
+
+        Args:
+            request_key: The request key.
+            upto: Optional task name; only tasks before it are returned, e.g. "create_questions"
+                  to re-run just the final task.
+
+        Returns:
+            A dict mapping task names to outputs, stopping at the first missing task.
+        """
+        outputs = {}
+        for task_name in TASK_ORDER:
+            if task_name == upto:
+                break
+            output = self.cache.get(self._key(request_key, task_name))
+            if output is None:
+                break
+            outputs[task_name] = output
+        return outputs
+
+    def clear(self, request_key: str) -> None:
+        """Remove every checkpoint of a request."""
+        for task_name in TASK_ORDER:
+            self.cache.delete(self._key(request_key, task_name))
@@ -0,0 +1,105 @@
+"""
+Context compaction between sequential tasks.
+The research output is condensed into a bounded, structured digest (key facts,
+themes, characters) before later tasks consume it, so the raw research dump is
+not sent to the LLM again at every stage. Source URLs are extracted from the raw
+text and appended verbatim, so the final 'Sources' section stays exact.
+"""
+
+import re
+import logging
+from typing import Any, List, Optional, Tuple
+from config.llm_config import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+COMPACTION_PROMPT = (
+    "Condense the research notes below about the {media_type} \"{title}\" into a digest of at most "
+    "{words} words, using exactly these sections:\n"
+    "Key facts: (author or director, year, setting, premise)\n"
+    "Plot: (the main arc in a few sentences)\n"
+    "Themes: (bullet list, one line each)\n"
+    "Characters: (bullet list of the main characters with their role and development)\n"
+    "Significance: (critical reception, cultural and historical impact)\n"
+    "Keep every concrete fact, name and philosophical idea that later analysis may need. "
+    "Do not include URLs; they are listed separately.\n\n"
+    "Research notes:\n{research}"
+)
+
+_URL = re.compile(r"https?://[^\s<>\"'{}|\\^`\[\]]+")
+
+
+def extract_urls(text: str) -> List[str]:
+    """Return the URLs in text, in order of first appearance and without duplicates."""
+    urls = []
+    seen = set()
+    for match in _URL.finditer(text):
+        # Sentence punctuation right after a URL is not part of it
+        url = match.group(0).rstrip(".,;:!?*")
+        # Keep balanced parentheses (e.g. Wikipedia's "_(novel)") but drop a closing one from the prose
+        while url.endswith(")") and url.count(")") > url.count("("):
+            url = url[:-1].rstrip(".,;:!?*")
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+class ResearchCompactor:
+    """Condenses research output into a bounded digest with an exact source list."""
+
+    def __init__(self, llm: Any, max_tokens: int = 600):
+        """
+        Initialize the ResearchCompactor.
+
+        Args:
+            llm: The LLM used to write the digest. Its max_tokens should match max_tokens.
+            max_tokens: Token budget of the digest, excluding the source URL list.
+                        Research output already within budget is passed through unchanged.
+        """
+        self.llm = llm
+        self.max_tokens = max_tokens
+
+    def compact(self, research: str, title: str, media_type: str) -> str:
+        """
+        Return a bounded digest of research followed by its exact source URL list.
+
+        Errors from the LLM fall back to the leading part of the research within budget.
+
+        Args:
+            research: The raw output of the research task.
+            title: The title of the book or movie.
+            media_type: The type of media (Book or Movie).
+
+        Returns:
+            The compacted research.
+        """
+        if "VALIDATION_FAILED" in research or estimate_tokens(research) <= self.max_tokens:
+            return research
+
+        urls = extract_urls(research)
+        prompt = COMPACTION_PROMPT.format(
+            media_type=media_type.lower(), title=title,
+            words=int(self.max_tokens * 0.7), research=research
+        )
+        try:
+            digest = str(self.llm.call([{"role": "user", "content": prompt}])).strip()
+        except Exception as e:
+            logger.warning(f"Research compaction skipped for '{title}': {str(e)}")
+            digest = ""
+        if not digest:
+            digest = research[:self.max_tokens * 4]
+
+        # The model is told to leave URLs out; any it kept are replaced by the exact list
+        digest = _URL.sub("", digest).strip()
+        if urls:
+            digest += "\n\nSource URLs:\n" + "\n".join(f"- {url}" for url in urls)
+        logger.info(f"Compacted research for '{title}' from {estimate_tokens(research)} "
+                    f"to {estimate_tokens(digest)} tokens")
+        return digest
+
+    def guardrail_for(self, title: str, media_type: str):
+        """Return a Task guardrail that replaces the research output with its digest."""
+        def guardrail(output) -> Tuple[bool, Optional[str]]:
+            return True, self.compact(output.raw, title, media_type)
+        return guardrail
@@ -2,24 +2,36 @@ from crewai import Crew, Process, Task
 from src.agents import AgentFactory
 from config.agent_config import TASK_CONFIGS
 from typing import List, Dict, Any
+from utils.telemetry import task_finished
 
 class CrewFactory:
     """Factory class for creating crews."""
     
-    def __init__(self, agent_factory):
+    def __init__(self, agent_factory, compactor=None, fast_pipeline=None):
         """
         Initialize the CrewFactory.
         
         Args:
             agent_factory: The agent factory to use for creating agents.
+            compactor: Optional ResearchCompactor. When set, later tasks receive a bounded
+                       digest of the research instead of the raw research output.
+            fast_pipeline: Optional FastPipeline used by the "fast" and "auto" execution modes.
         """
         self.agent_factory = agent_factory
+        self.compactor = compactor
+        self.fast_pipeline = fast_pipeline
     
 
     
     # Custom validation handling will be implemented in the task descriptions
     
-    def create_insight_facilitator_crew(self, media_title, media_type="Book", verbose=False):
+    @staticmethod
+    def _with_previous_output(description, label, output):
+        """Append the saved output of a task that already finished in an earlier run."""
+        return f"{description}\n\n{label} (from the completed previous step):\n{output}"
+    
+    def create_insight_facilitator_crew(self, media_title, media_type="Book", verbose=False, task_callback=None,
+                                        step_callback=None, completed_outputs=None, checkpoint_callback=None):
         """
         Create an Insight Facilitator crew for book/movie analysis.
         
@@ -27,42 +39,84 @@ class CrewFactory:
             media_title: The title of the book or movie to analyze.
             media_type: The type of media (Book or Movie).
             verbose: Whether to enable verbose output.
+            task_callback: Optional callable invoked with each task's output as it finishes.
+            step_callback: Optional callable invoked after every agent step.
+            completed_outputs: Optional dict mapping task names (TASK_CONFIGS keys) to outputs
+                               saved by an earlier run. Those tasks are skipped and their
+                               outputs are handed to the remaining tasks directly.
+            checkpoint_callback: Optional callable invoked as checkpoint_callback(task_name, output)
+                                 when a task finishes, so its output can be saved.
             
         Returns:
             A configured Crew object.
         """
-        # Create agents
-        info_gatherer = self.agent_factory.create_info_gatherer(verbose=verbose)
-        insight_analyst = self.agent_factory.create_insight_analyst(verbose=verbose)
-        discussion_facilitator = self.agent_factory.create_discussion_facilitator(verbose=verbose)
+        completed_outputs = completed_outputs or {}
         
-        # Create tasks with media_type-specific descriptions
-        research_task = Task(
-            description=f"{TASK_CONFIGS['research_media']['description']} Title: {media_title}, Type: {media_type}",
-            expected_output=TASK_CONFIGS['research_media']['expected_output'],
-            agent=info_gatherer
-        )
+        def make_callback(task_name):
+            def callback(output):
+                task_finished(task_name)
+                if checkpoint_callback is not None:
+                    checkpoint_callback(task_name, output)
+                if task_callback is not None:
+                    task_callback(output)
+            return callback
         
-        insights_task = Task(
-            description=f"FIRST: Check if the research output contains 'VALIDATION_FAILED'. If it does, respond with exactly the same message and do not perform any analysis. SECOND (only if validation passed): {TASK_CONFIGS['analyze_insights']['description']} This is a {media_type} titled: {media_title}",
-            expected_output=TASK_CONFIGS['analyze_insights']['expected_output'],
-            agent=insight_analyst,
-            context=[research_task]
-        )
+        agents = []
+        tasks = []
         
+        # Create tasks with media_type-specific descriptions, skipping tasks that already finished
+        research_task = None
+        if "research_media" not in completed_outputs:
+            info_gatherer = self.agent_factory.create_info_gatherer(verbose=verbose)
+            research_task = Task(
+                description=f"{TASK_CONFIGS['research_media']['description']} Title: {media_title}, Type: {media_type}",
+                expected_output=TASK_CONFIGS['research_media']['expected_output'],
+                agent=info_gatherer,
+                callback=make_callback("research_media"),
+                guardrail=self.compactor.guardrail_for(media_title, media_type) if self.compactor is not None else None
+            )
+            agents.append(info_gatherer)
+            tasks.append(research_task)
+        
+        insights_task = None
+        if "analyze_insights" not in completed_outputs:
+            insight_analyst = self.agent_factory.create_insight_analyst(verbose=verbose)
+            description = f"FIRST: Check if the research output contains 'VALIDATION_FAILED'. If it does, respond with exactly the same message and do not perform any analysis. SECOND (only if validation passed): {TASK_CONFIGS['analyze_insights']['description']} This is a {media_type} titled: {media_title}"
+            if research_task is None:
+                description = self._with_previous_output(description, "Research output", completed_outputs["research_media"])
+            insights_task = Task(
+                description=description,
+                expected_output=TASK_CONFIGS['analyze_insights']['expected_output'],
+                agent=insight_analyst,
+                context=[research_task] if research_task is not None else None,
+                callback=make_callback("analyze_insights")
+            )
+            agents.append(insight_analyst)
+            tasks.append(insights_task)
+        
+        discussion_facilitator = self.agent_factory.create_discussion_facilitator(verbose=verbose)
+        description = f"FIRST: Check if the research output or insights output contains 'VALIDATION_FAILED'. If it does, respond with exactly the same message and do not create any questions. SECOND (only if validation passed): {TASK_CONFIGS['create_questions']['description']} This is a {media_type} titled: {media_title}"
+        if research_task is None:
+            description = self._with_previous_output(description, "Research output", completed_outputs["research_media"])
+        if insights_task is None:
+            description = self._with_previous_output(description, "Insights output", completed_outputs["analyze_insights"])
         questions_task = Task(
-            description=f"FIRST: Check if the research output or insights output contains 'VALIDATION_FAILED'. If it does, respond with exactly the same message and do not create any questions. SECOND (only if validation passed): {TASK_CONFIGS['create_questions']['description']} This is a {media_type} titled: {media_title}",
+            description=description,
             expected_output=TASK_CONFIGS['create_questions']['expected_output'],
             agent=discussion_facilitator,
-            context=[research_task, insights_task]
+            context=[task for task in [research_task, insights_task] if task is not None] or None,
+            callback=make_callback("create_questions")
         )
+        agents.append(discussion_facilitator)
+        tasks.append(questions_task)
         
         # Create crew
         crew = Crew(
-            agents=[info_gatherer, insight_analyst, discussion_facilitator],
-            tasks=[research_task, insights_task, questions_task],
+            agents=agents,
+            tasks=tasks,
             verbose=verbose,
             process=Process.sequential,
+            step_callback=step_callback,
             # Add significant delay between agent actions to avoid rate limits
             # agent_execution_delay=10  # 10 seconds delay between agent actions (commented out for speed)
         )
@@ -0,0 +1,143 @@
+"""
+Single-pass "fast mode" pipeline.
+One structured generation, optionally grounded by a single batched research
+fetch, writes the 8 two-sentence discussion questions that the three-agent crew
+would otherwise produce over several agent loops. check_questions_output lets
+the caller escalate to the full crew when the output does not have the expected shape.
+"""
+
+import re
+import logging
+from typing import Any, Optional
+from src.compaction import extract_urls
+
+logger = logging.getLogger(__name__)
+
+# Execution modes: "fast" runs only this pipeline, "deep" only the crew, and
+# "auto" runs this pipeline first and escalates to the crew when its output is rejected
+# (or goes straight to the crew when there is no research tool to supply Sources)
+EXECUTION_MODES = ("auto", "fast", "deep")
+
+QUESTION_COUNT = 8
+
+FAST_PROMPT = (
+    "You are an experienced discussion group moderator with a background in philosophy and critical "
+    "thinking. Write exactly {count} intellectually stimulating discussion questions about the "
+    "{media_type} \"{title}\".\n\n"
+    "Rules:\n"
+    "- Focus on philosophical concepts, ethical dilemmas, character psychology, societal implications, "
+    "symbolic meanings and thematic depth, not on technique such as writing style or cinematography.\n"
+    "- Each question has exactly 2 sentences: the first summarizes an insight about the work, the "
+    "second poses the question.\n"
+    "- No yes/no questions and no questions about personal experiences.\n"
+    "- Present them as a numbered list (1, 2, 3, ..., {count}) in plain text without markdown.\n"
+    "{sources_rule}\n"
+    "If \"{title}\" is not a real {media_type}, respond only with 'VALIDATION_FAILED: The input does "
+    "not appear to be a {media_type} title. Please enter a valid {media_type} title.'\n"
+    "{research}"
+)
+
+# Sources are only ever the pages the research actually read; URLs written from the
+# model's memory may not exist, so without research the answer has no Sources section
+SOURCES_RULE = "- Do not write a sources section or any URLs; sources are added separately."
+
+_NUMBERED_ITEM = re.compile(r"^\s*(\d{1,2})[.)]\s+(.*)$")
+_SOURCES_HEADING = re.compile(r"^[\s*#]*Sources[\s*:]*$", re.IGNORECASE | re.MULTILINE)
+
+
+def check_questions_output(text: str) -> Optional[str]:
+    """
+    Check that output has the shape of a finished Insight Facilitator answer.
+
+    Args:
+        text: The generated output.
+
+    Returns:
+        None when the output has exactly 8 numbered questions followed by a Sources
+        section with at least one URL, otherwise a short description of the problem.
+    """
+    heading = _SOURCES_HEADING.search(text)
+    if heading is None:
+        return "missing Sources section"
+    if not extract_urls(text[heading.end():]):
+        return "Sources section has no URLs"
+
+    questions = []
+    for line in text[:heading.start()].splitlines():
+        match = _NUMBERED_ITEM.match(line)
+        if match:
+            questions.append(match.group(2))
+        elif questions and line.strip():
+            # Wrapped continuation of the previous question
+            questions[-1] += " " + line.strip()
+    if len(questions) != QUESTION_COUNT:
+        return f"expected {QUESTION_COUNT} questions, got {len(questions)}"
+    if any("?" not in question for question in questions):
+        return "a numbered item is not a question"
+    return None
+
+
+class FastPipeline:
+    """Writes the discussion questions with one LLM call instead of three agent loops."""
+
+    def __init__(self, llm: Any, research_tool: Any = None):
+        """
+        Initialize the FastPipeline.
+
+        Args:
+            llm: The LLM used for the single generation. Its max_tokens must fit 8
+                 questions (about 1,000 tokens).
+            research_tool: Optional BatchResearchTool. When set, one batched research
+                           fetch grounds the questions and supplies the exact Sources list.
+        """
+        self.llm = llm
+        self.research_tool = research_tool
+
+    @property
+    def can_research(self) -> bool:
+        """Whether answers can list Sources; without research auto mode always escalates."""
+        return self.research_tool is not None
+
+    def run(self, media_title: str, media_type: str = "Book", reporter: Any = None, job: Any = None) -> str:
+        """
+        Generate the discussion questions and Sources for a title.
+
+        Args:
+            media_title: The title of the book or movie.
+            media_type: The type of media (Book or Movie).
+            reporter: Optional ProgressReporter that receives progress and streamed tokens.
+            job: Optional CrewJob checked for cancellation between steps.
+
+        Returns:
+            The questions followed by a Sources section (left out when no page could be
+            researched, so auto mode escalates to the crew), or the validation failure message.
+        """
+        if reporter is not None:
+            reporter.started()
+
+        research = ""
+        if self.research_tool is not None:
+            try:
+                research = self.research_tool._run(title=media_title, media_type=media_type)
+            except Exception as e:
+                logger.warning(f"Fast mode research skipped for '{media_title}': {str(e)}")
+        # The digest ends with the pages it actually read; earlier URLs are search snippets
+        urls = extract_urls(research.rsplit("Sources:", 1)[-1])
+
+        if job is not None:
+            job.check_cancelled()
+        if reporter is not None:
+            reporter.skip_to_answer()
+
+        prompt = FAST_PROMPT.format(
+            count=QUESTION_COUNT,
+            media_type=media_type.lower(),
+            title=media_title,
+            sources_rule=SOURCES_RULE,
+            research=f"\nResearch notes:\n{research}" if urls else ""
+        )
+        answer = str(self.llm.call([{"role": "user", "content": prompt}])).strip()
+
+        if urls and "VALIDATION_FAILED" not in answer:
+            answer += "\n\nSources\n" + "\n".join(f"• {url}" for url in urls)
+        return answer
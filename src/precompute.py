@@ -0,0 +1,301 @@
+"""
+Background precompute of popular titles.
+Most requests are for a few hundred titles, so a low-priority job keeps their
+results in the result store before anyone asks. Each cycle ranks titles from
+a curated list (current releases, reading lists) and from recent demand in
+the request trace log, then analyses the ones with no stored result or whose
+result expires soon. A run only starts when the service has idle capacity
+beyond a reserve for interactive users, and runs are spaced out and capped
+per cycle.
+"""
+
+import os
+import csv
+import json
+import time
+import threading
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.title_index import normalize_title
+
+logger = logging.getLogger(__name__)
+
+# Statuses of inputs that are not real titles: they show no demand and store no result
+_IGNORED_STATUSES = ("invalid_title", "validation_failed")
+
+# Cycle outcomes: a new result stored (computed or refreshed), a result already
+# stored (cached), an input that is not a real title (skipped), or an error (failed)
+OUTCOMES = ("computed", "refreshed", "cached", "skipped", "failed")
+
+
+def _media_type(value: Optional[str], default: str = "Book") -> str:
+    value = (value or default).lower()
+    return "Movie" if "movie" in value or "film" in value else "Book"
+
+
+def read_ranked_titles(path: str, default_media_type: str = "Book") -> List[Tuple[str, str]]:
+    """
+    Read a ranked list of (title, media_type) pairs, most popular first.
+
+    CSV files need a "title" column and may have a "media_type" column; JSONL
+    files hold one object per line with the same fields; any other file is read
+    as one title per line. A missing file gives an empty list.
+    """
+    if not path or not os.path.exists(path):
+        return []
+    titles = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            records = (json.loads(line) for line in f if line.strip())
+        elif path.endswith(".csv"):
+            records = csv.DictReader(f)
+        else:
+            records = ({"title": line} for line in f if not line.startswith("#"))
+        for record in records:
+            fields = {str(key).strip().lower(): value for key, value in record.items() if key}
+            title = (fields.get("title") or "").strip()
+            if title:
+                titles.append((title, _media_type(fields.get("media_type") or fields.get("type"), default_media_type)))
+    return titles
+
+
+def read_request_demand(path: Optional[str], window_seconds: float, half_life_seconds: float,
+                        now: Optional[float] = None) -> Dict[Tuple[str, str], Tuple[str, float]]:
+    """
+    Weigh recent interactive requests per title from the JSON trace log.
+
+    Each request counts 1 when it is new and half as much every half-life;
+    requests older than the window, batch and precompute runs, and invalid
+    titles are left out.
+
+    Returns:
+        A dictionary mapping (normalized title, media type) to the latest
+        spelling of the title and its demand.
+    """
+    demand: Dict[Tuple[str, str], Tuple[str, float]] = {}
+    if not path or not os.path.exists(path):
+        return demand
+    now = time.time() if now is None else now
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.startswith("{"):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            age = now - record.get("timestamp", 0)
+            title = (record.get("title") or "").strip()
+            if (record.get("event") != "request" or not title or age > window_seconds
+                    or record.get("batch") or record.get("precompute")
+                    or record.get("status") in _IGNORED_STATUSES):
+                continue
+            media_type = _media_type(record.get("media_type"))
+            key = (normalize_title(title), media_type)
+            weight = 0.5 ** (max(age, 0) / half_life_seconds)
+            demand[key] = (title, demand.get(key, (title, 0.0))[1] + weight)
+    return demand
+
+
+def rank_titles(ranked: List[Tuple[str, str]], demand: Dict[Tuple[str, str], Tuple[str, float]],
+                list_weight: float, limit: int) -> List[Tuple[str, str]]:
+    """
+    Merge the curated list with recent demand and return the top titles.
+
+    The first title of the list counts as list_weight recent requests, the
+    tenth as half that, and so on; a title in both adds the two scores.
+    """
+    scores: Dict[Tuple[str, str], Tuple[str, float]] = dict(demand)
+    for rank, (title, media_type) in enumerate(ranked):
+        key = (normalize_title(title), media_type)
+        if key[0]:
+            score = list_weight * 10 / (rank + 10)
+            scores[key] = (title, scores.get(key, (title, 0.0))[1] + score)
+    ordered = sorted(scores.items(), key=lambda item: -item[1][1])
+    return [(title, media_type) for (_, media_type), (title, _) in ordered[:limit]]
+
+
+class PrecomputeJob:
+    """Scheduled low-priority analyses that keep popular titles in the result store."""
+
+    def __init__(self,
+                 analyze: Callable[[str, str, bool], str],
+                 stored_at: Callable[[str, str], Optional[float]],
+                 claim_capacity: Callable[[], Optional[Callable[[], None]]],
+                 titles_path: Optional[str] = None,
+                 request_log_path: Optional[str] = None,
+                 max_titles: int = 200,
+                 list_weight: float = 5.0,
+                 demand_window_seconds: float = 7 * 24 * 3600,
+                 demand_half_life_seconds: float = 2 * 24 * 3600,
+                 ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 refresh_before_seconds: float = 24 * 3600,
+                 interval_seconds: float = 3600,
+                 max_runs_per_cycle: int = 20,
+                 min_gap_seconds: float = 30.0,
+                 idle_poll_seconds: float = 5.0):
+        """
+        Initialize the PrecomputeJob.
+
+        Args:
+            analyze: Runs one analysis and stores its result: analyze(title, media_type, refresh)
+                     returns "ok", "cached", "invalid_title" or "validation_failed".
+                     refresh is True when a stored result is replaced.
+            stored_at: Returns when a title's result was stored, or None if there is none.
+            claim_capacity: Returns a release callable when a background run may start now,
+                            or None while interactive users need the capacity.
+            titles_path: Ranked list of popular titles (CSV, JSONL or one title per line).
+            request_log_path: JSON trace log the recent demand is read from.
+            max_titles: Number of top-ranked titles kept warm.
+            list_weight: Number of recent requests the top title of the list is worth.
+            demand_window_seconds: How far back the request log is read.
+            demand_half_life_seconds: Age at which a request counts half.
+            ttl_seconds: Lifetime of a stored result. None means results never expire.
+            refresh_before_seconds: Results closer than this to expiry are refreshed.
+            interval_seconds: Time between the starts of two cycles.
+            max_runs_per_cycle: Analyses started per cycle at most.
+            min_gap_seconds: Pause after each analysis, leaving room for interactive requests.
+            idle_poll_seconds: How often to check for idle capacity while the service is busy.
+        """
+        self.analyze = analyze
+        self.stored_at = stored_at
+        self.claim_capacity = claim_capacity
+        self.titles_path = titles_path
+        self.request_log_path = request_log_path
+        self.max_titles = max_titles
+        self.list_weight = list_weight
+        self.demand_window_seconds = demand_window_seconds
+        self.demand_half_life_seconds = demand_half_life_seconds
+        self.ttl_seconds = ttl_seconds
+        self.refresh_before_seconds = refresh_before_seconds
+        self.interval_seconds = interval_seconds
+        self.max_runs_per_cycle = max_runs_per_cycle
+        self.min_gap_seconds = min_gap_seconds
+        self.idle_poll_seconds = idle_poll_seconds
+        self.counts = {outcome: 0 for outcome in OUTCOMES}
+        self.last_cycle: Optional[Dict[str, object]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: dict, analyze: Callable[[str, str, bool], str],
+                    stored_at: Callable[[str, str], Optional[float]],
+                    claim_capacity: Callable[[], Optional[Callable[[], None]]],
+                    ttl_seconds: Optional[float]) -> "PrecomputeJob":
+        """Create a PrecomputeJob from a PRECOMPUTE_CONFIG-style dictionary."""
+        return cls(
+            analyze, stored_at, claim_capacity,
+            titles_path=config["titles_path"],
+            request_log_path=config["request_log_path"],
+            max_titles=config["max_titles"],
+            list_weight=config["list_weight"],
+            demand_window_seconds=config["demand_window_seconds"],
+            demand_half_life_seconds=config["demand_half_life_seconds"],
+            ttl_seconds=ttl_seconds,
+            refresh_before_seconds=config["refresh_before_seconds"],
+            interval_seconds=config["interval_seconds"],
+            max_runs_per_cycle=config["max_runs_per_cycle"],
+            min_gap_seconds=config["min_gap_seconds"],
+            idle_poll_seconds=config["idle_poll_seconds"]
+        )
+
+    def candidates(self, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """Return the top-ranked titles, most popular first."""
+        ranked = read_ranked_titles(self.titles_path)
+        demand = read_request_demand(self.request_log_path, self.demand_window_seconds,
+                                     self.demand_half_life_seconds, now=now)
+        if not ranked and not demand:
+            logger.warning(
+                f"Precompute has no titles: the list {self.titles_path or '(not set)'} is missing or empty "
+                f"and the request log {self.request_log_path or '(not set)'} has no recent requests"
+            )
+        return rank_titles(ranked, demand, self.list_weight, self.max_titles)
+
+    def due(self, candidates: List[Tuple[str, str]], now: Optional[float] = None) -> List[Tuple[str, str, bool]]:
+        """Return (title, media_type, refresh) for candidates with no result or one that expires soon."""
+        now = time.time() if now is None else now
+        due = []
+        for title, media_type in candidates:
+            stored = self.stored_at(title, media_type)
+            if stored is None:
+                due.append((title, media_type, False))
+            elif self.ttl_seconds is not None and now - stored >= self.ttl_seconds - self.refresh_before_seconds:
+                due.append((title, media_type, True))
+        return due
+
+    def _wait_for_capacity(self, deadline: float) -> Optional[Callable[[], None]]:
+        # Interactive requests always come first: poll until a slot is free beyond the reserve
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            release = self.claim_capacity()
+            if release is not None:
+                return release
+            self._stop.wait(self.idle_poll_seconds)
+        return None
+
+    def run_once(self, deadline: Optional[float] = None) -> Dict[str, object]:
+        """
+        Run one cycle: rank titles, then analyse the due ones while capacity is idle.
+
+        Args:
+            deadline: time.monotonic() value after which no new analysis starts
+                      (default: one interval from now).
+
+        Returns:
+            A summary of the cycle: candidates, due titles and the count of each outcome.
+        """
+        started = time.monotonic()
+        deadline = started + self.interval_seconds if deadline is None else deadline
+        candidates = self.candidates()
+        due = self.due(candidates)
+        summary = {"candidates": len(candidates), "due": len(due), **{outcome: 0 for outcome in OUTCOMES}}
+        for title, media_type, refresh in due[:self.max_runs_per_cycle]:
+            release = self._wait_for_capacity(deadline)
+            if release is None:
+                break
+            try:
+                status = self.analyze(title, media_type, refresh)
+                if status == "cached":
+                    outcome = "cached"
+                elif status in _IGNORED_STATUSES:
+                    outcome = "skipped"
+                else:
+                    outcome = "refreshed" if refresh else "computed"
+                logger.info(f"Precomputed '{title}' ({media_type}): {status}")
+            except Exception as e:
+                outcome = "failed"
+                logger.warning(f"Precompute of '{title}' ({media_type}) failed: {str(e)}")
+            finally:
+                release()
+            summary[outcome] += 1
+            self.counts[outcome] += 1
+            # Spacing runs out keeps a burst of precomputes from crowding out new users
+            if self._stop.wait(self.min_gap_seconds):
+                break
+        summary["seconds"] = round(time.monotonic() - started, 1)
+        self.last_cycle = summary
+        logger.info(f"Precompute cycle: {summary}")
+        return summary
+
+    def start(self, wait_ready: Optional[Callable[[], bool]] = None) -> None:
+        """Run cycles every interval on a daemon thread, after wait_ready() returns True."""
+        if self._thread is not None:
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                next_cycle = time.monotonic() + self.interval_seconds
+                try:
+                    if wait_ready is not None and not wait_ready():
+                        logger.warning("Precompute cycle skipped: the analysis service is not ready")
+                        continue
+                    self.run_once(deadline=next_cycle)
+                except Exception as e:
+                    logger.error(f"Precompute cycle failed: {str(e)}")
+                finally:
+                    self._stop.wait(max(next_cycle - time.monotonic(), 0))
+
+        self._thread = threading.Thread(target=loop, name="precompute", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
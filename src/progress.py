@@ -0,0 +1,182 @@
+"""
+Progress reporting for streaming crew runs to the UI.
+A ProgressReporter collects task completions and final-answer tokens from a
+crew running in a worker thread and hands them to the UI as they happen.
+"""
+
+import queue
+import threading
+import contextvars
+import logging
+from typing import Any, Iterator, Optional, Tuple
+from utils.rate_limiter import add_wait_listener
+
+logger = logging.getLogger(__name__)
+
+# Crew stages in execution order: (agent role, status shown while the stage runs)
+STAGES = [
+    ("Information Gatherer", "Researching the title and collecting sources"),
+    ("Insight Analyst", "Analyzing themes, characters and ideas"),
+    ("Discussion Facilitator", "Writing the discussion questions"),
+]
+
+# Marker that precedes the final answer in an agent's ReAct output
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+# Reporter for the crew running in the current thread, if any
+_current_reporter: contextvars.ContextVar = contextvars.ContextVar("progress_reporter", default=None)
+
+_streaming_lock = threading.Lock()
+_streaming_installed = None
+
+
+class ProgressReporter:
+    """Thread-safe channel of progress events from a crew run to the UI."""
+
+    def __init__(self):
+        self.events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self.completed_stages = 0
+        self.streamed_tokens = False
+        self._answer_buffer = ""
+        self._answer_started = False
+
+    def activate(self) -> None:
+        """Bind this reporter to the current thread so LLM token events reach it."""
+        _current_reporter.set(self)
+
+    def started(self, completed_stages: int = 0) -> None:
+        """Record that a crew run (or a retry of it) started for this request.
+
+        Args:
+            completed_stages: Number of leading stages restored from checkpoints.
+        """
+        self.completed_stages = completed_stages
+        self._answer_buffer = ""
+        self._answer_started = False
+        self.events.put(("started", completed_stages))
+
+    def task_completed(self, task_output: Any) -> None:
+        """Crew task_callback: record that one sequential task finished."""
+        self.completed_stages += 1
+        self.events.put(("task", getattr(task_output, "agent", "")))
+
+    def token(self, chunk: str) -> None:
+        """Forward a streamed LLM chunk once the final stage reaches its answer."""
+        if self.completed_stages < len(STAGES) - 1 or not chunk:
+            return
+        if self._answer_started:
+            self.streamed_tokens = True
+            self.events.put(("token", chunk))
+            return
+        # Hold back the agent's reasoning until the final answer begins
+        self._answer_buffer += chunk
+        marker_index = self._answer_buffer.find(FINAL_ANSWER_MARKER)
+        if marker_index >= 0:
+            self._answer_started = True
+            remainder = self._answer_buffer[marker_index + len(FINAL_ANSWER_MARKER):].lstrip()
+            self._answer_buffer = ""
+            if remainder:
+                self.streamed_tokens = True
+                self.events.put(("token", remainder))
+
+    def skip_to_answer(self) -> None:
+        """Jump to the final stage and stream every following token, for single-call pipelines."""
+        self.started(completed_stages=len(STAGES) - 1)
+        self._answer_started = True
+
+    def waiting(self, limiter_name: str, seconds: float) -> None:
+        """Record that the crew is about to wait on a client-side rate limit."""
+        self.events.put(("wait", (limiter_name, seconds)))
+
+    def queued(self, position: int, seconds: float) -> None:
+        """Record the request's place in the admission queue and its estimated wait."""
+        self.events.put(("queued", (position, seconds)))
+
+    def finish(self, result: str) -> None:
+        """Record the final result."""
+        self.events.put(("done", result))
+
+    def fail(self, error: BaseException) -> None:
+        """Record that the run failed."""
+        self.events.put(("error", error))
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        """Yield events until the run finishes or fails."""
+        while True:
+            kind, payload = self.events.get()
+            yield kind, payload
+            if kind in ("done", "error"):
+                return
+
+
+def format_progress(completed_stages: int, note: Optional[str] = None) -> str:
+    """Render a plain-text checklist of crew stages for the results box."""
+    lines = []
+    for index, (_, label) in enumerate(STAGES):
+        if index < completed_stages:
+            marker = "✓"
+        elif index == completed_stages:
+            marker = "…"
+        else:
+            marker = " "
+        lines.append(f"[{marker}] {label}")
+    if note:
+        lines.append("")
+        lines.append(note)
+    return "\n".join(lines)
+
+
+def _on_stream_chunk(source: Any, event: Any) -> None:
+    reporter = _current_reporter.get()
+    if reporter is not None:
+        reporter.token(getattr(event, "chunk", ""))
+
+
+def _on_rate_limit_wait(limiter_name: str, seconds: float) -> None:
+    reporter = _current_reporter.get()
+    if reporter is not None and seconds >= 1.0:
+        reporter.waiting(limiter_name, seconds)
+
+
+add_wait_listener(_on_rate_limit_wait)
+
+
+def format_wait(limiter_name: str, seconds: float) -> str:
+    """Describe a rate-limit wait for the user."""
+    service = "search" if limiter_name == "serper" else "AI model"
+    return f"High demand: waiting about {max(1, round(seconds))} seconds for {service} capacity..."
+
+
+def format_duration(seconds: float) -> str:
+    """Describe a duration for the user, e.g. "45 seconds" or "3 minutes"."""
+    if seconds < 90:
+        return f"{max(1, round(seconds))} seconds"
+    return f"{round(seconds / 60)} minutes"
+
+
+def format_queue(position: Optional[int], wait_seconds: float, run_seconds: float) -> str:
+    """Describe a request's place in line and when its results should be ready."""
+    if position is None or wait_seconds < 1.0:
+        return f"Starting now. Results usually take about {format_duration(run_seconds)}."
+    return (f"You are #{position + 1} in line. Estimated start in about {format_duration(wait_seconds)}, "
+            f"results in about {format_duration(wait_seconds + run_seconds)}.")
+
+
+def install_token_streaming() -> bool:
+    """
+    Subscribe to CrewAI LLM stream events once per process.
+
+    Returns:
+        True if token streaming is available in the installed CrewAI version.
+    """
+    global _streaming_installed
+    with _streaming_lock:
+        if _streaming_installed is None:
+            try:
+                from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+                crewai_event_bus.on(LLMStreamChunkEvent)(_on_stream_chunk)
+                _streaming_installed = True
+            except Exception as e:
+                logger.info(f"LLM token streaming unavailable: {str(e)}")
+                _streaming_installed = False
+        return _streaming_installed
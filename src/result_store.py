@@ -0,0 +1,158 @@
+"""
+Persistent store for finished Insight Facilitator results.
+Results are keyed on the normalized title, media type, result tier, model and a
+hash of the prompt configuration, so a change to any prompt invalidates old
+entries and a single-call result never answers a request for the full crew.
+"""
+
+import json
+import hashlib
+import threading
+import logging
+from typing import Callable, Optional, Tuple
+from utils.disk_cache import DiskCache, SingleFlight
+from utils.title_index import TitleIndex, normalize_title
+from config.agent_config import (
+    INFO_GATHERER_CONFIG, INSIGHT_ANALYST_CONFIG, DISCUSSION_FACILITATOR_CONFIG, TASK_CONFIGS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_prompt_config_hash() -> str:
+    """Return a short, stable hash of every agent and task prompt."""
+    payload = json.dumps(
+        [INFO_GATHERER_CONFIG, INSIGHT_ANALYST_CONFIG, DISCUSSION_FACILITATOR_CONFIG, TASK_CONFIGS],
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def result_tier(mode: str) -> str:
+    """Return the result tier of an execution mode: "deep" for the full crew, "fast" otherwise."""
+    return "deep" if mode == "deep" else "fast"
+
+
+def make_result_key(title_key: str, media_type: str, model: str, config_hash: str, tier: str = "deep") -> str:
+    """Build the cache key for one analysis from a canonical title key."""
+    raw = "|".join([title_key, media_type.strip().lower(), tier, model, config_hash])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """Disk-backed, deduplicating store in front of the crew runner."""
+
+    def __init__(self, cache: DiskCache, model: str, title_index: Optional[TitleIndex] = None):
+        """
+        Initialize the ResultStore.
+
+        Args:
+            cache: The DiskCache holding finished results.
+            model: The model name, which is part of every key.
+            title_index: Optional alias index that resolves title variants to one key.
+        """
+        self.cache = cache
+        self.model = model
+        self.title_index = title_index
+        self.config_hash = get_prompt_config_hash()
+        self._single_flight = SingleFlight()
+
+    @classmethod
+    def from_config(cls, config: dict, model: str) -> "ResultStore":
+        """Create a ResultStore from a RESULT_CACHE_CONFIG-style dictionary."""
+        cache = DiskCache(
+            config["path"],
+            table="results",
+            ttl_seconds=config["ttl_seconds"],
+            max_entries=config["max_entries"],
+            max_bytes=config["max_bytes"]
+        )
+        # The alias index is persisted in the same database file as the results
+        title_index = None
+        if config.get("title_index_enabled", True):
+            title_index = TitleIndex(config["path"], threshold=config.get("title_match_threshold", 0.8))
+        return cls(cache, model, title_index)
+
+    def canonical_title(self, title: str) -> str:
+        """Return the canonical key for a title, resolving known variants."""
+        if self.title_index is None:
+            return normalize_title(title)
+        return self.title_index.resolve(title)
+
+    def key_for(self, title: str, media_type: str, mode: str = "deep") -> str:
+        """Return the result key for a title, media type and execution mode."""
+        return make_result_key(
+            self.canonical_title(title), media_type, self.model, self.config_hash, result_tier(mode)
+        )
+
+    def get(self, title: str, media_type: str, mode: str = "deep") -> Optional[str]:
+        """Return a cached result, or None on a miss."""
+        result = self.cache.get(self.key_for(title, media_type, mode))
+        if result is None and result_tier(mode) != "deep":
+            # A full crew result also answers an auto or fast request
+            result = self.cache.get(self.key_for(title, media_type, "deep"))
+        return result
+
+    def stored_at(self, title: str, media_type: str, mode: str = "deep") -> Optional[float]:
+        """Return when the cached result for a title was stored (epoch seconds), or None on a miss."""
+        entry = self.cache.get_entry(self.key_for(title, media_type, mode))
+        return None if entry is None else entry[1]
+
+    def set(self, title: str, media_type: str, result: str, mode: str = "deep") -> None:
+        """Store a result, replacing any cached one."""
+        self.cache.set(self.key_for(title, media_type, mode), result)
+        if self.title_index is not None:
+            self.title_index.add(title)
+
+    def get_or_run(self, title: str, media_type: str, run: Callable[[], object], mode: str = "deep",
+                   cancelled: Optional[threading.Event] = None, force: bool = False) -> Tuple[str, bool]:
+        """
+        Return a cached result or compute it once for all concurrent callers.
+
+        Args:
+            title: The media title.
+            media_type: The type of media (Book or Movie).
+            run: Zero-argument callable that runs the crew and returns its output.
+            mode: The execution mode; "deep" results are kept apart from fast and auto ones.
+            cancelled: Event set when the caller disconnects; a caller waiting on
+                       another caller's run then stops waiting.
+            force: Run even if a result is cached and replace it, as refreshes and
+                   regenerations do; concurrent callers still share the run.
+
+        Returns:
+            A tuple of (result text, cached) where cached is True when no new
+            crew run was started for this caller.
+        """
+        key = self.key_for(title, media_type, mode)
+        cached = None if force else self.get(title, media_type, mode)
+        if cached is not None:
+            logger.info(f"Result cache hit for '{title}' ({media_type}, {result_tier(mode)})")
+            return cached, True
+
+        def compute():
+            # Another caller may have finished while we were waiting for the lock
+            existing = None if force else self.get(title, media_type, mode)
+            if existing is not None:
+                return existing
+            result = str(run())
+            # Validation failures are not cached so a flaky rejection does not stick
+            if "VALIDATION_FAILED" not in result:
+                self.cache.set(key, result)
+                if self.title_index is not None:
+                    self.title_index.add(title)
+            return result
+
+        result, shared = self._single_flight.do(key, compute, cancelled=cancelled)
+        return result, shared
+
+    def in_flight(self, title: str, media_type: str, mode: str = "deep") -> bool:
+        """Return True if a run for this title is in progress and a new caller would share it."""
+        return self._single_flight.in_flight(self.key_for(title, media_type, mode))
+
+    def abandon(self, title: str, media_type: str, cancel: Callable[[], None], mode: str = "deep") -> None:
+        """Leave a run; cancel() runs now, or once the last caller sharing the run has left too."""
+        self._single_flight.abandon(self.key_for(title, media_type, mode), cancel)
+
+    def followers(self, title: str, media_type: str, mode: str = "deep") -> int:
+        """Return how many other callers are waiting on the in-flight run for a title."""
+        return self._single_flight.followers(self.key_for(title, media_type, mode))
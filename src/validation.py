@@ -0,0 +1,107 @@
+"""
+Pre-flight title validation.
+A single short LLM call checks that the input names a real book or movie before
+CrewFactory builds any agents, so invalid input never pays for the full crew.
+Verdicts are cached on disk per normalized title and media type.
+"""
+
+import logging
+from typing import Any, NamedTuple, Optional
+from utils.disk_cache import DiskCache
+from utils.title_index import normalize_title
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_PROMPT = (
+    "Is \"{title}\" the title of a real, published {media_type}? "
+    "Minor spelling mistakes, missing articles, subtitles or author names are fine. "
+    "Answer with exactly one word: VALID or INVALID."
+)
+
+
+def validation_failed_message(media_type: str) -> str:
+    """Return the message the crew itself uses when validation fails."""
+    media = media_type.lower()
+    return (f"VALIDATION_FAILED: The input does not appear to be a {media} title. "
+            f"Please enter a valid {media} title.")
+
+
+class ValidationResult(NamedTuple):
+    """Outcome of a pre-flight check."""
+    valid: bool
+    message: Optional[str] = None
+    cached: bool = False
+
+
+class TitleValidator:
+    """Cheap classifier that rejects inputs which are not real books or movies."""
+
+    def __init__(self, llm: Any, valid_cache: Optional[DiskCache] = None,
+                 invalid_cache: Optional[DiskCache] = None):
+        """
+        Initialize the TitleValidator.
+
+        Args:
+            llm: A small, low max_tokens LLM used for the one-word verdict.
+            valid_cache: Optional cache of titles known to be valid.
+            invalid_cache: Optional cache of titles known to be invalid.
+        """
+        self.llm = llm
+        self.valid_cache = valid_cache
+        self.invalid_cache = invalid_cache
+
+    @classmethod
+    def from_config(cls, config: dict, llm: Any) -> "TitleValidator":
+        """Create a TitleValidator from a VALIDATION_CONFIG-style dictionary."""
+        valid_cache = DiskCache(config["path"], table="known_valid_titles",
+                                ttl_seconds=config["valid_ttl_seconds"], max_entries=100000, max_bytes=None)
+        invalid_cache = DiskCache(config["path"], table="known_invalid_titles",
+                                  ttl_seconds=config["invalid_ttl_seconds"], max_entries=100000, max_bytes=None)
+        return cls(llm, valid_cache, invalid_cache)
+
+    @staticmethod
+    def _key(title: str, media_type: str) -> str:
+        return f"{media_type.strip().lower()}|{normalize_title(title)}"
+
+    def mark_valid(self, title: str, media_type: str) -> None:
+        """Remember that a title is valid, e.g. after a successful crew run."""
+        if self.valid_cache is not None:
+            self.valid_cache.set(self._key(title, media_type), "valid")
+
+    def validate(self, title: str, media_type: str) -> ValidationResult:
+        """
+        Check whether the title names a real work of the given media type.
+
+        Errors from the LLM fail open: the title is treated as valid and the crew's own
+        validation step remains as a backstop.
+
+        Args:
+            title: The title as typed by the user.
+            media_type: The type of media (Book or Movie).
+
+        Returns:
+            A ValidationResult; message holds the user-facing failure text when invalid.
+        """
+        key = self._key(title, media_type)
+        if self.valid_cache is not None and self.valid_cache.get(key) is not None:
+            return ValidationResult(True, cached=True)
+        if self.invalid_cache is not None and self.invalid_cache.get(key) is not None:
+            return ValidationResult(False, validation_failed_message(media_type), cached=True)
+
+        prompt = VALIDATION_PROMPT.format(title=title.strip(), media_type=media_type.lower())
+        try:
+            answer = str(self.llm.call([{"role": "user", "content": prompt}])).strip().upper()
+        except Exception as e:
+            logger.warning(f"Title validation skipped for '{title}': {str(e)}")
+            return ValidationResult(True)
+
+        # Anything other than a clear rejection is treated as valid
+        if answer.startswith("INVALID"):
+            logger.info(f"Rejected {media_type} '{title}' before building the crew")
+            if self.invalid_cache is not None:
+                self.invalid_cache.set(key, "invalid")
+            return ValidationResult(False, validation_failed_message(media_type))
+
+        if answer.startswith("VALID"):
+            self.mark_valid(title, media_type)
+        return ValidationResult(True)
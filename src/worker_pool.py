@@ -0,0 +1,177 @@
+"""
+Bounded pool of crew workers.
+Each worker thread owns its own LLM, AgentFactory and CrewFactory, so concurrent
+analyses never share mutable agent or tool state. Jobs wait in a bounded queue,
+carry a deadline, and can be cancelled while queued or between agent steps.
+"""
+
+import time
+import queue
+import threading
+import contextvars
+import logging
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, List, Optional
+from utils.deadline import set_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the crew queue has no room for another request."""
+
+
+class CrewCancelledError(Exception):
+    """Raised inside a crew run when its request was cancelled or timed out."""
+
+
+class CrewJob:
+    """A unit of work submitted to the CrewWorkerPool."""
+
+    def __init__(self, func: Callable[[Any, "CrewJob"], Any], timeout: Optional[float]):
+        self.func = func
+        self.future: Future = Future()
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.deadline = self.submitted_at + timeout if timeout else None
+        self._cancel_event = threading.Event()
+        self._context = contextvars.copy_context()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Return the seconds left before the deadline, or None without a deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self) -> None:
+        """Request cancellation; a running crew stops at its next agent step."""
+        self._cancel_event.set()
+        self.future.cancel()
+
+    def check_cancelled(self, *args, **kwargs) -> None:
+        """Raise CrewCancelledError if the job was cancelled or ran out of time.
+
+        Accepts and ignores any arguments so it can be used directly as a CrewAI
+        step or task callback.
+        """
+        if self._cancel_event.is_set():
+            raise CrewCancelledError("Crew run cancelled")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise CrewCancelledError("Crew run exceeded its time limit")
+
+    def result(self) -> Any:
+        """Wait for the job and return its result, enforcing the deadline."""
+        try:
+            return self.future.result(timeout=self.remaining())
+        except FutureTimeoutError:
+            self.cancel()
+            raise TimeoutError("The analysis took too long and was stopped. Please try again.")
+
+
+class CrewWorkerPool:
+    """Fixed set of worker threads, each with isolated crew factories."""
+
+    def __init__(self,
+                 factory_builder: Callable[[], Any],
+                 num_workers: int = 2,
+                 max_queue: int = 8,
+                 request_timeout: Optional[float] = 600.0):
+        """
+        Initialize the CrewWorkerPool.
+
+        Args:
+            factory_builder: Zero-argument callable returning a new CrewFactory. It is
+                             called once in each worker thread.
+            num_workers: Number of crews that may run at the same time.
+            max_queue: Number of requests that may wait for a free worker.
+            request_timeout: Seconds a request may spend queued plus running.
+        """
+        self.factory_builder = factory_builder
+        self.num_workers = num_workers
+        self.max_queue = max_queue
+        self.request_timeout = request_timeout
+
+        self._queue: "queue.Queue[Optional[CrewJob]]" = queue.Queue()
+        self._submit_lock = threading.Lock()
+        self._active = 0
+        self._active_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        for index in range(num_workers):
+            thread = threading.Thread(target=self._worker, name=f"crew-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    @property
+    def active(self) -> int:
+        """Number of jobs currently running."""
+        return self._active
+
+    def submit(self, func: Callable[[Any, CrewJob], Any], timeout: Optional[float] = None) -> CrewJob:
+        """
+        Queue a job for the next free worker.
+
+        Args:
+            func: Callable invoked as func(crew_factory, job) in a worker thread.
+            timeout: Optional per-request timeout overriding the pool default.
+
+        Returns:
+            The queued CrewJob.
+
+        Raises:
+            QueueFullError: If the queue is full.
+        """
+        job = CrewJob(func, timeout if timeout is not None else self.request_timeout)
+        with self._submit_lock:
+            # Idle workers will pick jobs up immediately, so they add to the capacity
+            capacity = self.max_queue + max(0, self.num_workers - self._active)
+            if self._queue.qsize() >= capacity:
+                raise QueueFullError("The service is busy right now. Please try again in a few minutes.")
+            self._queue.put_nowait(job)
+        return job
+
+    def shutdown(self) -> None:
+        """Stop the workers after the jobs already queued."""
+        for _ in self._threads:
+            self._queue.put(None)
+
+    @staticmethod
+    def _run_job(job: CrewJob, crew_factory: Any) -> Any:
+        # Calls deep inside the crew (e.g. each LLM call) bound their waits by this deadline
+        set_deadline(job.deadline)
+        return job.func(crew_factory, job)
+
+    def _worker(self) -> None:
+        crew_factory = None
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.cancelled or not job.future.set_running_or_notify_cancel():
+                continue
+            with self._active_lock:
+                self._active += 1
+            job.started_at = time.monotonic()
+            try:
+                job.check_cancelled()
+                # Build this worker's private LLM, agents and tools on first use
+                if crew_factory is None:
+                    crew_factory = self.factory_builder()
+                # Run in the submitter's context so request-scoped state follows the job
+                result = job._context.run(self._run_job, job, crew_factory)
+                job.future.set_result(result)
+            except BaseException as e:
+                if isinstance(e, CrewCancelledError):
+                    logger.info(f"{threading.current_thread().name}: {str(e)}")
+                job.future.set_exception(e)
+            finally:
+                with self._active_lock:
+                    self._active -= 1
@@ -0,0 +1,103 @@
+"""Tests for FIFO admission, queue limits, cancellation and wait estimates."""
+
+import pytest
+from src import admission as admission_module
+from src.admission import AdmissionController, AdmissionRejected
+
+
+class Clock:
+    def __init__(self):
+        self.now = 500.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission_module.time, "monotonic", clock)
+    return clock
+
+
+def test_tickets_run_in_arrival_order(clock):
+    controller = AdmissionController(max_running=1, max_queued=3, max_wait_seconds=None)
+    first, second, third = controller.admit(), controller.admit(), controller.admit()
+    assert first.running and first.position() is None
+    assert (second.position(), third.position()) == (0, 1)
+    first.release()
+    assert second.running and third.position() == 0
+
+
+def test_full_queue_rejects(clock):
+    controller = AdmissionController(max_running=1, max_queued=1, max_wait_seconds=None)
+    controller.admit()
+    controller.admit()
+    with pytest.raises(AdmissionRejected):
+        controller.admit()
+
+
+def test_long_estimated_wait_rejects(clock):
+    controller = AdmissionController(max_running=1, max_queued=5, max_wait_seconds=100, default_run_seconds=60)
+    controller.admit()
+    controller.admit()
+    with pytest.raises(AdmissionRejected):
+        controller.admit()
+
+
+def test_cancelled_ticket_leaves_the_line(clock):
+    controller = AdmissionController(max_running=1, max_queued=3, max_wait_seconds=None)
+    running, waiting, behind = controller.admit(), controller.admit(), controller.admit()
+    waiting.cancel()
+    assert waiting.cancelled and waiting.wait(0)
+    assert behind.position() == 0
+    running.release()
+    assert behind.running and controller.running == 1
+
+
+def test_durations_are_measured_per_mode(clock):
+    controller = AdmissionController(max_running=1, max_wait_seconds=None, default_run_seconds=60)
+    for mode, seconds in [("fast", 10), ("deep", 120), ("fast", 20)]:
+        ticket = controller.admit(mode)
+        clock.now += seconds
+        ticket.release()
+    assert controller.typical_run_seconds("fast") == 20
+    assert controller.typical_run_seconds("deep") == 120
+    assert controller.typical_run_seconds("auto") == 60
+
+
+def test_wait_estimate_uses_the_mode_of_each_run_ahead(clock):
+    controller = AdmissionController(max_running=1, max_wait_seconds=None)
+    controller._durations["fast"].append(10)
+    controller._durations["deep"].append(100)
+    controller.admit("deep")
+    clock.now += 40
+    controller.admit("fast")
+    assert controller.estimate_wait(0) == 60
+    assert controller.estimate_wait(1) == 70
+
+
+def test_cancelled_and_background_runs_do_not_update_estimates(clock):
+    controller = AdmissionController(max_running=2, max_wait_seconds=None, default_run_seconds=60)
+    ticket = controller.admit("deep")
+    clock.now += 5
+    ticket.release(completed=False)
+    assert controller.typical_run_seconds("deep") == 60
+
+
+def test_idle_admission_keeps_slots_free_for_users(clock):
+    controller = AdmissionController(max_running=2, max_queued=2, max_wait_seconds=None)
+    background = controller.try_admit_idle(reserve=1, mode="auto")
+    assert background.running and background.mode == "auto"
+    assert controller.try_admit_idle(reserve=1) is None
+    assert controller.admit().running
+    assert controller.try_admit_idle(reserve=0) is None
+
+
+def test_one_request_per_session():
+    controller = AdmissionController()
+    assert controller.claim_session("a")
+    assert not controller.claim_session("a")
+    assert controller.claim_session(None)
+    controller.release_session("a")
+    assert controller.claim_session("a")
@@ -0,0 +1,56 @@
+"""Tests for saving and resuming task checkpoints."""
+
+import pytest
+from src.checkpoints import TASK_ORDER, CheckpointStore
+from utils.disk_cache import DiskCache
+
+
+class TaskOutput:
+    def __init__(self, raw):
+        self.raw = raw
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(DiskCache(str(tmp_path / "checkpoints.sqlite3"), table="task_checkpoints"))
+
+
+def test_saved_outputs_round_trip_in_task_order(store):
+    store.save("request", "analyze_insights", TaskOutput("insights"))
+    store.save("request", "research_media", "research")
+    store.save("request", "create_questions", TaskOutput("questions"))
+    assert list(store.load("request")) == TASK_ORDER
+    assert store.load("request") == {
+        "research_media": "research", "analyze_insights": "insights", "create_questions": "questions"
+    }
+
+
+def test_upto_stops_before_the_named_task(store):
+    for task_name in TASK_ORDER:
+        store.save("request", task_name, task_name.upper())
+    assert store.load("request", upto="create_questions") == {
+        "research_media": "RESEARCH_MEDIA", "analyze_insights": "ANALYZE_INSIGHTS"
+    }
+    assert store.load("request", upto="research_media") == {}
+
+
+def test_resume_stops_at_the_first_missing_task(store):
+    # A run that failed after research resumes from the research only, even if a
+    # later task's output is left over from another run
+    store.save("request", "research_media", "research")
+    store.save("request", "create_questions", "stale questions")
+    assert store.load("request") == {"research_media": "research"}
+
+
+def test_validation_failures_and_empty_outputs_are_not_saved(store):
+    store.save("request", "research_media", "VALIDATION_FAILED: not a book")
+    store.save("request", "analyze_insights", TaskOutput(""))
+    assert store.load("request") == {}
+
+
+def test_requests_are_kept_apart_and_cleared(store):
+    store.save("a", "research_media", "research a")
+    store.save("b", "research_media", "research b")
+    store.clear("a")
+    assert store.load("a") == {}
+    assert store.load("b") == {"research_media": "research b"}
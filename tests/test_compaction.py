@@ -0,0 +1,72 @@
+"""Tests for research compaction and its exact source URL list."""
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("dotenv")
+
+from src.compaction import ResearchCompactor, extract_urls
+
+LONG_RESEARCH = (
+    "Dune (https://en.wikipedia.org/wiki/Dune_(novel)) is a 1965 novel. " * 40
+    + "See https://www.britannica.com/topic/Dune-novel-by-Herbert, and https://example.com/review?id=7&p=2."
+)
+
+
+class FakeLLM:
+    def __init__(self, answer="Key facts: Frank Herbert, 1965. Also see https://made-up.example/page"):
+        self.answer = answer
+        self.prompts = []
+
+    def call(self, messages):
+        self.prompts.append(messages[0]["content"])
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+
+@pytest.mark.parametrize("text, urls", [
+    ("Read https://example.com/a.", ["https://example.com/a"]),
+    ("(see https://example.com/b), then", ["https://example.com/b"]),
+    ("https://en.wikipedia.org/wiki/Dune_(novel)!", ["https://en.wikipedia.org/wiki/Dune_(novel)"]),
+    ("**https://example.com/c**: bold", ["https://example.com/c"]),
+    ("https://example.com/d?x=1; https://example.com/d?x=1", ["https://example.com/d?x=1"]),
+])
+def test_extract_urls_strips_trailing_punctuation_and_duplicates(text, urls):
+    assert extract_urls(text) == urls
+
+
+def test_short_research_passes_through_unchanged():
+    llm = FakeLLM()
+    research = "Dune is a novel. Source: https://example.com/dune"
+    assert ResearchCompactor(llm, max_tokens=600).compact(research, "Dune", "Book") == research
+    assert llm.prompts == []
+
+
+def test_validation_failures_pass_through_unchanged():
+    research = "VALIDATION_FAILED: " + "x" * 5000
+    assert ResearchCompactor(FakeLLM(), max_tokens=10).compact(research, "Asdf", "Book") == research
+
+
+def test_digest_keeps_source_urls_verbatim_and_drops_invented_ones():
+    llm = FakeLLM()
+    digest = ResearchCompactor(llm, max_tokens=100).compact(LONG_RESEARCH, "Dune", "Book")
+    assert digest.splitlines()[-3:] == [
+        "- https://en.wikipedia.org/wiki/Dune_(novel)",
+        "- https://www.britannica.com/topic/Dune-novel-by-Herbert",
+        "- https://example.com/review?id=7&p=2",
+    ]
+    assert "made-up.example" not in digest
+    assert digest.startswith("Key facts: Frank Herbert, 1965.")
+    assert '"Dune"' in llm.prompts[0] and "70 words" in llm.prompts[0]
+
+
+def test_model_errors_fall_back_to_the_leading_research():
+    digest = ResearchCompactor(FakeLLM(RuntimeError("timeout")), max_tokens=50).compact(LONG_RESEARCH, "Dune", "Book")
+    assert digest.startswith("Dune (")
+    assert "Source URLs:\n- https://en.wikipedia.org/wiki/Dune_(novel)" in digest
+
+
+def test_guardrail_replaces_the_task_output():
+    output = type("TaskOutput", (), {"raw": "short research"})()
+    assert ResearchCompactor(FakeLLM()).guardrail_for("Dune", "Book")(output) == (True, "short research")
@@ -0,0 +1,45 @@
+"""Tests for boilerplate filtering and BM25 block selection."""
+
+from tools.content_ranker import bm25_scores, is_boilerplate, select_relevant_text, tokenize
+from tools.html_extractor import TextBlock
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    assert tokenize("The Themes of THE Great Gatsby, 1925") == ["themes", "great", "gatsby", "1925"]
+
+
+def test_link_lists_and_banners_are_boilerplate():
+    assert is_boilerplate(TextBlock("Home News Books Films", link_chars=20))
+    assert is_boilerplate(TextBlock("We use cookies. Accept all", link_chars=0))
+    assert not is_boilerplate(TextBlock("Gatsby throws lavish parties to win back Daisy.", link_chars=0))
+
+
+def test_bm25_prefers_documents_with_rarer_query_terms():
+    documents = [tokenize("gatsby gatsby party"), tokenize("daisy green light gatsby"), tokenize("weather report")]
+    scores = bm25_scores(documents, tokenize("green light"))
+    assert scores[1] > scores[0] == scores[2] == 0.0
+
+
+def test_bm25_without_query_scores_zero():
+    assert bm25_scores([["a"], ["b"]], []) == [0.0, 0.0]
+
+
+def test_select_relevant_text_keeps_best_blocks_in_page_order_within_budget():
+    blocks = [
+        TextBlock("Subscribe to our newsletter", 0),
+        TextBlock("Unrelated text about the weather in the city today.", 0),
+        TextBlock("The green light symbolises Gatsby's hope.", 0),
+        TextBlock("Themes of the novel include wealth and class.", 0),
+    ]
+    text = select_relevant_text(blocks, "themes symbolism", budget=90, title_terms="Great Gatsby")
+    assert text.splitlines() == ["The green light symbolises Gatsby's hope.",
+                                 "Themes of the novel include wealth and class."]
+
+
+def test_select_relevant_text_cuts_an_oversized_best_block():
+    blocks = [TextBlock("Gatsby " * 50, 0)]
+    assert select_relevant_text(blocks, "gatsby", budget=20) == ("Gatsby " * 50)[:20]
+
+
+def test_select_relevant_text_of_only_boilerplate_is_empty():
+    assert select_relevant_text([TextBlock("Privacy policy", 0)], "plot", budget=100) == ""
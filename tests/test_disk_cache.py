@@ -0,0 +1,156 @@
+"""Tests for the SQLite DiskCache and the SingleFlight helper."""
+
+import time
+import threading
+import pytest
+from utils.disk_cache import DiskCache, SingleFlight, SingleFlightCancelled
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("utils.disk_cache.time.time", clock)
+    return clock
+
+
+def test_get_returns_stored_value(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("a", "value")
+    assert cache.get("a") == "value"
+    assert cache.get("missing") is None
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60)
+    cache.set("a", "value")
+    clock.now += 59
+    assert cache.get_entry("a") == ("value", 1000.0)
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted_over_max_entries(tmp_path, clock):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", "1")
+    clock.now += 1
+    cache.set("b", "2")
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_entries_are_evicted_over_max_bytes(tmp_path, clock):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_entries=None, max_bytes=10)
+    cache.set("a", "x" * 6)
+    clock.now += 1
+    cache.set("b", "y" * 6)
+    assert cache.get("a") is None
+    assert cache.stats() == {"entries": 1, "bytes": 6}
+
+
+def test_invalid_table_name_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DiskCache(str(tmp_path / "cache.sqlite3"), table="bad name")
+
+
+def _start_leader(flight, key, release):
+    """Start a call that blocks until release is set; returns the thread and its result holder."""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(flight.do(key, lambda: release.wait(5) and "done")))
+    thread.start()
+    while not flight.in_flight(key):
+        time.sleep(0.001)
+    return thread, results
+
+
+def _wait_for_followers(flight, key, count):
+    deadline = time.monotonic() + 5
+    while flight.followers(key) != count and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert flight.followers(key) == count
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader, leader_results = _start_leader(flight, "k", release)
+    follower_results = []
+    follower = threading.Thread(target=lambda: follower_results.append(flight.do("k", lambda: "second")))
+    follower.start()
+    _wait_for_followers(flight, "k", 1)
+    release.set()
+    leader.join()
+    follower.join()
+    assert leader_results == [("done", False)]
+    assert follower_results == [("done", True)]
+    assert not flight.in_flight("k")
+
+
+def test_follower_count_drops_when_a_follower_stops_waiting():
+    flight = SingleFlight(poll_seconds=0.01)
+    release = threading.Event()
+    leader, _ = _start_leader(flight, "k", release)
+    cancelled = threading.Event()
+    errors = []
+
+    def follow():
+        try:
+            flight.do("k", lambda: "second", cancelled=cancelled)
+        except SingleFlightCancelled as e:
+            errors.append(e)
+
+    follower = threading.Thread(target=follow)
+    follower.start()
+    _wait_for_followers(flight, "k", 1)
+    cancelled.set()
+    follower.join(5)
+    assert len(errors) == 1
+    assert flight.followers("k") == 0
+    release.set()
+    leader.join()
+
+
+def test_abandon_cancels_at_once_without_followers():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader, _ = _start_leader(flight, "k", release)
+    flight.abandon("k", release.set)
+    leader.join(5)
+    assert release.is_set()
+
+
+def test_abandon_waits_for_the_last_follower_to_leave():
+    flight = SingleFlight(poll_seconds=0.01)
+    release = threading.Event()
+    leader, _ = _start_leader(flight, "k", release)
+    cancelled = threading.Event()
+    follower = threading.Thread(target=lambda: pytest.raises(SingleFlightCancelled, flight.do, "k", str,
+                                                             cancelled=cancelled))
+    follower.start()
+    _wait_for_followers(flight, "k", 1)
+    flight.abandon("k", release.set)
+    assert not release.is_set()
+    cancelled.set()
+    follower.join(5)
+    leader.join(5)
+    assert release.is_set()
+
+
+def test_errors_are_raised_and_clear_the_call():
+    flight = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flight.do("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert not flight.in_flight("k")
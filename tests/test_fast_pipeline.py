@@ -0,0 +1,81 @@
+"""Tests for the fast pipeline's output check and research grounding."""
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("dotenv")
+
+from src.fast_pipeline import FastPipeline, check_questions_output
+
+QUESTIONS = "\n".join(f"{n}. Insight number {n} about the book. Why does it matter?" for n in range(1, 9))
+SOURCES = "\n\nSources\n• https://example.com/dune"
+
+
+def test_complete_answer_passes():
+    assert check_questions_output(QUESTIONS + SOURCES) is None
+
+
+def test_wrapped_questions_are_counted_once():
+    wrapped = QUESTIONS.replace("Why does", "Why\n   does")
+    assert check_questions_output(wrapped + SOURCES) is None
+
+
+def test_wrong_question_count_is_rejected():
+    seven = "\n".join(QUESTIONS.splitlines()[:7])
+    assert check_questions_output(seven + SOURCES) == "expected 8 questions, got 7"
+
+
+def test_missing_sources_section_is_rejected():
+    assert check_questions_output(QUESTIONS) == "missing Sources section"
+
+
+def test_sources_section_without_urls_is_rejected():
+    assert check_questions_output(QUESTIONS + "\n\nSources:\nWikipedia") == "Sources section has no URLs"
+
+
+def test_numbered_item_without_question_is_rejected():
+    text = QUESTIONS.replace("8. Insight number 8 about the book. Why does it matter?", "8. Just a statement.")
+    assert check_questions_output(text + SOURCES) == "a numbered item is not a question"
+
+
+class FakeLLM:
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+
+    def call(self, messages):
+        self.prompts.append(messages[0]["content"])
+        return self.answer
+
+
+class FakeResearch:
+    def __init__(self, digest):
+        self.digest = digest
+        self.calls = []
+
+    def _run(self, title, media_type="Book"):
+        self.calls.append((title, media_type))
+        return self.digest
+
+
+def test_sources_are_the_pages_research_read():
+    research = FakeResearch("Snippet (https://snippet.example)\n\nSources:\nhttps://example.com/dune")
+    pipeline = FastPipeline(FakeLLM(QUESTIONS), research_tool=research)
+    answer = pipeline.run("Dune", media_type="Book")
+    assert research.calls == [("Dune", "Book")]
+    assert answer.endswith("Sources\n• https://example.com/dune")
+    assert check_questions_output(answer) is None
+
+
+def test_without_research_there_is_no_sources_section():
+    llm = FakeLLM(QUESTIONS)
+    pipeline = FastPipeline(llm)
+    assert not pipeline.can_research
+    assert pipeline.run("Dune") == QUESTIONS
+    assert "Research notes" not in llm.prompts[0]
+
+
+def test_validation_failure_gets_no_sources():
+    research = FakeResearch("Sources:\nhttps://example.com/dune")
+    answer = FastPipeline(FakeLLM("VALIDATION_FAILED: not a book"), research_tool=research).run("Qwerty")
+    assert answer == "VALIDATION_FAILED: not a book"
@@ -0,0 +1,88 @@
+"""Tests for hedged calls and the hedge budget."""
+
+import threading
+import time
+
+import pytest
+
+from utils.hedging import HedgeBudget, hedged_call
+
+
+@pytest.fixture
+def release():
+    # Lets slow calls finish once the test is over instead of holding pool threads
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_fast_call_is_not_hedged():
+    hedges = []
+    assert hedged_call(lambda: "first", hedge_func=lambda: hedges.append(1), hedge_delay=0.2) == "first"
+    assert hedges == []
+
+
+def test_duplicate_fires_only_after_the_hedge_delay(release):
+    start = time.monotonic()
+    launched = []
+
+    def slow():
+        release.wait(2.0)
+        return "first"
+
+    def hedge():
+        launched.append(time.monotonic() - start)
+        return "hedge"
+
+    assert hedged_call(slow, hedge_func=hedge, hedge_delay=0.1) == "hedge"
+    assert launched and launched[0] >= 0.1
+
+
+def test_first_success_wins_and_a_failed_call_does_not(release):
+    def fails_after_hedge():
+        time.sleep(0.15)
+        raise RuntimeError("upstream error")
+
+    def hedge():
+        time.sleep(0.3)
+        return "hedge"
+
+    assert hedged_call(fails_after_hedge, hedge_func=hedge, hedge_delay=0.05) == "hedge"
+
+
+def test_every_call_failing_raises_the_first_error():
+    def fails():
+        raise RuntimeError("upstream error")
+
+    with pytest.raises(RuntimeError, match="upstream error"):
+        hedged_call(fails, hedge_delay=0.05)
+
+
+def test_deadline_raises_timeout_error(release):
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        hedged_call(lambda: release.wait(2.0), hedge_delay=0.05, timeout=0.15)
+    assert time.monotonic() - start < 1.0
+
+
+def test_budget_caps_duplicates_at_the_extra_ratio():
+    budget = HedgeBudget(max_extra_ratio=0.1, burst=2.0)
+    spent = 0
+    for _ in range(200):
+        budget.record_call()
+        spent += budget.try_spend()
+    # The saved-up burst plus 10% of the calls
+    assert 19 <= spent <= 22
+    assert budget.hedges == spent and budget.calls == 200
+
+
+def test_exhausted_budget_skips_the_duplicate(release):
+    budget = HedgeBudget(max_extra_ratio=0.0, burst=0.0)
+    hedges = []
+
+    def slow():
+        time.sleep(0.15)
+        return "first"
+
+    assert hedged_call(slow, hedge_func=lambda: hedges.append(1), hedge_delay=0.05, budget=budget) == "first"
+    assert hedges == [] and budget.hedges == 0
@@ -0,0 +1,50 @@
+"""Tests for streaming HTML text extraction."""
+
+from tools.html_extractor import extract_text_streaming
+
+
+def _extract(html, max_chars=10000, **options):
+    return extract_text_streaming([html.encode("utf-8")], max_chars=max_chars, **options)
+
+
+def test_skipped_subtrees_nest_and_tolerate_unclosed_children():
+    result = _extract("<p>Before</p><nav><ul><li>Home<li>News</ul><script>x()</script></nav>"
+                      "<aside><div>Ad</aside><p>After</p>")
+    assert result.text == "Before\nAfter"
+
+
+def test_void_tags_never_open_a_skipped_subtree():
+    result = _extract("<p>One<br>Two</p><img src=x><p>Three<input name=q></p><p>Four</p>")
+    assert result.text.splitlines() == ["One", "Two", "Three", "Four"]
+
+
+def test_page_wrapped_in_a_form_keeps_its_text():
+    html = ('<html><body><form method="post" action="./Default.aspx"><div id="content">'
+            "<h1>Dune</h1><p>A novel by Frank Herbert.</p><button>Search</button></div></form></body></html>")
+    assert _extract(html).text == "Dune\nA novel by Frank Herbert."
+
+
+def test_site_header_is_skipped_but_an_article_header_is_kept():
+    html = ("<header><a href='/'>Site name</a> Sign in</header>"
+            "<main><article><header><h1>Dune review</h1><p>By a critic</p></header>"
+            "<p>A sweeping epic.</p></article></main><header>Late banner</header>")
+    assert _extract(html).text.splitlines() == ["Dune review", "By a critic", "A sweeping epic."]
+
+
+def test_link_text_is_counted_per_block():
+    blocks = _extract("<p><a href='/a'>Home</a> and text</p>").blocks
+    assert [(block.text, block.link_chars) for block in blocks] == [("Home and text", 4)]
+
+
+def test_stops_once_enough_text_is_collected():
+    html = "".join(f"<p>Paragraph number {n}</p>" for n in range(100))
+    result = extract_text_streaming((html[i:i + 50].encode() for i in range(0, len(html), 50)), max_chars=40)
+    assert result.truncated and len(result.text) <= 40
+    assert result.bytes_read < len(html)
+
+
+def test_byte_cap_and_encoding():
+    result = extract_text_streaming(["<p>Amélie</p>".encode("latin-1")], max_chars=100, encoding="latin-1")
+    assert result.text == "Amélie"
+    capped = extract_text_streaming([b"<p>" + b"x" * 100 + b"</p>"], max_chars=1000, max_bytes=10)
+    assert capped.truncated and capped.bytes_read == 10
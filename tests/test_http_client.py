@@ -0,0 +1,75 @@
+"""Tests for the URL-keyed page cache and its conditional revalidation."""
+
+import pytest
+
+pytest.importorskip("requests")
+
+from utils import http_client
+from utils.disk_cache import DiskCache
+from utils.http_client import HttpCache
+
+URL = "https://example.com/dune"
+BLOCKS = [("Dune is a novel by Frank Herbert.", 0), ("Home News", 9)]
+
+
+class Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(http_client.time, "time", clock)
+    monkeypatch.setattr("utils.disk_cache.time.time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return HttpCache(DiskCache(str(tmp_path / "http.sqlite3"), table="pages", ttl_seconds=3600), fresh_seconds=60)
+
+
+def test_blocks_and_validators_round_trip_by_url(cache):
+    cache.store(URL, BLOCKS, False, 32000, Response({"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"}))
+    page = cache.get(URL)
+    assert page.blocks == BLOCKS
+    assert (page.truncated, page.max_chars, page.etag) == (False, 32000, '"v1"')
+    assert cache.get("https://example.com/other") is None
+
+
+def test_stale_page_is_revalidated_and_refreshed_after_304(cache, clock):
+    cache.store(URL, BLOCKS, False, 32000, Response({"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"}))
+    assert cache.is_fresh(cache.get(URL))
+    clock.now += 61
+    stale = cache.get(URL)
+    assert not cache.is_fresh(stale)
+    assert cache.conditional_headers(stale) == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024"}
+    cache.refresh(URL, stale)
+    refreshed = cache.get(URL)
+    assert cache.is_fresh(refreshed) and refreshed.blocks == BLOCKS
+
+
+def test_pages_expire_after_the_max_age(cache, clock):
+    cache.store(URL, BLOCKS, False, 32000)
+    clock.now += 3601
+    assert cache.get(URL) is None
+
+
+def test_pages_without_validators_send_no_conditional_headers(cache):
+    assert cache.conditional_headers(None) == {}
+    assert cache.conditional_headers(cache.store(URL, BLOCKS, True, 100)) == {}
+
+
+def test_entries_in_an_older_format_are_dropped(cache):
+    cache.cache.set(URL, '{"text": "ranked text", "etag": null, "last_modified": null, "fetched_at": 1000.0}')
+    assert cache.get(URL) is None
+    assert cache.cache.get(URL) is None
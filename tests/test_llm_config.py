@@ -0,0 +1,128 @@
+"""Tests for the routed LLM's rate limiting, latency tracking, hedging and fallback."""
+
+import time
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("dotenv")
+
+from config import llm_config
+from config.llm_config import LLM, RateLimitedLLM, RoutedLLM
+from utils.model_health import get_model_health
+
+
+class SlowLimiter:
+    def __init__(self, wait):
+        self.wait = wait
+        self.settled = []
+
+    def acquire(self, tokens=0.0):
+        time.sleep(self.wait)
+        return self.wait
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        self.settled.append((estimated_tokens, actual_tokens))
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    def call(self, messages, *args, **kwargs):
+        calls.append(self.model)
+        if self.model.endswith("broken"):
+            raise RuntimeError("upstream error")
+        return "answer"
+
+    monkeypatch.setattr(LLM, "call", call)
+    return calls
+
+
+MESSAGES = [{"role": "user", "content": "Write questions"}]
+
+
+def test_limiter_wait_is_not_counted_as_model_latency(monkeypatch, upstream):
+    limiter = SlowLimiter(0.2)
+    monkeypatch.setattr(llm_config, "get_rate_limiter", lambda name: limiter)
+    llm = RoutedLLM(model="openai/limited", max_tokens=100)
+    assert llm.call(MESSAGES) == "answer"
+    snapshot = get_model_health("openai/limited").snapshot()
+    assert snapshot.samples == 1 and snapshot.p95_latency < 0.1
+    assert limiter.settled == [(llm_config.estimate_tokens(MESSAGES) + 100,
+                                llm_config.estimate_tokens(MESSAGES) + llm_config.estimate_tokens("answer"))]
+
+
+def test_limiter_wait_does_not_trigger_a_hedge(monkeypatch, upstream):
+    monkeypatch.setitem(llm_config.HEDGING_CONFIG, "enabled", True)
+    monkeypatch.setitem(llm_config.HEDGING_CONFIG, "min_samples", 1)
+    monkeypatch.setitem(llm_config.HEDGING_CONFIG, "min_delay_seconds", 0.05)
+    monkeypatch.setattr(llm_config, "_hedge_budget", llm_config.HedgeBudget(max_extra_ratio=1.0))
+    health = get_model_health("openai/hedged")
+    health.record(0.01, ok=True)
+    hedge = RateLimitedLLM(model="openai/hedged-twin")
+    llm = RoutedLLM(model="openai/hedged", hedge=hedge)
+    monkeypatch.setattr(llm_config, "get_rate_limiter", lambda name: SlowLimiter(0.2))
+    assert llm.call(MESSAGES) == "answer"
+    assert upstream == ["openai/hedged"]
+    assert health.latency_percentile(0.95) < 0.1
+
+
+def test_failed_call_falls_back_once(upstream):
+    llm = RoutedLLM(model="openai/once-broken", fallback=RoutedLLM(model="openai/once-spare"))
+    assert llm.call(MESSAGES) == "answer"
+    assert upstream == ["openai/once-broken", "openai/once-spare"]
+    assert get_model_health("openai/once-broken").snapshot().error_rate == 1.0
+
+
+def test_failure_is_raised_when_the_fallback_also_fails(upstream):
+    llm = RoutedLLM(model="openai/both-broken", fallback=RoutedLLM(model="openai/spare-broken"))
+    with pytest.raises(RuntimeError):
+        llm.call(MESSAGES)
+    assert upstream == ["openai/both-broken", "openai/spare-broken"]
+
+
+def test_degraded_model_is_skipped_until_its_samples_age_out(monkeypatch, upstream):
+    monkeypatch.setitem(llm_config.MODEL_ROUTING_CONFIG, "min_samples", 2)
+    health = get_model_health("openai/degraded")
+    health.record(1.0, ok=False)
+    health.record(1.0, ok=False)
+    llm = RoutedLLM(model="openai/degraded", fallback=RoutedLLM(model="openai/degraded-spare"))
+    assert llm.call(MESSAGES) == "answer"
+    assert upstream == ["openai/degraded-spare"]
+
+
+def test_model_signature_covers_every_profile_and_fallback(monkeypatch):
+    signature = llm_config.get_model_signature()
+    for name, profile in llm_config.MODEL_PROFILES.items():
+        assert f"{name}={profile['model']}|{profile['fallback_model']}" in signature
+    monkeypatch.setitem(llm_config.MODEL_PROFILES["research_compaction"], "model", "openai/other")
+    assert llm_config.get_model_signature() != signature
+
+
+def test_reported_usage_is_recorded_instead_of_the_estimate(monkeypatch):
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        for callback in callbacks or []:
+            callback.log_success_event(kwargs={}, response_obj={"usage": {"prompt_tokens": 321,
+                                                                          "completion_tokens": 45}},
+                                       start_time=0, end_time=0)
+        return "answer"
+
+    monkeypatch.setattr(LLM, "call", call)
+    recorded = []
+    monkeypatch.setattr(llm_config, "record_tokens", lambda *args, **kwargs: recorded.append((args, kwargs)))
+    limiter = SlowLimiter(0.0)
+    monkeypatch.setattr(llm_config, "get_rate_limiter", lambda name: limiter)
+    llm = RoutedLLM(model="openai/usage", max_tokens=100)
+    assert llm.call(MESSAGES, callbacks=[]) == "answer"
+    assert recorded == [(("openai/usage", 321, 45), {"estimated": False})]
+    assert limiter.settled[0][1] == 321 + 45
+
+
+def test_missing_usage_falls_back_to_a_labelled_estimate(monkeypatch, upstream):
+    recorded = []
+    monkeypatch.setattr(llm_config, "record_tokens", lambda *args, **kwargs: recorded.append((args, kwargs)))
+    RoutedLLM(model="openai/no-usage").call(MESSAGES)
+    prompt_tokens = llm_config.estimate_tokens(MESSAGES)
+    assert recorded == [(("openai/no-usage", prompt_tokens, llm_config.estimate_tokens("answer")),
+                         {"estimated": True})]
@@ -0,0 +1,77 @@
+"""Tests for the rolling model health window."""
+
+import pytest
+
+from utils import model_health
+from utils.model_health import ModelHealth
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(model_health.time, "monotonic", clock)
+    return clock
+
+
+def test_samples_age_out_of_the_window(clock):
+    health = ModelHealth(window_seconds=60)
+    health.record(1.0, ok=False)
+    clock.now += 30
+    health.record(2.0, ok=True)
+    assert health.snapshot().samples == 2
+    clock.now += 31
+    assert health.snapshot() == (1, 0.0, 2.0)
+    clock.now += 30
+    assert health.snapshot() == (0, 0.0, None)
+
+
+def test_window_keeps_only_the_newest_samples(clock):
+    health = ModelHealth(max_samples=3)
+    for latency in (9.0, 1.0, 2.0, 3.0):
+        health.record(latency, ok=True)
+    assert health.snapshot().samples == 3
+    assert health.latency_percentile(1.0) == 3.0
+
+
+def test_latency_percentile_ignores_errors_and_needs_min_samples(clock):
+    health = ModelHealth()
+    for latency in range(1, 21):
+        health.record(float(latency), ok=True)
+    health.record(100.0, ok=False)
+    assert health.latency_percentile(0.95) == 19.0
+    assert health.latency_percentile(0.95, min_samples=21) is None
+
+
+def test_too_few_samples_count_as_healthy(clock):
+    health = ModelHealth()
+    for _ in range(4):
+        health.record(90.0, ok=False)
+    assert not health.degraded(min_samples=5, max_error_rate=0.5, max_p95_latency=10.0)
+
+
+def test_error_rate_threshold(clock):
+    health = ModelHealth()
+    for ok in (True, True, True, False, False):
+        health.record(1.0, ok=ok)
+    assert not health.degraded(min_samples=5, max_error_rate=0.5)
+    health.record(1.0, ok=False)
+    assert health.degraded(min_samples=5, max_error_rate=0.5)
+
+
+def test_p95_latency_threshold(clock):
+    health = ModelHealth()
+    for _ in range(19):
+        health.record(1.0, ok=True)
+    health.record(30.0, ok=True)
+    assert not health.degraded(min_samples=5, max_p95_latency=10.0)
+    health.record(30.0, ok=True)
+    assert health.degraded(min_samples=5, max_p95_latency=10.0)
+    assert not health.degraded(min_samples=5, max_p95_latency=None)
@@ -0,0 +1,120 @@
+"""Tests for precompute title ranking, due selection and capacity-gated cycles."""
+
+import json
+import logging
+import pytest
+from src.precompute import PrecomputeJob, rank_titles, read_ranked_titles, read_request_demand
+
+NOW = 1_000_000.0
+DAY = 24 * 3600
+
+
+def _trace_log(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("plain log line\n")
+        for record in records:
+            f.write(json.dumps({"event": "request", "timestamp": NOW, **record}) + "\n")
+    return str(path)
+
+
+def test_read_ranked_titles_formats(tmp_path):
+    csv_path = tmp_path / "titles.csv"
+    csv_path.write_text("Title,Media_Type\nDune,Book\nHeat,film\n,Book\n", encoding="utf-8")
+    jsonl_path = tmp_path / "titles.jsonl"
+    jsonl_path.write_text('{"title": "Alien", "type": "movie"}\n\n', encoding="utf-8")
+    text_path = tmp_path / "titles.txt"
+    text_path.write_text("# popular\nEmma\n", encoding="utf-8")
+    assert read_ranked_titles(str(csv_path)) == [("Dune", "Book"), ("Heat", "Movie")]
+    assert read_ranked_titles(str(jsonl_path)) == [("Alien", "Movie")]
+    assert read_ranked_titles(str(text_path)) == [("Emma", "Book")]
+    assert read_ranked_titles(str(tmp_path / "missing.csv")) == []
+
+
+def test_request_demand_decays_and_skips_non_interactive_requests(tmp_path):
+    path = _trace_log(tmp_path / "trace.log", [
+        {"title": "Dune", "media_type": "Book"},
+        {"title": "dune", "media_type": "Book", "timestamp": NOW - DAY},
+        {"title": "Dune", "media_type": "Book", "timestamp": NOW - 30 * DAY},
+        {"title": "Heat", "media_type": "Movie", "batch": True},
+        {"title": "Alien", "media_type": "Movie", "precompute": True},
+        {"title": "Asdf", "media_type": "Book", "status": "invalid_title"},
+        {"title": "Emma", "media_type": "Book", "event": "span"},
+    ])
+    demand = read_request_demand(path, window_seconds=7 * DAY, half_life_seconds=DAY, now=NOW)
+    assert demand == {("dune", "Book"): ("dune", pytest.approx(1.5))}
+
+
+def test_rank_titles_merges_list_and_demand():
+    ranked = [("Emma", "Book"), ("Dune", "Book"), ("Heat", "Movie")]
+    demand = {("heat", "Movie"): ("Heat", 6.0), ("alien", "Movie"): ("Alien", 3.0)}
+    assert rank_titles(ranked, demand, list_weight=5.0, limit=3) == [
+        ("Heat", "Movie"), ("Emma", "Book"), ("Dune", "Book")
+    ]
+
+
+def _job(stored=None, capacity=True, analyze=None, **options):
+    stored = stored or {}
+    runs = []
+
+    def run(title, media_type, refresh):
+        runs.append((title, refresh))
+        return analyze(title) if analyze else "ok"
+
+    job = PrecomputeJob(run, lambda title, media_type: stored.get(title),
+                        lambda: (lambda: None) if capacity else None,
+                        ttl_seconds=7 * DAY, refresh_before_seconds=DAY, min_gap_seconds=0,
+                        idle_poll_seconds=0.01, **options)
+    return job, runs
+
+
+def test_due_selects_missing_and_nearly_expired_results():
+    job, _ = _job(stored={"Fresh": NOW - DAY, "Stale": NOW - 6.5 * DAY})
+    candidates = [("Fresh", "Book"), ("Stale", "Book"), ("New", "Movie")]
+    assert job.due(candidates, now=NOW) == [("Stale", "Book", True), ("New", "Movie", False)]
+
+
+def test_run_once_is_capped_and_counts_outcomes(tmp_path):
+    titles = tmp_path / "titles.txt"
+    titles.write_text("Dune\nHeat\nEmma\n", encoding="utf-8")
+
+    def analyze(title):
+        if title == "Heat":
+            raise RuntimeError("boom")
+        return "ok"
+
+    job, runs = _job(analyze=analyze, titles_path=str(titles), max_runs_per_cycle=2)
+    summary = job.run_once()
+    assert runs == [("Dune", False), ("Heat", False)]
+    assert (summary["computed"], summary["failed"], summary["due"]) == (1, 1, 3)
+
+
+def test_cache_hits_and_invalid_titles_are_not_counted_as_computed(tmp_path):
+    titles = tmp_path / "titles.txt"
+    titles.write_text("Dune\nHeat\nQwerty\nAsdf\nEmma\n", encoding="utf-8")
+    statuses = {"Dune": "ok", "Heat": "cached", "Qwerty": "invalid_title", "Asdf": "validation_failed"}
+
+    def analyze(title):
+        if title not in statuses:
+            raise RuntimeError("boom")
+        return statuses[title]
+
+    job, _ = _job(analyze=analyze, titles_path=str(titles))
+    summary = job.run_once()
+    assert {outcome: summary[outcome] for outcome in ("computed", "refreshed", "cached", "skipped", "failed")} == \
+        {"computed": 1, "refreshed": 0, "cached": 1, "skipped": 2, "failed": 1}
+    assert job.counts == {"computed": 1, "refreshed": 0, "cached": 1, "skipped": 2, "failed": 1}
+
+
+def test_run_once_waits_for_idle_capacity(tmp_path):
+    titles = tmp_path / "titles.txt"
+    titles.write_text("Dune\n", encoding="utf-8")
+    job, runs = _job(capacity=False, titles_path=str(titles))
+    summary = job.run_once(deadline=0)
+    assert runs == [] and summary["computed"] == 0
+
+
+def test_empty_sources_are_reported(tmp_path, caplog):
+    job, _ = _job(titles_path=str(tmp_path / "missing.csv"))
+    with caplog.at_level(logging.WARNING, logger="src.precompute"):
+        assert job.candidates() == []
+    assert "Precompute has no titles" in caplog.text
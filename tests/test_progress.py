@@ -0,0 +1,94 @@
+"""Tests for progress events, answer-token gating and progress text."""
+
+import contextvars
+from src import progress
+from src.progress import STAGES, ProgressReporter, format_duration, format_progress, format_queue
+
+
+def _events(reporter):
+    events = []
+    while not reporter.events.empty():
+        events.append(reporter.events.get_nowait())
+    return events
+
+
+def _at_final_stage(reporter):
+    reporter.started()
+    for _ in range(len(STAGES) - 1):
+        reporter.task_completed(None)
+    _events(reporter)
+
+
+def test_tokens_before_the_final_stage_are_dropped():
+    reporter = ProgressReporter()
+    reporter.started()
+    reporter.token("Final Answer: research notes")
+    assert _events(reporter) == [("started", 0)]
+    assert not reporter.streamed_tokens
+
+
+def test_final_stage_reasoning_is_held_back_until_the_answer():
+    reporter = ProgressReporter()
+    _at_final_stage(reporter)
+    for chunk in ["Thought: I now know", " the answer\nFinal ", "Answer:  1. Why", " does it end?", ""]:
+        reporter.token(chunk)
+    assert _events(reporter) == [("token", "1. Why"), ("token", " does it end?")]
+    assert reporter.streamed_tokens
+
+
+def test_a_restart_holds_tokens_back_again():
+    reporter = ProgressReporter()
+    _at_final_stage(reporter)
+    reporter.token("Final Answer: 1.")
+    reporter.started(completed_stages=len(STAGES) - 1)
+    reporter.token("Thought: retrying")
+    assert _events(reporter) == [("token", "1."), ("started", len(STAGES) - 1)]
+
+
+def test_skip_to_answer_streams_every_token():
+    reporter = ProgressReporter()
+    reporter.skip_to_answer()
+    reporter.token("1. Why?")
+    assert _events(reporter) == [("started", len(STAGES) - 1), ("token", "1. Why?")]
+
+
+def test_iteration_stops_after_done_or_error():
+    reporter = ProgressReporter()
+    reporter.task_completed(type("Output", (), {"agent": "Information Gatherer"})())
+    reporter.finish("questions")
+    reporter.queued(0, 5.0)
+    assert list(reporter) == [("task", "Information Gatherer"), ("done", "questions")]
+    failing = ProgressReporter()
+    error = RuntimeError("boom")
+    failing.fail(error)
+    assert list(failing) == [("error", error)]
+
+
+def test_stream_and_wait_events_reach_the_active_reporter_only():
+    reporter = ProgressReporter()
+    _at_final_stage(reporter)
+
+    def in_request():
+        reporter.activate()
+        reporter._answer_started = True
+        progress._on_stream_chunk(None, type("Event", (), {"chunk": "token"})())
+        progress._on_rate_limit_wait("llm", 0.5)
+        progress._on_rate_limit_wait("llm", 3.0)
+
+    contextvars.copy_context().run(in_request)
+    progress._on_stream_chunk(None, type("Event", (), {"chunk": "elsewhere"})())
+    assert _events(reporter) == [("token", "token"), ("wait", ("llm", 3.0))]
+
+
+def test_format_progress_marks_done_current_and_pending_stages():
+    lines = format_progress(1, "note").splitlines()
+    assert [line[:3] for line in lines[:3]] == ["[✓]", "[…]", "[ ]"]
+    assert lines[-1] == "note"
+
+
+def test_format_queue_and_duration():
+    assert format_duration(0.2) == "1 seconds"
+    assert format_duration(150) == "2 minutes"
+    assert format_queue(None, 0.0, 60).startswith("Starting now")
+    assert format_queue(2, 20, 60) == ("You are #3 in line. Estimated start in about 20 seconds, "
+                                       "results in about 80 seconds.")
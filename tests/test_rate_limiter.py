@@ -0,0 +1,88 @@
+"""Tests for the token-bucket rate limiter."""
+
+import pytest
+from utils import rate_limiter
+from utils.rate_limiter import RateLimiter, TokenBucket, configure_rate_limiters, get_rate_limiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_bucket_allows_a_burst_then_spaces_calls_out(clock):
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+
+
+def test_bucket_refills_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    bucket.reserve(2)
+    clock.now += 1
+    assert bucket.peek_wait(1) == 0.0
+    clock.now += 60
+    assert bucket.peek_wait(2) == 0.0
+    assert bucket.peek_wait(3) == 0.0  # larger requests are charged one full bucket
+
+
+def test_peek_wait_does_not_take_capacity(clock):
+    bucket = TokenBucket(per_minute=60, capacity=1)
+    bucket.reserve(1)
+    assert bucket.peek_wait(1) == pytest.approx(1.0)
+    assert bucket.peek_wait(1) == pytest.approx(1.0)
+
+
+def test_refund_returns_unused_tokens(clock):
+    bucket = TokenBucket(per_minute=600, capacity=100)
+    bucket.reserve(100)
+    bucket.refund(40)
+    assert bucket.peek_wait(40) == 0.0
+    assert bucket.peek_wait(41) > 0
+
+
+def test_acquire_sleeps_and_notifies_listeners(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_wait_listeners", [])
+    waits = []
+    rate_limiter.add_wait_listener(lambda name, seconds: waits.append((name, seconds)))
+    limiter = RateLimiter("llm", requests_per_minute=60)
+    limiter.requests = TokenBucket(60, capacity=1)
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == pytest.approx(1.0)
+    assert clock.slept == [pytest.approx(1.0)]
+    assert waits == [("llm", pytest.approx(1.0))]
+
+
+def test_token_limit_uses_the_larger_wait_and_usage_corrections(clock):
+    limiter = RateLimiter("llm", requests_per_minute=600, tokens_per_minute=60)
+    assert limiter.estimated_wait(tokens=60) == 0.0
+    limiter.acquire(tokens=60)
+    assert limiter.estimated_wait(tokens=30) == pytest.approx(30.0)
+    limiter.record_usage(estimated_tokens=60, actual_tokens=30)
+    assert limiter.estimated_wait(tokens=30) == 0.0
+
+
+def test_registry_returns_configured_limiters(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    configure_rate_limiters({"serper": {"requests_per_minute": 30, "tokens_per_minute": None}})
+    limiter = get_rate_limiter("serper")
+    assert limiter.tokens is None and limiter.requests.capacity == 30
+    assert get_rate_limiter("missing") is None
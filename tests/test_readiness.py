@@ -0,0 +1,95 @@
+"""Tests for start-up readiness and the app's lazy warm-up."""
+
+import threading
+
+import pytest
+
+from utils.readiness import Readiness
+
+
+def test_steps_are_timed_even_when_they_fail():
+    readiness = Readiness()
+    with readiness.step("open_caches"):
+        pass
+    with pytest.raises(RuntimeError):
+        with readiness.step("initialize_llm"):
+            raise RuntimeError("no key")
+    assert set(readiness.status()["steps"]) == {"open_caches", "initialize_llm"}
+
+
+def test_waiters_are_released_when_ready():
+    readiness = Readiness()
+    assert not readiness.wait(0.01)
+    results = []
+    waiters = [threading.Thread(target=lambda: results.append(readiness.wait(5))) for _ in range(4)]
+    for waiter in waiters:
+        waiter.start()
+    readiness.mark_ready()
+    for waiter in waiters:
+        waiter.join(5)
+    assert results == [True] * 4
+    status = readiness.status()
+    assert status["state"] == "ready" and status["error"] is None and status["ready_after_seconds"] >= 0.0
+
+
+def test_failure_releases_waiters_and_reset_starts_over():
+    readiness = Readiness()
+    with readiness.step("initialize_llm"):
+        pass
+    readiness.mark_failed(ValueError("OpenAI API key not properly configured"))
+    assert not readiness.wait(5)
+    assert readiness.status()["error"] == "ValueError: OpenAI API key not properly configured"
+    readiness.reset()
+    assert readiness.status()["state"] == "starting" and readiness.status()["steps"] == {}
+    assert not readiness.wait(0.01)
+
+
+@pytest.fixture
+def app(monkeypatch):
+    pytest.importorskip("gradio")
+    import app
+    monkeypatch.setattr(app, "readiness", Readiness())
+    monkeypatch.setattr(app, "_warmup_thread", None)
+    return app
+
+
+def test_concurrent_callers_share_one_lazy_warm_up(app, monkeypatch):
+    runs = []
+    release = threading.Event()
+
+    def warm_up(verbose=True):
+        runs.append(verbose)
+        release.wait(5)
+        app.readiness.mark_ready()
+
+    monkeypatch.setattr(app, "warm_up", warm_up)
+    results = []
+    callers = [threading.Thread(target=lambda: results.append(app.ensure_ready(timeout=5))) for _ in range(8)]
+    for caller in callers:
+        caller.start()
+    release.set()
+    for caller in callers:
+        caller.join(5)
+    assert results == [True] * 8
+    assert len(runs) == 1
+    # Once ready, later requests neither wait nor warm up again
+    assert app.ensure_ready(timeout=0)
+    assert len(runs) == 1
+
+
+def test_failed_warm_up_is_retried_by_the_next_request(app, monkeypatch):
+    outcomes = [RuntimeError("OpenAI API key not properly configured"), None]
+
+    def warm_up(verbose=True):
+        error = outcomes.pop(0)
+        if error is not None:
+            app.readiness.mark_failed(error)
+        else:
+            app.readiness.mark_ready()
+
+    monkeypatch.setattr(app, "warm_up", warm_up)
+    assert not app.ensure_ready(timeout=5)
+    assert app.readiness.status()["error"] == "RuntimeError: OpenAI API key not properly configured"
+    app._warmup_thread.join(5)
+    assert app.ensure_ready(timeout=5)
+    assert outcomes == []
@@ -0,0 +1,28 @@
+"""Tests for the batch research tool's URL helpers."""
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from tools.research_tool import is_skipped_host, normalize_url, parse_search_results
+
+
+@pytest.mark.parametrize("host", ["x.com", "www.youtube.com", "m.facebook.com", "TikTok.com", "x.com:443"])
+def test_skipped_hosts_and_their_subdomains(host):
+    assert is_skipped_host(host)
+
+
+@pytest.mark.parametrize("host", ["vox.com", "netflix.com", "fox.com", "box.com", "foxnews.com", "notyoutube.com"])
+def test_hosts_that_only_end_with_a_skipped_name_are_kept(host):
+    assert not is_skipped_host(host)
+
+
+def test_normalize_url_folds_host_fragment_and_trailing_slash():
+    assert normalize_url("HTTPS://www.Example.com/Book/#plot") == "https://example.com/Book"
+
+
+def test_parse_search_results_reads_json_and_text():
+    raw = {"organic": [{"title": "Dune", "link": "https://a.example/dune", "snippet": "s"}, {"title": "no link"}]}
+    assert parse_search_results(raw) == [{"title": "Dune", "link": "https://a.example/dune", "snippet": "s"}]
+    assert [r["link"] for r in parse_search_results("Title: Dune\nLink: https://a.example/dune\n")] == \
+        ["https://a.example/dune"]
@@ -0,0 +1,86 @@
+"""Tests for result keys and the deduplicating result store."""
+
+import threading
+import pytest
+from src.result_store import ResultStore, make_result_key, result_tier
+from utils.disk_cache import DiskCache
+from utils.title_index import TitleIndex
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    return ResultStore(DiskCache(path, table="results"), "gpt-4o", TitleIndex(path))
+
+
+def test_keys_separate_deep_results_from_fast_and_auto():
+    assert result_tier("deep") == "deep"
+    assert result_tier("fast") == result_tier("auto") == "fast"
+    deep = make_result_key("dune", "Book", "gpt-4o", "abc", "deep")
+    assert deep != make_result_key("dune", "Book", "gpt-4o", "abc", "fast")
+    assert deep == make_result_key("dune", " book ", "gpt-4o", "abc")
+
+
+def test_fast_result_is_not_served_to_a_deep_request(store):
+    store.set("Dune", "Book", "fast questions", mode="auto")
+    assert store.get("Dune", "Book", "fast") == "fast questions"
+    assert store.get("Dune", "Book", "deep") is None
+
+
+def test_deep_result_also_answers_fast_and_auto_requests(store):
+    store.set("Dune", "Book", "deep questions", mode="deep")
+    assert store.get("Dune", "Book", "auto") == "deep questions"
+    assert store.get_or_run("Dune", "Book", lambda: pytest.fail("ran again"), mode="fast") == ("deep questions", True)
+
+
+def test_get_or_run_runs_once_per_mode(store):
+    runs = []
+
+    def run():
+        runs.append(1)
+        return f"questions {len(runs)}"
+
+    assert store.get_or_run("Dune", "Book", run, mode="fast") == ("questions 1", False)
+    assert store.get_or_run("Dune", "Book", run, mode="auto") == ("questions 1", True)
+    assert store.get_or_run("Dune", "Book", run, mode="deep") == ("questions 2", False)
+    assert len(runs) == 2
+
+
+def test_validation_failures_are_not_cached(store):
+    assert store.get_or_run("Dune", "Book", lambda: "VALIDATION_FAILED: not a title") == (
+        "VALIDATION_FAILED: not a title", False
+    )
+    assert store.get("Dune", "Book") is None
+
+
+def test_title_variants_share_a_result(store):
+    store.set("The Great Gatsby", "Book", "questions")
+    assert store.get("The Great Gatsby by F. Scott Fitzgerald", "Book") == "questions"
+    assert store.stored_at("Great Gatsby", "Book") is not None
+    assert store.stored_at("Great Gatsby", "Movie") is None
+
+
+def test_forced_run_replaces_the_result_and_is_shared(store):
+    store.set("Dune", "Book", "old questions")
+    started, release = threading.Event(), threading.Event()
+
+    def refresh():
+        started.set()
+        release.wait(5)
+        return "new questions"
+
+    results = []
+    refresher = threading.Thread(target=lambda: results.append(store.get_or_run("Dune", "Book", refresh, force=True)))
+    refresher.start()
+    started.wait(5)
+    # A caller arriving during the refresh (e.g. after the old result expired) shares it
+    store.cache.delete(store.key_for("Dune", "Book"))
+    caller = threading.Thread(target=lambda: results.append(store.get_or_run("Dune", "Book", lambda: "ran twice")))
+    caller.start()
+    while store.followers("Dune", "Book") == 0:
+        threading.Event().wait(0.01)
+    release.set()
+    refresher.join(5)
+    caller.join(5)
+    assert sorted(results) == [("new questions", False), ("new questions", True)]
+    assert store.get("Dune", "Book") == "new questions"
@@ -0,0 +1,155 @@
+"""Tests for retry policies, Retry-After parsing and circuit breakers."""
+
+import pytest
+from utils import retry_utils
+from utils.retry_utils import (
+    CircuitBreaker, CircuitOpenError, RetryPolicy, get_retry_after, retry_on_exception
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(retry_utils.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(retry_utils.time, "sleep", clock.sleep)
+    return clock
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("api", failure_threshold=3, reset_timeout=30)
+    _open(breaker)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_breaker_lets_one_trial_through(clock):
+    breaker = CircuitBreaker("api", failure_threshold=2, reset_timeout=30)
+    _open(breaker)
+    clock.now += 30
+    assert breaker.state == "half-open"
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_trial_success_closes_and_trial_failure_reopens(clock):
+    breaker = CircuitBreaker("api", failure_threshold=2, reset_timeout=30)
+    _open(breaker)
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_released_trial_keeps_the_breaker_half_open(clock):
+    breaker = CircuitBreaker("api", failure_threshold=2, reset_timeout=30)
+    _open(breaker)
+    clock.now += 30
+    breaker.before_call()
+    breaker.release_trial()
+    assert breaker.state == "half-open"
+    breaker.before_call()
+
+
+def test_non_transient_errors_do_not_reset_the_failure_count(clock):
+    breaker = CircuitBreaker("api", failure_threshold=2, reset_timeout=30)
+    calls = []
+
+    @retry_on_exception(max_retries=0, circuit_breaker=breaker)
+    def call(error):
+        calls.append(error)
+        raise error
+
+    with pytest.raises(RuntimeError):
+        call(RuntimeError("rate limit exceeded"))
+    with pytest.raises(ValueError):
+        call(ValueError("bad title"))
+    with pytest.raises(RuntimeError):
+        call(RuntimeError("rate limit exceeded"))
+    assert breaker.state == "open"
+
+
+def test_non_transient_error_on_trial_does_not_close_the_circuit(clock):
+    breaker = CircuitBreaker("api", failure_threshold=1, reset_timeout=30)
+    _open(breaker)
+    clock.now += 30
+
+    @retry_on_exception(max_retries=0, circuit_breaker=breaker)
+    def cancelled():
+        raise ValueError("request cancelled")
+
+    with pytest.raises(ValueError):
+        cancelled()
+    assert breaker.state == "half-open"
+
+
+def test_retries_transient_errors_until_success(clock):
+    attempts = []
+
+    @retry_on_exception(max_retries=3, initial_delay=1.0, backoff_factor=2.0, jitter="none")
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("Service Unavailable")
+        return "ok"
+
+    assert flaky() == "ok"
+    assert clock.slept == [1.0, 2.0]
+
+
+def test_deadline_stops_retrying(clock):
+    @retry_on_exception(max_retries=5, initial_delay=10.0, backoff_factor=1.0, jitter="none", deadline=15.0)
+    def down():
+        raise RuntimeError("timeout")
+
+    with pytest.raises(RuntimeError):
+        down()
+    assert clock.slept == [10.0]
+
+
+def test_delay_honours_retry_after_and_max_delay():
+    policy = RetryPolicy(initial_delay=1.0, backoff_factor=10.0, max_delay=5.0, jitter="none")
+    assert policy.compute_delay(3) == 5.0
+    assert policy.compute_delay(0, exception=RuntimeError("Rate limit. Please try again in 7.5s")) == 7.5
+
+
+class _Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class _HttpError(Exception):
+    def __init__(self, headers):
+        super().__init__("429")
+        self.response = _Response(headers)
+
+
+def test_get_retry_after_reads_headers_and_messages():
+    assert get_retry_after(_HttpError({"retry-after": "3"})) == 3.0
+    assert get_retry_after(_HttpError({"retry-after-ms": "250"})) == 0.25
+    assert get_retry_after(RuntimeError("try again in 20ms")) == pytest.approx(0.02)
+    assert get_retry_after(RuntimeError("boom")) is None
@@ -0,0 +1,75 @@
+"""Tests for search query normalization and the coalescing search cache."""
+
+import threading
+import pytest
+from utils.disk_cache import DiskCache
+from utils.search_cache import SearchCache, normalize_query
+
+
+@pytest.mark.parametrize("first, second", [
+    ("The Great Gatsby  themes?", "the great gatsby themes"),
+    ("Amélie film analysis.", "amelie film analysis"),
+    ("“Dune” book review!", '"dune" book review'),
+    ("Gatsby’s green light", "gatsby's green light"),
+])
+def test_equivalent_queries_share_a_key(first, second):
+    assert normalize_query(first) == normalize_query(second)
+
+
+def test_symbols_that_change_results_are_kept():
+    keys = {normalize_query(query) for query in ["C++ primer", "C# primer", "C primer"]}
+    assert len(keys) == 3
+    assert normalize_query("Dune site:imdb.com") == "dune site:imdb.com"
+    assert normalize_query("gatsby -movie") == "gatsby -movie"
+
+
+def test_options_are_part_of_the_key():
+    cache = SearchCache()
+    assert cache.key_for("dune", num=5) != cache.key_for("dune", num=10)
+    assert cache.key_for("dune", num=5, gl=None) == cache.key_for("Dune?", num=5)
+
+
+def test_results_are_fetched_once_and_then_hit(tmp_path):
+    cache = SearchCache(DiskCache(str(tmp_path / "searches.sqlite3"), table="searches"))
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return [{"link": "https://example.com"}]
+
+    assert cache.search("Dune themes", fetch) == ([{"link": "https://example.com"}], "miss")
+    assert cache.search("dune themes?", fetch) == ([{"link": "https://example.com"}], "hit")
+    assert len(fetches) == 1
+    assert cache.hit_rate() == 0.5
+
+
+def test_empty_results_are_not_cached(tmp_path):
+    cache = SearchCache(DiskCache(str(tmp_path / "searches.sqlite3"), table="searches"))
+    assert cache.search("dune", lambda: []) == ([], "miss")
+    assert cache.search("dune", lambda: ["result"]) == (["result"], "miss")
+
+
+def test_concurrent_identical_searches_are_coalesced():
+    cache = SearchCache()
+    started, release = threading.Event(), threading.Event()
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        started.set()
+        release.wait(5)
+        return ["result"]
+
+    sources = []
+    leader = threading.Thread(target=lambda: sources.append(cache.search("dune", fetch)[1]))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: sources.append(cache.search("Dune", fetch)[1]))
+    follower.start()
+    while cache._single_flight.followers(cache.key_for("dune")) == 0:
+        threading.Event().wait(0.01)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert sorted(sources) == ["coalesced", "miss"]
+    assert len(fetches) == 1
@@ -0,0 +1,87 @@
+"""Tests for the metrics registry, exposition format and trace propagation."""
+
+import contextvars
+
+import pytest
+
+from src.worker_pool import CrewWorkerPool
+from utils import telemetry
+from utils.hedging import hedged_call
+from utils.telemetry import Counter, Histogram, Trace, current_trace, record_tokens, span
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = Histogram("test_seconds", "Test durations.", buckets=(1.0, 5.0))
+    for value in (0.5, 1.0, 3.0, 10.0):
+        histogram.observe(value, kind="llm")
+    assert histogram.render() == [
+        "# HELP test_seconds Test durations.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{kind="llm",le="1"} 2',
+        'test_seconds_bucket{kind="llm",le="5"} 3',
+        'test_seconds_bucket{kind="llm",le="+Inf"} 4',
+        'test_seconds_sum{kind="llm"} 14.5',
+        'test_seconds_count{kind="llm"} 4',
+    ]
+
+
+def test_counter_sorts_and_escapes_labels():
+    counter = Counter("test_total", "Test events.")
+    counter.inc(model='say "hi"\\', direction="prompt")
+    counter.inc(2, model="b", direction="completion")
+    assert counter.render()[2:] == [
+        'test_total{direction="completion",model="b"} 2',
+        'test_total{direction="prompt",model="say \\"hi\\"\\\\"} 1',
+    ]
+
+
+def test_render_metrics_ends_with_a_newline_and_includes_gauges(monkeypatch):
+    monkeypatch.setattr(telemetry, "_metrics", [])
+    telemetry.register_gauge("test_queued", "Queued jobs.", lambda: 3)
+    telemetry.register_gauge("test_broken", "Fails to read.", lambda: 1 / 0)
+    assert telemetry.render_metrics() == "# HELP test_queued Queued jobs.\n# TYPE test_queued gauge\ntest_queued 3\n"
+
+
+def test_tokens_are_labelled_by_source(monkeypatch):
+    counter = Counter("test_tokens_total", "Tokens.")
+    monkeypatch.setattr(telemetry, "LLM_TOKENS", counter)
+    trace = Trace()
+
+    def body():
+        trace.activate()
+        record_tokens("m", 100, 20)
+        record_tokens("m", 10, 2, estimated=True)
+
+    contextvars.Context().run(body)
+    assert 'test_tokens_total{direction="prompt",model="m",source="estimate"} 10' in counter.render()
+    assert 'test_tokens_total{direction="completion",model="m",source="usage"} 20' in counter.render()
+    assert trace.tokens == {"prompt": 110, "completion": 22, "estimated_calls": 1}
+
+
+@pytest.fixture
+def pool():
+    pool = CrewWorkerPool(lambda: object(), num_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_trace_follows_the_request_into_pool_threads(pool):
+    trace = Trace(title="Dune")
+
+    def job(crew_factory, crew_job):
+        with span("crew", "deep"):
+            # The hedging executor is a second pool the trace has to reach
+            seen = hedged_call(lambda: record_tokens("m", 5, 1) or current_trace())
+        return seen, current_trace()
+
+    def submit():
+        trace.activate()
+        return pool.submit(job, timeout=5)
+
+    crew_job = contextvars.Context().run(submit)
+    assert crew_job.result() == (trace, trace)
+    assert current_trace() is None
+    assert [(entry["kind"], entry["name"]) for entry in trace.spans] == [("crew", "deep")]
+    assert trace.tokens["prompt"] == 5
+    record = trace.finish(mode="deep")
+    assert record["title"] == "Dune" and record["time_by_kind"]["crew"] >= 0.0
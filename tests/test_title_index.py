@@ -0,0 +1,56 @@
+"""Tests for title normalization and the alias index."""
+
+import pytest
+from utils.title_index import TitleIndex, normalize_title
+
+KNOWN = ["Dune", "Star Wars", "Alien", "The Lord of the Rings", "The Stand", "The Great Gatsby", "Rocky II"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TitleIndex(str(tmp_path / "titles.sqlite3"))
+    for title in KNOWN:
+        index.add(title)
+    return index
+
+
+def test_normalize_title_folds_case_accents_articles_and_qualifiers():
+    assert normalize_title("The Great Gatsby (novel)") == "great gatsby"
+    assert normalize_title("  AMÉLIE ") == "amelie"
+    assert normalize_title("Schindler’s List") == "schindlers list"
+    assert normalize_title("Pride & Prejudice") == "pride and prejudice"
+
+
+@pytest.mark.parametrize("title", [
+    "Dune: Part Two",
+    "Star Wars: The Empire Strikes Back",
+    "Alien: Covenant",
+    "Lord of the Rings - The Two Towers",
+    "Stand by Me",
+])
+def test_different_works_do_not_resolve_to_a_shorter_known_title(index, tmp_path, title):
+    assert index.lookup(title) is None
+    assert index.resolve(title) == normalize_title(title)
+    # Nothing was remembered for the next process either
+    assert TitleIndex(str(tmp_path / "titles.sqlite3")).lookup(title) is None
+
+
+@pytest.mark.parametrize("title", [
+    "The Great Gatsby by F. Scott Fitzgerald",
+    "F. Scott Fitzgerald's The Great Gatsby",
+    "The Great Gatsby: A Novel",
+])
+def test_author_and_edition_decorations_resolve_without_saving_an_alias(index, tmp_path, title):
+    assert index.resolve(title) == "great gatsby"
+    assert normalize_title(title) not in TitleIndex(str(tmp_path / "titles.sqlite3"))._aliases
+
+
+def test_fuzzy_match_is_saved_as_an_alias(index, tmp_path):
+    assert index.resolve("The Great Gatsbby") == "great gatsby"
+    assert TitleIndex(str(tmp_path / "titles.sqlite3")).lookup("The Great Gatsbby") == ("great gatsby", 1.0)
+
+
+@pytest.mark.parametrize("title", ["Rocky III", "Rocky 3", "Rocky"])
+def test_sequel_numbers_must_match(index, title):
+    assert index.lookup(title) is None
+
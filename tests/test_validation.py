@@ -0,0 +1,68 @@
+"""Tests for pre-flight title validation and its verdict caches."""
+
+import pytest
+from src.validation import TitleValidator, validation_failed_message
+from utils.disk_cache import DiskCache
+
+
+class FakeLLM:
+    def __init__(self, answer="VALID"):
+        self.answer = answer
+        self.prompts = []
+
+    def call(self, messages):
+        self.prompts.append(messages[0]["content"])
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+
+@pytest.fixture
+def caches(tmp_path):
+    path = str(tmp_path / "validation.sqlite3")
+    return DiskCache(path, table="known_valid_titles"), DiskCache(path, table="known_invalid_titles")
+
+
+def test_invalid_verdict_rejects_and_is_cached(caches):
+    llm = FakeLLM("INVALID")
+    validator = TitleValidator(llm, *caches)
+    result = validator.validate("asdf qwerty", "Book")
+    assert (result.valid, result.cached) == (False, False)
+    assert result.message == validation_failed_message("Book")
+    again = validator.validate("  ASDF Qwerty ", "book")
+    assert (again.valid, again.cached) == (False, True)
+    assert len(llm.prompts) == 1
+
+
+def test_valid_verdict_is_cached_per_media_type(caches):
+    llm = FakeLLM("Valid.")
+    validator = TitleValidator(llm, *caches)
+    assert validator.validate("Dune", "Book").valid
+    assert validator.validate("The Dune", "Book").cached
+    validator.validate("Dune", "Movie")
+    assert len(llm.prompts) == 2
+    assert '"Dune" the title of a real, published movie' in llm.prompts[1]
+
+
+@pytest.mark.parametrize("answer", ["MAYBE", "", RuntimeError("timeout")])
+def test_unclear_answers_and_errors_fail_open_without_caching(caches, answer):
+    llm = FakeLLM(answer)
+    validator = TitleValidator(llm, *caches)
+    assert validator.validate("Dune", "Book") == (True, None, False)
+    validator.validate("Dune", "Book")
+    assert len(llm.prompts) == 2
+
+
+def test_mark_valid_skips_the_model_call(caches):
+    llm = FakeLLM("INVALID")
+    validator = TitleValidator(llm, *caches)
+    validator.mark_valid("Dune", "Book")
+    assert validator.validate("Dune", "Book").valid
+    assert llm.prompts == []
+
+
+def test_works_without_caches():
+    llm = FakeLLM("INVALID")
+    validator = TitleValidator(llm)
+    validator.mark_valid("Dune", "Book")
+    assert not validator.validate("Dune", "Book").valid
@@ -0,0 +1,76 @@
+"""Tests for the scraper's URL-keyed page cache and per-call ranking."""
+
+import json
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("requests")
+
+from tools import web_scraping_tool
+from tools.web_scraping_tool import EnhancedScrapeWebsiteTool
+from utils.disk_cache import DiskCache
+from utils.http_client import HttpCache
+
+URL = "https://example.com/dune"
+PAGE = (b"<html><body><p>Dune follows Paul Atreides on the desert planet Arrakis.</p>"
+        b"<p>Critics praised its themes of ecology and religion.</p></body></html>")
+
+
+class Response:
+    def __init__(self, status_code=200, body=PAGE, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {"ETag": '"v1"'}
+        self.encoding = None
+        self._body = body
+
+    def iter_content(self, chunk_size=1):
+        yield self._body
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fetches(monkeypatch, tmp_path):
+    cache = HttpCache(DiskCache(str(tmp_path / "http.sqlite3"), table="pages"), fresh_seconds=60)
+    monkeypatch.setattr(web_scraping_tool, "_get_page_cache", lambda: cache)
+    requests_made = []
+    responses = []
+
+    def fetch(self, url, headers=None):
+        requests_made.append(headers or {})
+        return responses.pop(0) if responses else Response()
+
+    monkeypatch.setattr(EnhancedScrapeWebsiteTool, "_fetch", fetch)
+    return requests_made, responses, cache
+
+
+def test_one_download_serves_every_query(fetches):
+    requests_made, _, _ = fetches
+    tool = EnhancedScrapeWebsiteTool(max_content_length=60)
+    plot = tool._run(URL, query="plot Arrakis")
+    reception = tool._run(URL, query="critics themes reception")
+    assert len(requests_made) == 1
+    assert "Arrakis" in plot.splitlines()[2]
+    assert "Critics" in reception.splitlines()[2]
+
+
+def test_stale_page_is_revalidated_with_a_conditional_request(fetches):
+    requests_made, responses, cache = fetches
+    tool = EnhancedScrapeWebsiteTool()
+    tool._run(URL)
+    cache.cache.set(URL, json.dumps(cache.get(URL)._replace(fetched_at=0.0)._asdict()))
+    responses.append(Response(status_code=304, body=b""))
+    assert "Arrakis" in tool._run(URL)
+    assert requests_made[-1] == {"If-None-Match": '"v1"'}
+    assert cache.is_fresh(cache.get(URL))
+
+
+def test_title_passed_per_call_ranks_the_same_cached_page(fetches):
+    requests_made, responses, _ = fetches
+    responses.append(Response(body=b"<html><body><p>Dune explores themes of ecology and faith.</p>"
+                                   b"<p>Foundation explores themes of history and empire.</p></body></html>"))
+    tool = EnhancedScrapeWebsiteTool(max_content_length=60)
+    assert "Dune" in tool._run(URL, query="themes", title="Dune").splitlines()[2]
+    assert "Foundation" in tool._run(URL, query="themes", title="Foundation").splitlines()[2]
+    assert len(requests_made) == 1
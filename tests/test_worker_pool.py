@@ -0,0 +1,134 @@
+"""Tests for the crew worker pool: queueing, context, deadlines, cancellation and shutdown."""
+
+import threading
+import contextvars
+import pytest
+from src.worker_pool import CrewCancelledError, CrewWorkerPool, QueueFullError
+from utils.deadline import remaining_time
+
+_request = contextvars.ContextVar("request", default=None)
+
+
+class Gate:
+    """A job body that blocks until opened, so tests control when workers are busy."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.opened = threading.Event()
+
+    def __call__(self, crew_factory, job):
+        self.started.set()
+        self.opened.wait(5)
+        job.check_cancelled()
+        return crew_factory
+
+
+@pytest.fixture
+def pools():
+    created = []
+
+    def make(**options):
+        pool = CrewWorkerPool(lambda: object(), **options)
+        created.append(pool)
+        return pool
+
+    yield make
+    for pool in created:
+        pool.shutdown()
+
+
+def test_each_worker_builds_its_own_factory_once():
+    built = []
+    pool = CrewWorkerPool(lambda: built.append(1) or len(built), num_workers=1)
+    try:
+        assert pool.submit(lambda factory, job: factory).result() == 1
+        assert pool.submit(lambda factory, job: factory).result() == 1
+        assert built == [1]
+    finally:
+        pool.shutdown()
+
+
+def test_queue_is_bounded_beyond_idle_workers(pools):
+    pool = pools(num_workers=1, max_queue=1)
+    gate = Gate()
+    running = pool.submit(gate)
+    gate.started.wait(5)
+    queued = pool.submit(gate)
+    assert (pool.active, pool.queued) == (1, 1)
+    with pytest.raises(QueueFullError):
+        pool.submit(gate)
+    gate.opened.set()
+    running.result()
+    queued.result()
+
+
+def test_jobs_run_in_the_submitters_context_with_its_deadline(pools):
+    pool = pools(num_workers=1, request_timeout=60)
+
+    def submit():
+        _request.set("request-1")
+        return pool.submit(lambda factory, job: (_request.get(), remaining_time()))
+
+    job = contextvars.copy_context().run(submit)
+    request, remaining = job.result()
+    assert request == "request-1"
+    assert 0 < remaining <= 60
+    assert _request.get() is None
+
+
+def test_cancelling_a_queued_job_skips_it(pools):
+    pool = pools(num_workers=1)
+    gate = Gate()
+    running = pool.submit(gate)
+    gate.started.wait(5)
+    ran = []
+    queued = pool.submit(lambda factory, job: ran.append(1))
+    queued.cancel()
+    gate.opened.set()
+    running.result()
+    assert pool.submit(lambda factory, job: "next").result() == "next"
+    assert ran == [] and queued.future.cancelled()
+
+
+def test_cancelling_a_running_job_stops_it_at_the_next_check(pools):
+    pool = pools(num_workers=1)
+    gate = Gate()
+    job = pool.submit(gate)
+    gate.started.wait(5)
+    job.cancel()
+    gate.opened.set()
+    with pytest.raises(Exception):
+        job.result()
+    assert job.cancelled
+    assert pool.submit(lambda factory, job: "next").result() == "next"
+
+
+def test_result_past_the_deadline_cancels_the_job(pools):
+    pool = pools(num_workers=1)
+    gate = Gate()
+    job = pool.submit(gate, timeout=0.05)
+    with pytest.raises(TimeoutError):
+        job.result()
+    assert job.cancelled
+    gate.opened.set()
+
+
+def test_errors_reach_the_caller(pools):
+    pool = pools(num_workers=1)
+
+    def fail(factory, job):
+        raise CrewCancelledError("stopped")
+
+    with pytest.raises(CrewCancelledError):
+        pool.submit(fail).result()
+    assert pool.active == 0
+
+
+def test_shutdown_finishes_queued_jobs_then_stops_workers():
+    pool = CrewWorkerPool(lambda: object(), num_workers=2)
+    jobs = [pool.submit(lambda factory, job, n=n: n) for n in range(4)]
+    pool.shutdown()
+    for thread in pool._threads:
+        thread.join(5)
+    assert [job.result() for job in jobs] == [0, 1, 2, 3]
+    assert not any(thread.is_alive() for thread in pool._threads)
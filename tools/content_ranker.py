@@ -0,0 +1,117 @@
+"""
+Relevance-ranked main-content selection.
+Scraped text blocks are filtered for boilerplate (link lists, cookie banners,
+sign-up prompts) and ranked with BM25 against the media title and research
+focus areas, so each scrape returns the most useful text within its budget.
+"""
+
+import re
+import math
+from collections import Counter
+from typing import Iterable, List, Sequence
+from tools.html_extractor import TextBlock
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Lines that are almost always site chrome rather than content
+_BOILERPLATE = re.compile(
+    r"cookie|privacy policy|terms of (use|service)|all rights reserved|sign (in|up)|log ?in|"
+    r"subscribe|newsletter|advertisement|accept all|skip to (main )?content|jump to (navigation|search)",
+    re.IGNORECASE
+)
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "was", "with",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def is_boilerplate(block: TextBlock, max_link_ratio: float = 0.5) -> bool:
+    """Return True for navigation-like or banner-like blocks."""
+    if block.link_chars > max_link_ratio * len(block.text):
+        return True
+    # Short lines mentioning cookies, sign-in, subscriptions and the like
+    return len(block.text) < 200 and bool(_BOILERPLATE.search(block.text))
+
+
+def bm25_scores(documents: Sequence[List[str]], query: Iterable[str],
+                k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """
+    Score tokenized documents against query terms with Okapi BM25.
+
+    Args:
+        documents: Token lists, one per block; the blocks themselves form the corpus.
+        query: Query terms (duplicates are ignored).
+        k1: Term frequency saturation.
+        b: Length normalization strength.
+
+    Returns:
+        One score per document.
+    """
+    query_terms = set(query)
+    count = len(documents)
+    if not count or not query_terms:
+        return [0.0] * count
+    average_length = sum(len(document) for document in documents) / count or 1.0
+    document_frequency = Counter(term for document in documents for term in set(document) if term in query_terms)
+
+    scores = []
+    for document in documents:
+        frequencies = Counter(document)
+        score = 0.0
+        for term in query_terms:
+            frequency = frequencies.get(term)
+            if not frequency:
+                continue
+            idf = math.log(1 + (count - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            norm = frequency + k1 * (1 - b + b * len(document) / average_length)
+            score += idf * frequency * (k1 + 1) / norm
+        scores.append(score)
+    return scores
+
+
+def select_relevant_text(blocks: Sequence[TextBlock], query: str, budget: int,
+                         title_terms: str = "") -> str:
+    """
+    Return the highest-scoring blocks that fit in budget characters, in page order.
+
+    Args:
+        blocks: Text blocks from the page.
+        query: Free-text relevance query (e.g. research focus areas).
+        budget: Maximum number of characters to return.
+        title_terms: Media title; its terms are weighted double because they anchor relevance.
+
+    Returns:
+        The selected text, one block per line.
+    """
+    content = [block for block in blocks if not is_boilerplate(block)]
+    if not content:
+        return ""
+
+    documents = [tokenize(block.text) for block in content]
+    title_tokens = tokenize(title_terms)
+    scores = bm25_scores(documents, tokenize(query) + title_tokens)
+    if title_tokens:
+        title_scores = bm25_scores(documents, title_tokens)
+        scores = [score + title_score for score, title_score in zip(scores, title_scores)]
+
+    # Greedily take the best blocks, then fill leftover room with unscored blocks in page order
+    order = sorted(range(len(content)), key=lambda index: (-scores[index], index))
+    chosen = set()
+    used = 0
+    for index in order:
+        size = len(content[index].text) + 1
+        if used + size <= budget:
+            chosen.add(index)
+            used += size
+
+    text = "\n".join(content[index].text for index in sorted(chosen))
+    if not text:
+        # Every block is larger than the budget: return the best one, cut to size
+        text = content[order[0]].text[:budget]
+    return text
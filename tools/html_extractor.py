@@ -0,0 +1,183 @@
+"""
+Streaming HTML text extraction.
+Pages are parsed incrementally as chunks arrive: no document tree is built,
+script/style/navigation subtrees and site banners are skipped, and parsing
+stops as soon as enough clean text has been collected or the byte cap is
+reached.
+"""
+
+import re
+import codecs
+from html.parser import HTMLParser
+from typing import Iterable, List, NamedTuple, Optional
+
+# Subtrees whose text is never useful to the agents
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+    "nav", "footer", "aside", "button", "select", "head",
+}
+
+# Elements holding the page's own content; a <header> inside one is the article's
+# heading (its <h1>), while any other <header> is a site banner and skipped
+CONTENT_TAGS = {"main", "article"}
+
+# Tags that end a line of text
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "dl", "dt", "dd", "tr", "td", "th", "table",
+    "section", "article", "main", "header", "blockquote", "pre", "figcaption", "caption",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "title",
+}
+
+# Elements that never have an end tag, so they must not open a skipped subtree
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class TextBlock(NamedTuple):
+    """One line of visible text and how much of it was link text."""
+    text: str
+    link_chars: int
+
+
+class ExtractedText(NamedTuple):
+    """Result of a streaming extraction."""
+    text: str
+    truncated: bool
+    bytes_read: int
+    blocks: List[TextBlock]
+
+
+class StreamingTextExtractor(HTMLParser):
+    """Incremental HTML parser that collects visible text lines."""
+
+    def __init__(self, max_chars: int):
+        """
+        Initialize the StreamingTextExtractor.
+
+        Args:
+            max_chars: Stop collecting once this many characters of text are gathered.
+        """
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.blocks: List[TextBlock] = []
+        self.chars = 0
+        self._current: List[str] = []
+        self._current_link_chars = 0
+        self._link_depth = 0
+        self._skip_stack: List[str] = []
+        self._content_depth = 0
+
+    @property
+    def done(self) -> bool:
+        """True once enough text has been collected."""
+        return self.chars >= self.max_chars
+
+    def _flush(self) -> None:
+        if not self._current:
+            return
+        line = _WHITESPACE.sub(" ", "".join(self._current)).strip()
+        link_chars = self._current_link_chars
+        self._current = []
+        self._current_link_chars = 0
+        if line:
+            self.blocks.append(TextBlock(line, min(link_chars, len(line))))
+            self.chars += len(line) + 1
+
+    def handle_starttag(self, tag, attrs):
+        skipped = tag in SKIP_TAGS or (tag == "header" and not self._content_depth)
+        if skipped and tag not in VOID_TAGS:
+            self._skip_stack.append(tag)
+        elif tag == "a":
+            self._link_depth += 1
+        elif not self._skip_stack:
+            if tag in CONTENT_TAGS:
+                self._content_depth += 1
+            if tag in BLOCK_TAGS:
+                self._flush()
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags never open a subtree
+        if tag in BLOCK_TAGS and not self._skip_stack:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if self._skip_stack:
+            if tag in self._skip_stack:
+                # Close the innermost matching skipped element, tolerating unclosed children
+                while self._skip_stack and self._skip_stack.pop() != tag:
+                    pass
+            return
+        if tag == "a":
+            self._link_depth = max(0, self._link_depth - 1)
+            return
+        if tag in CONTENT_TAGS:
+            self._content_depth = max(0, self._content_depth - 1)
+        if tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip_stack and not self.done:
+            self._current.append(data)
+            if self._link_depth:
+                self._current_link_chars += len(data.strip())
+
+    def text(self) -> str:
+        """Return the collected text, one block per line."""
+        self._flush()
+        return "\n".join(block.text for block in self.blocks)
+
+
+def extract_text_streaming(chunks: Iterable[bytes],
+                           max_chars: int,
+                           max_bytes: int = 2 * 1024 * 1024,
+                           encoding: Optional[str] = None) -> ExtractedText:
+    """
+    Extract readable text from an HTML byte stream, stopping as early as possible.
+
+    Args:
+        chunks: Iterable of raw response body chunks.
+        max_chars: Number of text characters wanted.
+        max_bytes: Hard cap on bytes read from the stream.
+        encoding: Character encoding of the body. Defaults to UTF-8.
+
+    Returns:
+        An ExtractedText with the text (at most max_chars characters), whether it was
+        truncated, how many bytes were read, and the collected text blocks.
+    """
+    decoder = codecs.getincrementaldecoder(_codec_name(encoding))(errors="replace")
+    parser = StreamingTextExtractor(max_chars)
+    bytes_read = 0
+    stopped_early = False
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        remaining = max_bytes - bytes_read
+        if len(chunk) >= remaining:
+            chunk = chunk[:remaining]
+        bytes_read += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or bytes_read >= max_bytes:
+            stopped_early = True
+            break
+
+    if not stopped_early:
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+
+    text = parser.text()
+    truncated = stopped_early or len(text) > max_chars
+    return ExtractedText(text[:max_chars], truncated, bytes_read, parser.blocks)
+
+
+def _codec_name(encoding: Optional[str]) -> str:
+    if encoding:
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            pass
+    return "utf-8"
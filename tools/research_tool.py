@@ -0,0 +1,185 @@
+"""
+Batched research tool.
+Runs several searches about a title at once, dedupes the result URLs, scrapes
+the best ones concurrently and returns one digest, so the research phase takes
+one or two agent iterations instead of a think -> tool -> think round-trip per URL.
+"""
+
+import re
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from crewai.tools import BaseTool
+from config.agent_config import RESEARCH_QUERIES
+from config.performance_config import RESEARCH_FANOUT_CONFIG
+from utils.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+_LINK_LINE = re.compile(r"^Link:\s*(\S+)", re.MULTILINE)
+
+# Sites whose pages are rarely readable by a plain HTTP fetch
+_SKIP_HOSTS = ("youtube.com", "instagram.com", "facebook.com", "tiktok.com", "x.com", "twitter.com")
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for deduplication: lowercase host, no fragment, no trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", host, path, parts.query, ""))
+
+
+def is_skipped_host(host: str) -> bool:
+    """Return True for a skipped site or one of its subdomains (m.youtube.com, but not vox.com for x.com)."""
+    host = host.lower().split(":")[0]
+    return any(host == skipped or host.endswith("." + skipped) for skipped in _SKIP_HOSTS)
+
+
+def parse_search_results(raw: Any) -> List[Dict[str, str]]:
+    """
+    Extract organic results from a Serper search response.
+
+    Args:
+        raw: The search tool's output, either the Serper JSON dictionary or the
+             formatted text older tool versions return.
+
+    Returns:
+        A list of {"title", "link", "snippet"} dictionaries in ranking order.
+    """
+    if isinstance(raw, dict):
+        return [
+            {"title": item.get("title", ""), "link": item["link"], "snippet": item.get("snippet", "")}
+            for item in raw.get("organic", []) if item.get("link")
+        ]
+    return [{"title": "", "link": link, "snippet": ""} for link in _LINK_LINE.findall(str(raw))]
+
+
+class BatchResearchTool(BaseTool):
+    """Searches and scrapes several sources about a title in one call."""
+
+    name: str = "Batch Research Tool"
+    description: str = (
+        "Research a book or movie in one step. Runs searches for its plot, themes and critical "
+        "reception at the same time, scrapes the most relevant pages concurrently and returns a "
+        "single digest with the source URLs. Use this first; use the search and scraping tools "
+        "only to fill specific gaps."
+    )
+
+    def __init__(self, search_tool, scrape_tool, max_urls: Optional[int] = None,
+                 max_workers: Optional[int] = None, page_chars: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """
+        Initialize the BatchResearchTool.
+
+        Args:
+            search_tool: The Serper search tool (rate limited).
+            scrape_tool: The EnhancedScrapeWebsiteTool used to read pages.
+            max_urls: Number of distinct pages to scrape.
+            max_workers: Number of searches or scrapes run at once.
+            page_chars: Character budget per scraped page.
+            timeout: Seconds to wait for all scrapes; slower pages are left out.
+        """
+        super().__init__()
+        self._search_tool = search_tool
+        self._scrape_tool = scrape_tool
+        self._max_urls = max_urls or RESEARCH_FANOUT_CONFIG["max_urls"]
+        self._max_workers = max_workers or RESEARCH_FANOUT_CONFIG["max_workers"]
+        self._page_chars = page_chars or RESEARCH_FANOUT_CONFIG["page_chars"]
+        self._timeout = timeout or RESEARCH_FANOUT_CONFIG["timeout_seconds"]
+
+    def _map(self, func, items: List[Any], timeout: Optional[float] = None) -> List[Any]:
+        """Run func over items on a thread pool, returning None for failed or late items."""
+        executor = ThreadPoolExecutor(max_workers=min(self._max_workers, len(items)) or 1)
+        # Each call runs in a copy of the caller's context so progress and rate-limit notes still reach the user
+        futures = [executor.submit(contextvars.copy_context().run, func, item) for item in items]
+        wait(futures, timeout=timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        results = []
+        for item, future in zip(items, futures):
+            if not future.done() or future.cancelled():
+                logger.warning(f"Research step timed out: {item}")
+                results.append(None)
+            elif future.exception() is not None:
+                logger.warning(f"Research step failed for {item}: {str(future.exception())}")
+                results.append(None)
+            else:
+                results.append(future.result())
+        return results
+
+    def _select_urls(self, searches: List[Tuple[Dict[str, str], List[Dict[str, str]]]]) -> List[Tuple[str, str]]:
+        """Pick up to max_urls distinct URLs, taking results from each query in turn."""
+        selected = []
+        seen = set()
+        rank = 0
+        while len(selected) < self._max_urls and any(rank < len(results) for _, results in searches):
+            for spec, results in searches:
+                if rank >= len(results) or len(selected) >= self._max_urls:
+                    continue
+                link = results[rank]["link"]
+                key = normalize_url(link)
+                if key in seen or is_skipped_host(urlsplit(key).netloc):
+                    continue
+                seen.add(key)
+                selected.append((link, spec["focus"]))
+            rank += 1
+        return selected
+
+    def _run(self, title: str, media_type: str = "Book") -> str:
+        with span("tool", "batch_research"):
+            return self._research(title, media_type)
+
+    def _research(self, title: str, media_type: str) -> str:
+        """
+        Research a title with parallel searches and concurrent scraping.
+
+        Args:
+            title: The book or movie title.
+            media_type: "Book" or "Movie".
+
+        Returns:
+            A digest of search snippets and page extracts, followed by the source URLs.
+        """
+        specs = [
+            {"query": spec["query"].format(title=title, media_type=media_type.lower()), "focus": spec["focus"]}
+            for spec in RESEARCH_QUERIES
+        ]
+        raw_results = self._map(lambda spec: self._search_tool._run(search_query=spec["query"]), specs)
+        searches = [(spec, parse_search_results(raw) if raw is not None else []) for spec, raw in zip(specs, raw_results)]
+
+        urls = self._select_urls(searches)
+        if not urls:
+            return f"No search results were found for the {media_type.lower()} '{title}'."
+
+        pages = self._map(
+            lambda item: self._scrape_tool._run(item[0], max_length=self._page_chars, query=item[1], title=title),
+            urls,
+            timeout=self._timeout
+        )
+
+        sections = [f"Research digest for the {media_type.lower()} '{title}'"]
+        snippets = []
+        seen = set()
+        for _, results in searches:
+            for result in results[:self._max_urls]:
+                key = normalize_url(result["link"])
+                if result["snippet"] and key not in seen:
+                    seen.add(key)
+                    snippets.append(f"- {result['title']}: {result['snippet']} ({result['link']})")
+        if snippets:
+            sections.append("Search snippets:\n" + "\n".join(snippets))
+
+        sources = []
+        for (url, _), page in zip(urls, pages):
+            if page is None or page.startswith("Error scraping"):
+                continue
+            sources.append(url)
+            sections.append(page)
+
+        sections.append("Sources:\n" + "\n".join(f"- {url}" for url in sources or [url for url, _ in urls]))
+        return "\n\n".join(sections)
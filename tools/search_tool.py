@@ -0,0 +1,43 @@
+from typing import Any
+from crewai_tools import SerperDevTool
+from config.performance_config import SEARCH_CACHE_CONFIG
+from utils.rate_limiter import get_rate_limiter
+from utils.search_cache import get_search_cache
+from utils.telemetry import span, record_cache
+
+# Tool settings that change what Serper returns, so they are part of the cache key
+_SEARCH_OPTIONS = ("search_type", "n_results", "country", "location", "locale")
+
+def _get_search_cache():
+    """Return the shared search cache; without a usable disk cache it only coalesces concurrent searches."""
+    path = SEARCH_CACHE_CONFIG["path"] if SEARCH_CACHE_CONFIG["enabled"] else None
+    try:
+        return get_search_cache(
+            path,
+            ttl_seconds=SEARCH_CACHE_CONFIG["ttl_seconds"],
+            max_entries=SEARCH_CACHE_CONFIG["max_entries"],
+            max_bytes=SEARCH_CACHE_CONFIG["max_bytes"]
+        )
+    except Exception as e:
+        print(f"Search cache disabled: {str(e)}")
+        return get_search_cache(None)
+
+class RateLimitedSerperDevTool(SerperDevTool):
+    """SerperDevTool that caches results by normalized query, coalesces identical searches
+    and waits on the shared "serper" rate limiter before each upstream search."""
+
+    def _run(self, **kwargs: Any) -> Any:
+        """Return cached results for the query, or run a Serper search once the search budget allows it."""
+        query = kwargs.get("search_query") or kwargs.get("query") or ""
+        with span("tool", "serper", query=query) as fields:
+            options = {name: getattr(self, name, None) for name in _SEARCH_OPTIONS}
+            results, source = _get_search_cache().search(query, lambda: self._search(**kwargs), **options)
+            fields["cache"] = source
+            record_cache("search", source != "miss")
+            return results
+
+    def _search(self, **kwargs: Any) -> Any:
+        limiter = get_rate_limiter("serper")
+        if limiter is not None:
+            limiter.acquire()
+        return super()._run(**kwargs)
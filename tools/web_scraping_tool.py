@@ -1,67 +1,157 @@
 from typing import Optional
 import requests
-from bs4 import BeautifulSoup
-import json
+from urllib.parse import urlparse
 from crewai.tools import BaseTool
+from config.agent_config import RESEARCH_FOCUS_AREAS
+from config.performance_config import HTTP_CACHE_CONFIG
+from tools.html_extractor import TextBlock, extract_text_streaming
+from tools.content_ranker import select_relevant_text
+from utils.http_client import get_session, get_http_cache
 from utils.retry_utils import retry_on_exception
+from utils.telemetry import span, record_cache
+
+def _get_page_cache():
+    """Return the shared page cache, or None when disabled or unavailable."""
+    if not HTTP_CACHE_CONFIG["enabled"]:
+        return None
+    try:
+        return get_http_cache(
+            HTTP_CACHE_CONFIG["path"],
+            fresh_seconds=HTTP_CACHE_CONFIG["fresh_seconds"],
+            max_age_seconds=HTTP_CACHE_CONFIG["max_age_seconds"],
+            max_entries=HTTP_CACHE_CONFIG["max_entries"],
+            max_bytes=HTTP_CACHE_CONFIG["max_bytes"]
+        )
+    except Exception as e:
+        print(f"Page cache disabled: {str(e)}")
+        return None
 
 class EnhancedScrapeWebsiteTool(BaseTool):
     """Tool for scraping website content."""
     
     def __init__(self, 
                  name: Optional[str] = "Enhanced Web Scraping Tool",
-                 description: Optional[str] = "Scrape content from a website URL. Use this to get the content of a specific website.",
-                 max_content_length: int = 4000):
+                 description: Optional[str] = "Scrape content from a website URL. Use this to get the content of a specific website. Optionally pass a query describing what to look for (e.g. 'themes and reception') and the title of the book or movie to get the most relevant parts of the page.",
+                 max_content_length: int = 4000,
+                 max_download_bytes: int = 2 * 1024 * 1024,
+                 candidate_factor: int = 8):
         # Initialize with the provided parameters
         super().__init__(name=name, description=description)
         # Store max_content_length as an instance attribute
         self._max_content_length = max_content_length
+        # Hard cap on bytes read from any page, however large it is
+        self._max_download_bytes = max_download_bytes
+        # Collect this many times the budget, then keep only the most relevant blocks
+        self._candidate_factor = candidate_factor
+    
+    @retry_on_exception(max_retries=1, initial_delay=1.0, backoff_factor=1.5, max_delay=10.0,
+                      deadline=15.0, exception_types=(requests.RequestException,),
+                      retry_on_message_patterns=["timeout", "timed out", "connection", "too many requests",
+                                                 "service unavailable", "bad gateway"],
+                      circuit_breaker=lambda self, url, headers=None: f"scrape:{urlparse(url).netloc}")
+    def _fetch(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """Fetch a URL, raising on network errors and 4XX/5XX responses so they can be retried.
+        
+        Uses the shared pooled session, so repeated requests to a host reuse its connection.
+        The body is not downloaded here; callers stream it and must close the response.
+        """
+        session = get_session(HTTP_CACHE_CONFIG["pool_maxsize"])
+        response = session.get(url, headers=headers, timeout=5, stream=True)
+        try:
+            response.raise_for_status()  # Raise an exception for 4XX/5XX responses
+        except requests.HTTPError:
+            response.close()
+            raise
+        return response
+    
+    def _extract_blocks(self, response: requests.Response, max_chars: int):
+        """Stream the body and return its extracted text blocks, stopping after max_chars characters."""
+        # Without an explicit charset requests assumes ISO-8859-1; UTF-8 is the better guess for HTML
+        content_type = response.headers.get("Content-Type", "")
+        encoding = response.encoding if "charset=" in content_type.lower() else None
+        try:
+            return extract_text_streaming(
+                response.iter_content(chunk_size=16384),
+                max_chars=max_chars,
+                max_bytes=self._max_download_bytes,
+                encoding=encoding
+            )
+        finally:
+            response.close()
+    
+    def _select_text(self, blocks, truncated: bool, max_content_length: int, query: str, title: str) -> str:
+        """Return the blocks most relevant to the title and query within max_content_length characters."""
+        # Drop boilerplate and keep the blocks that best match the title and research focus
+        text = select_relevant_text(blocks, query, max_content_length, title_terms=title)
+        
+        # Limit the text length to avoid overwhelming the model
+        if truncated or sum(len(block.text) + 1 for block in blocks) - 1 > max_content_length:
+            text += "\n\n[Content truncated due to length...]\n"
+        return text
     
-    @retry_on_exception(max_retries=1, initial_delay=1.0, backoff_factor=1.5,
-                      exception_types=(requests.RequestException,),
-                      retry_on_message_patterns=["timeout", "connection", "too many requests"])
-    def _run(self, url: str, max_length: Optional[int] = None) -> str:
+    def _run(self, url: str, max_length: Optional[int] = None, query: Optional[str] = None,
+             title: Optional[str] = None) -> str:
         """Scrape website content from the URL.
         
+        Pages are cached on disk as extracted blocks keyed by URL, and ranked for the
+        title and query on every read. Fresh pages are served without any network
+        request; stale ones are revalidated with ETag / Last-Modified.
+        
         Args:
             url: The URL to scrape content from.
             max_length: Optional override for the maximum content length.
                        If None, uses the instance's max_content_length.
+            query: Optional description of what to look for. If None, the research
+                   focus areas (plot, themes, characters, reception, ...) are used.
+            title: Optional title of the book or movie; its words weigh most in the ranking.
         
         Returns:
             The scraped content as a string.
         """
         # Use the provided max_length or fall back to the instance's max_content_length
         max_content_length = max_length if max_length is not None else self._max_content_length
+        query = query or " ".join(RESEARCH_FOCUS_AREAS)
+        title = title or ""
+        # Collect several times the budget, so ranking has blocks to choose from
+        max_chars = max(max_content_length, self._max_content_length) * self._candidate_factor
         
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=5)
-            response.raise_for_status()  # Raise an exception for 4XX/5XX responses
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.extract()
-            
-            # Get text
-            text = soup.get_text(separator='\n', strip=True)
-            
-            # Process the text to make it more readable
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            # Limit the text length to avoid overwhelming the model
-            if len(text) > max_content_length:
-                text = text[:max_content_length] + "\n\n[Content truncated due to length...]\n"
-            
-            return f"Content from {url}:\n\n{text}"
-            
-        except Exception as e:
-            return f"Error scraping the website: {str(e)}"
+        with span("tool", "scrape", url=url) as fields:
+            try:
+                page_cache = _get_page_cache()
+                cached = page_cache.get(url) if page_cache is not None else None
+                # A page cut short for a smaller budget has to be downloaded again
+                if cached is not None and cached.truncated and cached.max_chars < max_chars:
+                    cached = None
+                if cached is not None and page_cache.is_fresh(cached):
+                    fields["cache"] = "hit"
+                    record_cache("page", True)
+                    return self._format_page(url, cached, max_content_length, query, title)
+                
+                headers = page_cache.conditional_headers(cached) if page_cache is not None else None
+                response = self._fetch(url, headers=headers)
+                if response.status_code == 304 and cached is not None:
+                    fields["cache"] = "revalidated"
+                    record_cache("page", True)
+                    response.close()
+                    page_cache.refresh(url, cached)
+                    return self._format_page(url, cached, max_content_length, query, title)
+                
+                fields["cache"] = "miss"
+                record_cache("page", False)
+                extracted = self._extract_blocks(response, max_chars)
+                if page_cache is not None:
+                    page_cache.store(url, extracted.blocks, extracted.truncated, max_chars, response)
+                text = self._select_text(extracted.blocks, extracted.truncated, max_content_length, query, title)
+                return f"Content from {url}:\n\n{text}"
+                
+            except Exception as e:
+                fields["error"] = str(e)
+                return f"Error scraping the website: {str(e)}"
+    
+    def _format_page(self, url: str, page, max_content_length: int, query: str, title: str) -> str:
+        """Rank a cached page's blocks for this call and format them like a fresh scrape."""
+        blocks = [TextBlock(*block) for block in page.blocks]
+        text = self._select_text(blocks, page.truncated, max_content_length, query, title)
+        return f"Content from {url}:\n\n{text}"
     
     # CrewAI doesn't require an async implementation
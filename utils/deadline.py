@@ -0,0 +1,26 @@
+"""
+Request-scoped deadlines.
+The worker pool records each request's deadline in a context variable, so code
+deep inside a crew run (such as individual LLM calls) can bound its own wait by
+the time the request has left.
+"""
+
+import time
+import contextvars
+from typing import Optional
+
+# Monotonic deadline of the request running in the current context, if any
+_deadline: contextvars.ContextVar = contextvars.ContextVar("request_deadline", default=None)
+
+
+def set_deadline(deadline: Optional[float]) -> None:
+    """Set the current request's deadline as a time.monotonic() timestamp (None clears it)."""
+    _deadline.set(deadline)
+
+
+def remaining_time() -> Optional[float]:
+    """Return the seconds left before the current request's deadline, or None without one."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
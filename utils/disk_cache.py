@@ -0,0 +1,248 @@
+"""
+Disk-backed cache utilities.
+This module provides a small SQLite key/value store with TTL, LRU eviction and a
+size cap, plus a single-flight helper that collapses concurrent identical calls.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+from typing import Callable, Any, Optional, Tuple, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """SQLite-backed string cache with TTL expiry, LRU eviction and a size cap."""
+
+    def __init__(self,
+                 path: str,
+                 table: str = "cache",
+                 ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_entries: Optional[int] = 5000,
+                 max_bytes: Optional[int] = 100 * 1024 * 1024):
+        """
+        Initialize the DiskCache.
+
+        Args:
+            path: Path of the SQLite database file. Parent directories are created.
+            table: Table name, so several caches can share one database file.
+            ttl_seconds: Age after which entries are treated as missing. None disables expiry.
+            max_entries: Maximum number of entries kept. None disables the cap.
+            max_bytes: Maximum total size of stored values in bytes. None disables the cap.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (value, created_at) for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self._is_expired(created_at, now):
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            return value, created_at
+
+    def set(self, key: str, value: str) -> None:
+        """Store value under key and evict old entries if the caps are exceeded."""
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict(now)
+
+    def delete(self, key: str) -> None:
+        """Remove key from the cache if present."""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return the current number of entries and total stored bytes."""
+        with self._lock:
+            count, total = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+        return {"entries": count, "bytes": total}
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until within the caps."""
+        if self.ttl_seconds is not None:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        count, total = self._conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()
+        over_count = self.max_entries is not None and count > self.max_entries
+        over_bytes = self.max_bytes is not None and total > self.max_bytes
+        if not over_count and not over_bytes:
+            return
+
+        # Walk entries from least to most recently used and drop until within both caps
+        doomed = []
+        rows = self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC")
+        for key, size in rows:
+            if (self.max_entries is None or count <= self.max_entries) and \
+               (self.max_bytes is None or total <= self.max_bytes):
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", doomed)
+        logger.info(f"Evicted {len(doomed)} entries from cache table '{self.table}'")
+
+
+class SingleFlightCancelled(Exception):
+    """Raised to a caller that stopped waiting on a call another caller started."""
+    pass
+
+
+class _Call:
+    """An in-flight call shared by every caller of the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+        # Set by a leader that left while followers were still waiting
+        self.on_abandoned: Optional[Callable[[], None]] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one execution."""
+
+    def __init__(self, poll_seconds: float = 0.1):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._poll_seconds = poll_seconds
+
+    def do(self, key: str, func: Callable[[], Any],
+           cancelled: Optional[threading.Event] = None) -> Tuple[Any, bool]:
+        """
+        Run func once per key among concurrent callers.
+
+        Args:
+            key: The key identifying identical work.
+            func: Zero-argument callable that performs the work.
+            cancelled: Event set when this caller no longer wants the result (e.g. the
+                       user disconnected). A waiting follower then stops waiting.
+
+        Returns:
+            A tuple of (result, shared) where shared is True when the result came
+            from a call started by another caller.
+
+        Raises:
+            SingleFlightCancelled: If cancelled was set while waiting on another caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            try:
+                while not call.done.wait(self._poll_seconds if cancelled is not None else None):
+                    if cancelled.is_set():
+                        raise SingleFlightCancelled(f"Stopped waiting for '{key}'")
+            finally:
+                self._leave(call)
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def _leave(self, call: _Call) -> None:
+        # A follower stopped waiting; the last one out of an abandoned call cancels it
+        with self._lock:
+            call.followers -= 1
+            abandoned = call.on_abandoned if call.followers == 0 and not call.done.is_set() else None
+            if abandoned is not None:
+                call.on_abandoned = None
+        if abandoned is not None:
+            abandoned()
+
+    def abandon(self, key: str, cancel: Callable[[], None]) -> None:
+        """
+        Give up the caller's interest in the call for key.
+
+        cancel() runs now if nobody else is waiting on the call, or later when the
+        last follower stops waiting before the call has finished.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.followers > 0:
+                call.on_abandoned = cancel
+                return
+        cancel()
+
+    def in_flight(self, key: str) -> bool:
+        """Return True if a call for key is currently running."""
+        with self._lock:
+            return key in self._calls
+
+    def followers(self, key: str) -> int:
+        """Return how many callers are waiting on the in-flight call for key."""
+        with self._lock:
+            call = self._calls.get(key)
+            return call.followers if call is not None else 0
@@ -0,0 +1,124 @@
+"""
+Hedged calls with hard deadlines.
+A call runs on a shared thread pool. If it has not returned after a hedge
+delay, and the hedge budget allows it, a duplicate is launched and the first
+successful response wins. The caller never waits past its deadline; abandoned
+calls finish in the background and their results are discarded.
+"""
+
+import time
+import threading
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_executor_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="hedged-call")
+        return _executor
+
+
+class HedgeBudget:
+    """Caps duplicate calls at a fraction of all calls, with a small burst allowance."""
+
+    def __init__(self, max_extra_ratio: float = 0.1, burst: float = 2.0):
+        """
+        Initialize the HedgeBudget.
+
+        Args:
+            max_extra_ratio: Hedges allowed per call over time (0.1 means at most 10% extra calls).
+            burst: Maximum number of hedges that may be saved up.
+        """
+        self.max_extra_ratio = max_extra_ratio
+        self.burst = burst
+        self._credits = burst
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+
+    def record_call(self) -> None:
+        """Earn hedge credit for one call."""
+        with self._lock:
+            self.calls += 1
+            self._credits = min(self.burst, self._credits + self.max_extra_ratio)
+
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget, returning False when none is left."""
+        with self._lock:
+            if self._credits < 1.0:
+                return False
+            self._credits -= 1.0
+            self.hedges += 1
+            return True
+
+
+def hedged_call(func: Callable[[], Any],
+                hedge_func: Optional[Callable[[], Any]] = None,
+                hedge_delay: Optional[float] = None,
+                timeout: Optional[float] = None,
+                budget: Optional[HedgeBudget] = None) -> Any:
+    """
+    Run func, hedging it with a duplicate call when it is slow.
+
+    Args:
+        func: The call to make.
+        hedge_func: The duplicate call. Defaults to func.
+        hedge_delay: Seconds after which a duplicate is launched. None disables hedging.
+        timeout: Hard deadline in seconds for a response. None waits indefinitely.
+        budget: Optional HedgeBudget limiting how often duplicates are launched.
+
+    Returns:
+        The first successful result.
+
+    Raises:
+        TimeoutError: If no call succeeded before the deadline.
+        Exception: The first call's error if every launched call failed.
+    """
+    executor = _get_executor()
+    start = time.monotonic()
+    if budget is not None:
+        budget.record_call()
+
+    def submit(target):
+        # Each call runs in a copy of the caller's context so request-scoped state follows it
+        return executor.submit(contextvars.copy_context().run, target)
+
+    def time_left():
+        return None if timeout is None else max(0.0, timeout - (time.monotonic() - start))
+
+    pending = {submit(func)}
+    hedged = hedge_delay is None or (timeout is not None and hedge_delay >= timeout)
+    first_error = None
+
+    while pending:
+        wait_for = time_left()
+        if not hedged:
+            wait_for = max(0.0, hedge_delay - (time.monotonic() - start))
+        done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            first_error = first_error or future.exception()
+
+        if not hedged and (done or time.monotonic() - start >= hedge_delay):
+            hedged = True
+            # A fast failure is left to the caller's retry and fallback logic
+            if not done and (budget is None or budget.try_spend()):
+                logger.info(f"Call still running after {hedge_delay:.1f}s; launching a hedged duplicate")
+                pending.add(submit(hedge_func or func))
+            continue
+
+        if not done and time_left() == 0.0:
+            raise TimeoutError(f"Call did not finish within its {timeout:.1f} second deadline")
+
+    raise first_error
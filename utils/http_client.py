@@ -0,0 +1,138 @@
+"""
+Shared HTTP utilities.
+This module provides one pooled requests.Session per process (keep-alive and
+per-host connection reuse) and an on-disk cache of the text blocks extracted
+from each page, keyed by URL alone so every title and query ranks the same
+download, that revalidates stale entries with ETag / Last-Modified conditional
+requests.
+"""
+
+import json
+import time
+import threading
+import logging
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+_caches_lock = threading.Lock()
+_caches: Dict[str, "HttpCache"] = {}
+
+
+def get_session(pool_maxsize: int = 32) -> requests.Session:
+    """
+    Return the process-wide pooled requests.Session.
+
+    Args:
+        pool_maxsize: Connections kept alive per host. Only used on first call.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, pool_block=False)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _session = session
+        return _session
+
+
+class CachedPage(NamedTuple):
+    """Text blocks extracted from a page plus the validators needed to revalidate it."""
+    blocks: List[Tuple[str, int]]
+    truncated: bool
+    max_chars: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class HttpCache:
+    """Disk cache of extracted page blocks with freshness and conditional revalidation."""
+
+    def __init__(self, cache: DiskCache, fresh_seconds: float = 24 * 3600):
+        """
+        Initialize the HttpCache.
+
+        Args:
+            cache: The DiskCache holding pages. Its TTL bounds how long stale pages are
+                   kept for revalidation.
+            fresh_seconds: Age below which a page is served without any network request.
+        """
+        self.cache = cache
+        self.fresh_seconds = fresh_seconds
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for a URL, fresh or stale, or None."""
+        raw = self.cache.get(url)
+        if raw is None:
+            return None
+        try:
+            page = CachedPage(**json.loads(raw))
+        except (TypeError, ValueError):
+            # Unreadable or from an older format: fetch the page again
+            self.cache.delete(url)
+            return None
+        return page._replace(blocks=[tuple(block) for block in page.blocks])
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Return True if the page can be served without revalidation."""
+        return time.time() - page.fetched_at < self.fresh_seconds
+
+    def conditional_headers(self, page: Optional[CachedPage]) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for revalidating a page."""
+        headers = {}
+        if page is not None:
+            if page.etag:
+                headers["If-None-Match"] = page.etag
+            if page.last_modified:
+                headers["If-Modified-Since"] = page.last_modified
+        return headers
+
+    def store(self, url: str, blocks: Sequence[Tuple[str, int]], truncated: bool, max_chars: int,
+              response: Optional[requests.Response] = None) -> CachedPage:
+        """
+        Store the blocks extracted from a page together with the response's validators.
+
+        Args:
+            url: The page URL, the only part of the key.
+            blocks: (text, link characters) pairs in page order.
+            truncated: Whether extraction stopped before the end of the page.
+            max_chars: The text budget the blocks were extracted with.
+            response: The response the blocks came from, for its ETag and Last-Modified.
+        """
+        headers = response.headers if response is not None else {}
+        page = CachedPage([tuple(block) for block in blocks], truncated, max_chars,
+                          headers.get("ETag"), headers.get("Last-Modified"), time.time())
+        self.cache.set(url, json.dumps(page._asdict()))
+        return page
+
+    def refresh(self, url: str, page: CachedPage) -> CachedPage:
+        """Mark a page fresh again after a 304 Not Modified response."""
+        page = page._replace(fetched_at=time.time())
+        self.cache.set(url, json.dumps(page._asdict()))
+        return page
+
+
+def get_http_cache(path: str, fresh_seconds: float, max_age_seconds: float,
+                   max_entries: Optional[int], max_bytes: Optional[int]) -> HttpCache:
+    """Return the process-wide HttpCache for a database path, creating it if needed."""
+    with _caches_lock:
+        http_cache = _caches.get(path)
+        if http_cache is None:
+            cache = DiskCache(path, table="pages", ttl_seconds=max_age_seconds,
+                              max_entries=max_entries, max_bytes=max_bytes)
+            http_cache = HttpCache(cache, fresh_seconds=fresh_seconds)
+            _caches[path] = http_cache
+        return http_cache
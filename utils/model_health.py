@@ -0,0 +1,105 @@
+"""
+Per-model health tracking for latency-aware routing.
+Every LLM call records its latency and outcome; a model whose rolling p95
+latency or error rate crosses the configured limits is reported as degraded
+until its recent samples age out of the window.
+"""
+
+import time
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Optional
+
+
+def _percentile(sorted_values: list, quantile: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(quantile * len(sorted_values)) - 1))]
+
+
+class HealthSnapshot(NamedTuple):
+    """Rolling statistics of one model."""
+    samples: int
+    error_rate: float
+    p95_latency: Optional[float]
+
+
+class ModelHealth:
+    """Thread-safe rolling window of call latencies and errors for one model."""
+
+    def __init__(self, window_seconds: float = 300.0, max_samples: int = 200):
+        """
+        Initialize the ModelHealth.
+
+        Args:
+            window_seconds: Age after which a sample no longer counts.
+            max_samples: Maximum number of samples kept.
+        """
+        self.window_seconds = window_seconds
+        self._samples: Deque = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._samples and now - self._samples[0][0] > self.window_seconds:
+            self._samples.popleft()
+
+    def record(self, latency: float, ok: bool) -> None:
+        """Record one call's latency in seconds and whether it succeeded."""
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            self._samples.append((now, latency, ok))
+
+    def _recent(self) -> list:
+        with self._lock:
+            self._prune(time.monotonic())
+            return list(self._samples)
+
+    def latency_percentile(self, quantile: float, min_samples: int = 1) -> Optional[float]:
+        """Return a latency percentile (e.g. 0.95) of recent successful calls, or None with too few."""
+        latencies = sorted(latency for _, latency, ok in self._recent() if ok)
+        if not latencies or len(latencies) < min_samples:
+            return None
+        return _percentile(latencies, quantile)
+
+    def snapshot(self) -> HealthSnapshot:
+        """Return the sample count, error rate and p95 latency of successful calls."""
+        samples = self._recent()
+        if not samples:
+            return HealthSnapshot(0, 0.0, None)
+        errors = sum(1 for _, _, ok in samples if not ok)
+        latencies = sorted(latency for _, latency, ok in samples if ok)
+        p95 = _percentile(latencies, 0.95) if latencies else None
+        return HealthSnapshot(len(samples), errors / len(samples), p95)
+
+    def degraded(self, min_samples: int = 5, max_error_rate: float = 0.5,
+                 max_p95_latency: Optional[float] = None) -> bool:
+        """
+        Return True if recent calls are too slow or fail too often.
+
+        Args:
+            min_samples: Samples needed before a verdict; fewer samples count as healthy.
+            max_error_rate: Error rate at or above which the model is degraded.
+            max_p95_latency: p95 latency in seconds above which the model is degraded.
+                             None disables the latency check.
+        """
+        snapshot = self.snapshot()
+        if snapshot.samples < min_samples:
+            return False
+        if snapshot.error_rate >= max_error_rate:
+            return True
+        return (max_p95_latency is not None and snapshot.p95_latency is not None
+                and snapshot.p95_latency > max_p95_latency)
+
+
+_registry_lock = threading.Lock()
+_health: Dict[str, ModelHealth] = {}
+
+
+def get_model_health(model: str, window_seconds: float = 300.0) -> ModelHealth:
+    """Return the process-wide ModelHealth for a model, creating it if needed."""
+    with _registry_lock:
+        health = _health.get(model)
+        if health is None:
+            health = ModelHealth(window_seconds=window_seconds)
+            _health[model] = health
+        return health
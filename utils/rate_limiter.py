@@ -0,0 +1,148 @@
+"""
+Client-side rate limiting utilities.
+This module provides process-wide token-bucket limiters for requests per minute and
+estimated tokens per minute, shared by every crew running in the process, so calls
+are spaced out before the upstream API has to reject them.
+"""
+
+import time
+import threading
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations instead of failing."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            per_minute: Refill rate in units per minute.
+            capacity: Maximum burst size. Defaults to one minute of refill.
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount from the bucket and return how long the caller must wait first."""
+        with self._lock:
+            self._refill(time.monotonic())
+            # Requests larger than the bucket are charged at most one full bucket
+            self._level -= min(amount, self.capacity)
+            return 0.0 if self._level >= 0 else -self._level / self.rate
+
+    def peek_wait(self, amount: float = 1.0) -> float:
+        """Return the wait a reservation of amount would need, without taking it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            level = self._level - min(amount, self.capacity)
+            return 0.0 if level >= 0 else -level / self.rate
+
+    def refund(self, amount: float) -> None:
+        """Return unused units, e.g. when a call used fewer tokens than estimated."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._level = min(self.capacity, self._level + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for one upstream service."""
+
+    def __init__(self, name: str, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            name: Name of the upstream service, used in logs and wait notifications.
+            requests_per_minute: Request budget per minute. None disables the limit.
+            tokens_per_minute: Token budget per minute. None disables the limit.
+        """
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def estimated_wait(self, tokens: float = 0.0) -> float:
+        """Return the seconds a call with this many tokens would currently wait."""
+        waits = [0.0]
+        if self.requests is not None:
+            waits.append(self.requests.peek_wait(1))
+        if self.tokens is not None and tokens:
+            waits.append(self.tokens.peek_wait(tokens))
+        return max(waits)
+
+    def acquire(self, tokens: float = 0.0) -> float:
+        """
+        Reserve capacity for one call and block until it may proceed.
+
+        Args:
+            tokens: Estimated tokens the call will consume (prompt plus completion).
+
+        Returns:
+            The number of seconds waited.
+        """
+        waits = [0.0]
+        if self.requests is not None:
+            waits.append(self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            waits.append(self.tokens.reserve(tokens))
+        wait = max(waits)
+        if wait > 0:
+            logger.info(f"Rate limiter '{self.name}': waiting {wait:.2f} seconds")
+            _notify_wait(self.name, wait)
+            time.sleep(wait)
+        return wait
+
+    def record_usage(self, estimated_tokens: float, actual_tokens: float) -> None:
+        """Correct the token bucket once the real usage of a call is known."""
+        if self.tokens is None:
+            return
+        if actual_tokens < estimated_tokens:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+        elif actual_tokens > estimated_tokens:
+            self.tokens.reserve(actual_tokens - estimated_tokens)
+
+
+_registry_lock = threading.Lock()
+_limiters: Dict[str, RateLimiter] = {}
+_wait_listeners: List[Callable[[str, float], None]] = []
+
+
+def configure_rate_limiters(config: Dict[str, Dict[str, Optional[float]]]) -> None:
+    """Create or replace the shared limiters from a {name: {rpm, tpm}} dictionary."""
+    with _registry_lock:
+        for name, limits in config.items():
+            _limiters[name] = RateLimiter(
+                name,
+                requests_per_minute=limits.get("requests_per_minute"),
+                tokens_per_minute=limits.get("tokens_per_minute")
+            )
+
+
+def get_rate_limiter(name: str) -> Optional[RateLimiter]:
+    """Return the shared limiter for a service, or None if it is not configured."""
+    return _limiters.get(name)
+
+
+def add_wait_listener(listener: Callable[[str, float], None]) -> None:
+    """Register a callable invoked as listener(name, seconds) before a limiter waits."""
+    _wait_listeners.append(listener)
+
+
+def _notify_wait(name: str, seconds: float) -> None:
+    for listener in list(_wait_listeners):
+        try:
+            listener(name, seconds)
+        except Exception as e:
+            logger.warning(f"Rate limit wait listener failed: {str(e)}")
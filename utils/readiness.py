@@ -0,0 +1,81 @@
+"""
+Start-up readiness tracking.
+The app binds its UI first and builds the LLMs, worker pool and caches on a
+background warm-up thread. Readiness records each warm-up step and its
+duration, lets request handlers wait until the service is ready, and reports
+the state for the /ready endpoint and the logs.
+"""
+
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Thread-safe state of a background start-up: starting, ready or failed."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.state = "starting"
+        self.error: Optional[str] = None
+        self.steps: Dict[str, float] = {}
+        self.ready_after: Optional[float] = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time one warm-up step, such as importing the crew modules."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.steps[name] = round(time.monotonic() - start, 3)
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            self.state = "ready"
+            self.ready_after = round(time.monotonic() - self.started, 3)
+        logger.info(f"Ready after {self.ready_after:.1f}s ({self.steps})")
+        self._done.set()
+
+    def mark_failed(self, error: BaseException) -> None:
+        with self._lock:
+            self.state = "failed"
+            self.error = f"{type(error).__name__}: {str(error)}"
+        logger.error(f"Start-up failed: {self.error}")
+        self._done.set()
+
+    def reset(self) -> None:
+        """Go back to starting, so a failed start-up can be tried again."""
+        with self._lock:
+            self.started = time.monotonic()
+            self.state = "starting"
+            self.error = None
+            self.steps = {}
+            self._done.clear()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until start-up has finished, returning True if the service is ready."""
+        self._done.wait(timeout)
+        return self.ready
+
+    def status(self) -> Dict[str, Any]:
+        """Return the state, error, step timings and uptime as a JSON-friendly dict."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "error": self.error,
+                "ready_after_seconds": self.ready_after,
+                "uptime_seconds": round(time.monotonic() - self.started, 3),
+                "steps": dict(self.steps),
+            }
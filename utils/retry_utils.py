@@ -1,88 +1,377 @@
 """
 Retry utilities for handling transient errors.
-This module provides decorators and utility functions for retry logic.
+This module provides decorators and utility functions for retry logic: a retry
+policy with jittered backoff, Retry-After support and an overall deadline, and
+per-endpoint circuit breakers that fail fast while an upstream is down.
 """
 
+import re
 import time
+import random
+import asyncio
 import functools
+import threading
 import logging
-from typing import Callable, Any, Optional, List, Union, Type
+from email.utils import parsedate_to_datetime
+from typing import Callable, Any, Optional, List, Union, Type, Dict
+from utils.telemetry import record_retry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Default patterns for rate limiting and transient upstream errors
+DEFAULT_RETRY_PATTERNS = [
+    "rate limit",
+    "too many requests",
+    "ratelimiterror",
+    "timeout",
+    "connection error",
+    "service unavailable",
+    "internal server error"
+]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream endpoint."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the CircuitBreaker.
+
+        Args:
+            name: Name of the endpoint, used in errors and logs.
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds the circuit stays open before one trial call is allowed.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Return "closed", "open" or "half-open"."""
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if calls to the endpoint should fail fast."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == "closed":
+                return
+            if state == "half-open" and not self._trial_in_flight:
+                # Let exactly one trial call through to probe the upstream
+                self._trial_in_flight = True
+                return
+            retry_in = max(0.0, self.reset_timeout - (now - self._opened_at))
+            raise CircuitOpenError(
+                f"{self.name} is temporarily unavailable (circuit open, retry in {retry_in:.0f}s)"
+            )
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """End a call that says nothing about the upstream (e.g. a cancelled request) without changing the state."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call and open the circuit once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold or self._opened_at is not None:
+                if self._opened_at is None:
+                    logger.warning(f"Circuit for {self.name} opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+
+
+_breakers_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for an endpoint, creating it if needed."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+            _breakers[name] = breaker
+        return breaker
+
+
+def get_retry_after(exception: BaseException) -> Optional[float]:
+    """
+    Extract a server-provided retry delay from an exception, if any.
+
+    Looks at a retry_after attribute, a Retry-After response header (seconds or an
+    HTTP date) and OpenAI-style "try again in 1.5s" / "in 20ms" messages.
+    """
+    retry_after = getattr(exception, "retry_after", None)
+    if isinstance(retry_after, (int, float)):
+        return float(retry_after)
+
+    response = getattr(exception, "response", None)
+    headers = getattr(response, "headers", None) or getattr(exception, "headers", None)
+    if headers:
+        value = headers.get("retry-after-ms") if hasattr(headers, "get") else None
+        if value:
+            try:
+                return float(value) / 1000.0
+            except ValueError:
+                pass
+        value = headers.get("retry-after") if hasattr(headers, "get") else None
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+    match = re.search(r"try again in (\d+(?:\.\d+)?)\s*(ms|s)\b", str(exception), re.IGNORECASE)
+    if match:
+        seconds = float(match.group(1))
+        return seconds / 1000.0 if match.group(2).lower() == "ms" else seconds
+    return None
+
+
+class RetryPolicy:
+    """How often, how long and on which errors to retry a call."""
+
+    def __init__(self,
+                 max_retries: int = 5,
+                 initial_delay: float = 5.0,
+                 backoff_factor: float = 3.0,
+                 max_delay: Optional[float] = 60.0,
+                 jitter: str = "full",
+                 deadline: Optional[float] = None,
+                 respect_retry_after: bool = True,
+                 exception_types: Union[Type[Exception], List[Type[Exception]]] = Exception,
+                 retry_on_message_patterns: Optional[List[str]] = None):
+        """
+        Initialize the RetryPolicy.
+
+        Args:
+            max_retries: Maximum number of retry attempts.
+            initial_delay: Initial delay between retries in seconds.
+            backoff_factor: Factor by which the delay increases with each retry.
+            max_delay: Upper bound for a single delay. None leaves it unbounded.
+            jitter: "full" (uniform between 0 and the backoff), "decorrelated"
+                    (uniform between initial_delay and 3x the previous delay), or "none".
+            deadline: Total seconds allowed across all attempts and waits. None disables it.
+            respect_retry_after: Whether to wait at least as long as a server Retry-After hint.
+            exception_types: Exception type(s) that should trigger a retry.
+            retry_on_message_patterns: List of strings that, if found in the exception message,
+                                      will trigger a retry. If None, the default rate limit and
+                                      transient error patterns are used. If empty, all exceptions
+                                      of the specified types will trigger a retry.
+        """
+        if jitter not in ("full", "decorrelated", "none"):
+            raise ValueError(f"Unknown jitter mode: {jitter}")
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.respect_retry_after = respect_retry_after
+        self.exception_types = tuple(exception_types) if isinstance(exception_types, list) else exception_types
+        self.retry_on_message_patterns = (DEFAULT_RETRY_PATTERNS if retry_on_message_patterns is None
+                                          else retry_on_message_patterns)
+
+    def should_retry(self, exception: BaseException) -> bool:
+        """Return True if the exception is a retryable error."""
+        if not isinstance(exception, self.exception_types) or isinstance(exception, CircuitOpenError):
+            return False
+        if not self.retry_on_message_patterns:
+            return True
+        error_message = str(exception).lower()
+        return any(pattern.lower() in error_message for pattern in self.retry_on_message_patterns)
+
+    def compute_delay(self, attempt: int, previous_delay: Optional[float] = None,
+                      exception: Optional[BaseException] = None) -> float:
+        """
+        Return the wait before retry number attempt + 1.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+            previous_delay: The delay used before this attempt, for decorrelated jitter.
+            exception: The error that caused the retry, checked for a Retry-After hint.
+        """
+        backoff = self.initial_delay * (self.backoff_factor ** attempt)
+        if self.jitter == "full":
+            delay = random.uniform(0, backoff)
+        elif self.jitter == "decorrelated":
+            delay = random.uniform(self.initial_delay, max(self.initial_delay, (previous_delay or self.initial_delay) * 3))
+        else:
+            delay = backoff
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+
+        if self.respect_retry_after and exception is not None:
+            retry_after = get_retry_after(exception)
+            if retry_after is not None:
+                # The server knows best, but never wait less than it asks
+                delay = max(delay, retry_after)
+        return delay
+
+
+def _resolve_breaker(circuit_breaker, args, kwargs) -> Optional[CircuitBreaker]:
+    if circuit_breaker is None:
+        return None
+    if isinstance(circuit_breaker, CircuitBreaker):
+        return circuit_breaker
+    name = circuit_breaker(*args, **kwargs) if callable(circuit_breaker) else circuit_breaker
+    return get_circuit_breaker(name) if name else None
+
+
 def retry_on_exception(
     max_retries: int = 5,
     initial_delay: float = 5.0,
     backoff_factor: float = 3.0,
     exception_types: Union[Type[Exception], List[Type[Exception]]] = Exception,
-    retry_on_message_patterns: List[str] = None
+    retry_on_message_patterns: List[str] = None,
+    max_delay: Optional[float] = 60.0,
+    jitter: str = "full",
+    deadline: Optional[float] = None,
+    respect_retry_after: bool = True,
+    circuit_breaker: Union[None, str, CircuitBreaker, Callable[..., Optional[str]]] = None,
+    policy: Optional[RetryPolicy] = None
 ) -> Callable:
     """
     Decorator that retries a function when specified exceptions occur.
-    
+
+    Works on both regular functions and coroutine functions; coroutines wait with
+    asyncio.sleep so the event loop is never blocked.
+
     Args:
         max_retries: Maximum number of retry attempts.
         initial_delay: Initial delay between retries in seconds.
         backoff_factor: Factor by which the delay increases with each retry.
         exception_types: Exception type(s) that should trigger a retry.
         retry_on_message_patterns: List of strings that, if found in the exception message,
-                                  will trigger a retry. If None, all exceptions of the specified
-                                  types will trigger a retry.
-    
+                                  will trigger a retry. If None, the default rate limit and
+                                  transient error patterns are used. If empty, all exceptions
+                                  of the specified types will trigger a retry.
+        max_delay: Upper bound for a single delay in seconds.
+        jitter: "full", "decorrelated" or "none" (see RetryPolicy).
+        deadline: Total seconds allowed across all attempts and waits.
+        respect_retry_after: Whether to honour server Retry-After hints.
+        circuit_breaker: Optional breaker name, CircuitBreaker, or callable receiving the
+                         call's arguments and returning a breaker name (e.g. per host).
+        policy: Optional RetryPolicy that overrides the individual retry arguments.
+
     Returns:
         Decorated function with retry logic.
     """
-    if retry_on_message_patterns is None:
-        # Default patterns for rate limiting errors
-        retry_on_message_patterns = [
-            "rate limit", 
-            "too many requests", 
-            "ratelimiterror", 
-            "timeout", 
-            "connection error",
-            "service unavailable",
-            "internal server error"
-        ]
-    
+    if policy is None:
+        policy = RetryPolicy(
+            max_retries=max_retries,
+            initial_delay=initial_delay,
+            backoff_factor=backoff_factor,
+            max_delay=max_delay,
+            jitter=jitter,
+            deadline=deadline,
+            respect_retry_after=respect_retry_after,
+            exception_types=exception_types,
+            retry_on_message_patterns=retry_on_message_patterns
+        )
+
+    def next_delay(func, attempt, previous_delay, started, error):
+        """Return the wait before the next attempt, or None to give up and re-raise."""
+        error_message = str(error).lower()
+        if not policy.should_retry(error) or attempt >= policy.max_retries:
+            logger.error(f"Error in {func.__name__}: {error_message}")
+            return None
+        wait_time = policy.compute_delay(attempt, previous_delay, error)
+        if policy.deadline is not None and time.monotonic() - started + wait_time > policy.deadline:
+            logger.error(f"Error in {func.__name__}: {error_message}. Retry budget of {policy.deadline:.0f}s exhausted")
+            return None
+        logger.warning(f"Error: {error_message}. Waiting {wait_time:.2f} seconds before retry...")
+        record_retry(func.__name__, wait_time)
+        return wait_time
+
+    def record(breaker, error=None):
+        if breaker is None:
+            return
+        if error is None:
+            breaker.record_success()
+        elif policy.should_retry(error):
+            # Only transient upstream errors count against the endpoint
+            breaker.record_failure()
+        else:
+            # Bad input or a cancelled request neither proves nor disproves that the upstream is healthy
+            breaker.release_trial()
+
     def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                breaker = _resolve_breaker(circuit_breaker, args, kwargs)
+                started = time.monotonic()
+                wait_time = None
+                for attempt in range(policy.max_retries + 1):
+                    if attempt > 0:
+                        logger.info(f"Retry attempt {attempt}/{policy.max_retries} for {func.__name__}")
+                    if breaker is not None:
+                        breaker.before_call()
+                    try:
+                        result = await func(*args, **kwargs)
+                        record(breaker)
+                        return result
+                    except Exception as e:
+                        record(breaker, e)
+                        wait_time = next_delay(func, attempt, wait_time, started, e)
+                        if wait_time is None:
+                            raise
+                    await asyncio.sleep(wait_time)
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            last_exception = None
-            
-            for attempt in range(max_retries + 1):
+            breaker = _resolve_breaker(circuit_breaker, args, kwargs)
+            started = time.monotonic()
+            wait_time = None
+            for attempt in range(policy.max_retries + 1):
+                if attempt > 0:
+                    logger.info(f"Retry attempt {attempt}/{policy.max_retries} for {func.__name__}")
+                if breaker is not None:
+                    breaker.before_call()
                 try:
-                    if attempt > 0:
-                        logger.info(f"Retry attempt {attempt}/{max_retries} for {func.__name__}")
-                    
-                    return func(*args, **kwargs)
-                
-                except exception_types as e:
-                    last_exception = e
-                    error_message = str(e).lower()
-                    
-                    # Check if this exception should trigger a retry
-                    should_retry = False
-                    if retry_on_message_patterns:
-                        should_retry = any(pattern.lower() in error_message for pattern in retry_on_message_patterns)
-                    else:
-                        should_retry = True
-                    
-                    # If we shouldn't retry or we're out of retries, raise the exception
-                    if not should_retry or attempt >= max_retries:
-                        logger.error(f"Error in {func.__name__}: {error_message}")
+                    result = func(*args, **kwargs)
+                    record(breaker)
+                    return result
+                except Exception as e:
+                    record(breaker, e)
+                    wait_time = next_delay(func, attempt, wait_time, started, e)
+                    if wait_time is None:
                         raise
-                    
-                    # Calculate wait time with exponential backoff
-                    wait_time = initial_delay * (backoff_factor ** attempt)
-                    logger.warning(f"Error: {error_message}. Waiting {wait_time:.2f} seconds before retry...")
-                    time.sleep(wait_time)
-            
-            # This should never be reached due to the raise in the except block
-            if last_exception:
-                raise last_exception
-            
+                time.sleep(wait_time)
+
         return wrapper
-    
+
     return decorator
@@ -0,0 +1,127 @@
+"""
+Web search result cache.
+Search results for a title barely change from week to week, so they are
+stored on disk under a normalized form of the query and reused until they
+expire. Concurrent identical searches are coalesced into one upstream call,
+whether or not the disk cache is enabled.
+"""
+
+import re
+import json
+import threading
+import unicodedata
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+from utils.disk_cache import DiskCache, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+_caches_lock = threading.Lock()
+_caches: Dict[str, "SearchCache"] = {}
+
+
+def normalize_query(query: str) -> str:
+    """
+    Fold a search query to its cache key.
+
+    Applies Unicode, case, quote, whitespace and trailing punctuation folding, so
+    "The Great Gatsby  themes?" and "the great gatsby themes" share an entry.
+    Everything else is kept, because symbols such as "C++", "C#" or "site:" and
+    quotes change the results.
+    """
+    query = unicodedata.normalize("NFKD", query or "")
+    query = "".join(ch for ch in query if not unicodedata.combining(ch))
+    query = query.casefold().replace("“", '"').replace("”", '"').replace("’", "'")
+    # Sentence punctuation at word ends is noise; inside words ("site:imdb.com") it is not
+    query = re.sub(r"[?!.,;:-]+(?=\s|$)", " ", query)
+    return " ".join(query.split())
+
+
+class SearchCache:
+    """Search results keyed by normalized query and search options, with in-flight coalescing."""
+
+    def __init__(self, cache: Optional[DiskCache] = None):
+        """
+        Initialize the SearchCache.
+
+        Args:
+            cache: DiskCache holding results as JSON. None keeps only the coalescing of
+                   concurrent identical searches.
+        """
+        self.cache = cache
+        self._single_flight = SingleFlight()
+        self._lock = threading.Lock()
+        self.counts = {"hit": 0, "coalesced": 0, "miss": 0}
+
+    def key_for(self, query: str, **options: Any) -> str:
+        """Return the cache key for a query and the options that affect its results."""
+        settings = ",".join(f"{name}={value}" for name, value in sorted(options.items()) if value is not None)
+        return f"{settings}|{normalize_query(query)}"
+
+    def get(self, key: str) -> Optional[Any]:
+        if self.cache is None:
+            return None
+        value = self.cache.get(key)
+        return None if value is None else json.loads(value)
+
+    def _count(self, source: str) -> None:
+        with self._lock:
+            self.counts[source] += 1
+
+    def search(self, query: str, fetch: Callable[[], Any], **options: Any) -> Tuple[Any, str]:
+        """
+        Return cached results for a query, or fetch them once for all concurrent callers.
+
+        Args:
+            query: The search query as written by the caller.
+            fetch: Zero-argument callable that runs the real search.
+            **options: Search settings that change the results (type, result count, locale...).
+
+        Returns:
+            A tuple of (results, source) where source is "hit", "coalesced" or "miss".
+        """
+        key = self.key_for(query, **options)
+        cached = self.get(key)
+        if cached is not None:
+            self._count("hit")
+            return cached, "hit"
+
+        def compute():
+            # Another caller may have stored the results while we were waiting
+            existing = self.get(key)
+            if existing is not None:
+                return existing
+            results = fetch()
+            # Empty results are not cached, so a failed search is retried next time
+            if results and self.cache is not None:
+                try:
+                    self.cache.set(key, json.dumps(results))
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Search results for '{query}' not cached: {str(e)}")
+            return results
+
+        results, shared = self._single_flight.do(key, compute)
+        source = "coalesced" if shared else "miss"
+        self._count(source)
+        return results, source
+
+    def hit_rate(self) -> float:
+        """Return the fraction of searches answered without a new upstream call."""
+        with self._lock:
+            total = sum(self.counts.values())
+            return (self.counts["hit"] + self.counts["coalesced"]) / total if total else 0.0
+
+
+def get_search_cache(path: Optional[str], ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                     max_entries: Optional[int] = 20000, max_bytes: Optional[int] = 50 * 1024 * 1024) -> SearchCache:
+    """Return the process-wide SearchCache for a database path (None: coalescing only), creating it if needed."""
+    with _caches_lock:
+        search_cache = _caches.get(path or "")
+        if search_cache is None:
+            cache = None
+            if path:
+                cache = DiskCache(path, table="searches", ttl_seconds=ttl_seconds,
+                                  max_entries=max_entries, max_bytes=max_bytes)
+            search_cache = SearchCache(cache)
+            _caches[path or ""] = search_cache
+        return search_cache
@@ -0,0 +1,380 @@
+"""
+Per-request tracing and process metrics.
+A Trace follows one request through the worker pool and its helper threads
+(it lives in a context variable) and collects timed spans for the crew, each
+task, tool call and LLM call, plus token counts, cache hits and retries. When
+the request ends the trace is written as one JSON log line. The same
+measurements feed a small in-process metrics registry that is served in the
+Prometheus text format.
+"""
+
+import json
+import time
+import uuid
+import bisect
+import threading
+import contextvars
+import logging
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from utils.rate_limiter import add_wait_listener
+
+logger = logging.getLogger(__name__)
+
+# Structured trace lines go to their own logger so they stay one JSON object per line
+trace_logger = logging.getLogger("insight_facilitator.traces")
+
+# Trace of the request running in the current context, if any
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("request_trace", default=None)
+
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = [(name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value in pairs]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._values: Dict[LabelKey, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            # Per-bucket counts, then sum and count
+            state = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative:g}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {state[-1]:g}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {state[-2]:g}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {state[-1]:g}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is read from a callable at scrape time."""
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float]):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+
+    def render(self) -> List[str]:
+        try:
+            value = float(self.read())
+        except Exception as e:
+            logger.warning(f"Gauge {self.name} failed: {str(e)}")
+            return []
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {value:g}"]
+
+
+REQUESTS = Counter("insight_requests_total", "Finished analysis requests by mode and status.")
+REQUEST_DURATION = Histogram("insight_request_duration_seconds", "End-to-end analysis request duration.")
+SPAN_DURATION = Histogram("insight_span_duration_seconds", "Duration of crew, task, tool and LLM spans.")
+LLM_TOKENS = Counter("insight_llm_tokens_total",
+                     "LLM tokens by model, direction and source (provider usage or length estimate).")
+CACHE_LOOKUPS = Counter("insight_cache_lookups_total", "Cache lookups by cache and result.")
+RETRIES = Counter("insight_retries_total", "Retries by operation.")
+RETRY_SLEEP = Counter("insight_retry_sleep_seconds_total", "Seconds spent sleeping before retries.")
+RATE_LIMIT_WAIT = Counter("insight_rate_limit_wait_seconds_total", "Seconds spent waiting on client-side rate limits.")
+
+_metrics: List[Any] = [REQUESTS, REQUEST_DURATION, SPAN_DURATION, LLM_TOKENS, CACHE_LOOKUPS,
+                       RETRIES, RETRY_SLEEP, RATE_LIMIT_WAIT]
+_metrics_lock = threading.Lock()
+
+
+def register_gauge(name: str, help_text: str, read: Callable[[], float]) -> None:
+    """Expose a value read at scrape time, e.g. the number of queued crew jobs."""
+    with _metrics_lock:
+        _metrics.append(Gauge(name, help_text, read))
+
+
+def render_metrics() -> str:
+    """Return every metric in the Prometheus text exposition format."""
+    with _metrics_lock:
+        metrics = list(_metrics)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class Trace:
+    """Timed spans and counters for one request."""
+
+    def __init__(self, request_id: Optional[str] = None, **attributes: Any):
+        """
+        Initialize the Trace.
+
+        Args:
+            request_id: Identifier shown in every log line. Generated when omitted.
+            **attributes: Request attributes included in the JSON log (title, media type, mode...).
+        """
+        self.request_id = request_id or uuid.uuid4().hex[:12]
+        self.attributes = attributes
+        self.started = time.monotonic()
+        self.started_at = time.time()
+        self.spans: List[Dict[str, Any]] = []
+        # estimated_calls counts LLM calls whose provider reported no usage
+        self.tokens = {"prompt": 0, "completion": 0, "estimated_calls": 0}
+        self.cache: Dict[str, str] = {}
+        self.retries = 0
+        self.retry_sleep = 0.0
+        self.rate_limit_wait = 0.0
+        self.last_task_mark = self.started
+        self._lock = threading.Lock()
+
+    def activate(self) -> None:
+        """Bind this trace to the current context; worker jobs and helper threads inherit it."""
+        _current_trace.set(self)
+
+    def add_span(self, kind: str, name: str, start: float, duration: float, **attributes: Any) -> None:
+        with self._lock:
+            span = {"kind": kind, "name": name, "start": round(start - self.started, 3),
+                    "duration": round(duration, 3)}
+            span.update(attributes)
+            self.spans.append(span)
+
+    def finish(self, status: str = "ok", **attributes: Any) -> Dict[str, Any]:
+        """Record the request in the metrics and write its JSON log line."""
+        duration = time.monotonic() - self.started
+        self.attributes.update(attributes)
+        mode = self.attributes.get("mode", "")
+        REQUESTS.inc(mode=mode, status=status)
+        REQUEST_DURATION.observe(duration, mode=mode)
+
+        with self._lock:
+            totals: Dict[str, float] = {}
+            for span in self.spans:
+                totals[span["kind"]] = round(totals.get(span["kind"], 0.0) + span["duration"], 3)
+            record = {
+                "event": "request",
+                "request_id": self.request_id,
+                "timestamp": round(self.started_at, 3),
+                "status": status,
+                "duration": round(duration, 3),
+                **self.attributes,
+                "time_by_kind": totals,
+                "tokens": dict(self.tokens),
+                "cache": dict(self.cache),
+                "retries": self.retries,
+                "retry_sleep": round(self.retry_sleep, 3),
+                "rate_limit_wait": round(self.rate_limit_wait, 3),
+                "spans": list(self.spans),
+            }
+        trace_logger.info(json.dumps(record, default=str))
+        return record
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace of the request running in the current context, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(kind: str, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block as a span of the current request and in the span histogram.
+
+    Args:
+        kind: Span category: "crew", "task", "tool" or "llm".
+        name: What ran, e.g. the tool or model name.
+        **attributes: Extra fields for the trace. The yielded dict can be updated
+                      inside the block (e.g. with a cache result).
+    """
+    fields = dict(attributes)
+    start = time.monotonic()
+    status = "ok"
+    try:
+        yield fields
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.monotonic() - start
+        SPAN_DURATION.observe(duration, kind=kind, name=name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_span(kind, name, start, duration, status=status, **fields)
+
+
+def task_finished(task_name: str) -> None:
+    """Record a sequential crew task as a span from the previous task's end to now."""
+    now = time.monotonic()
+    trace = _current_trace.get()
+    start = now
+    if trace is not None:
+        start = trace.last_task_mark
+        trace.last_task_mark = now
+        trace.add_span("task", task_name, start, now - start, status="ok")
+    SPAN_DURATION.observe(now - start, kind="task", name=task_name)
+
+
+def mark_tasks_started() -> None:
+    """Mark the start of the first task, e.g. right before a crew kickoff."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.last_task_mark = time.monotonic()
+
+
+def record_tokens(model: str, prompt_tokens: int, completion_tokens: int, estimated: bool = False) -> None:
+    """Record the tokens of one LLM call; estimated marks counts guessed from text length."""
+    source = "estimate" if estimated else "usage"
+    LLM_TOKENS.inc(prompt_tokens, model=model, direction="prompt", source=source)
+    LLM_TOKENS.inc(completion_tokens, model=model, direction="completion", source=source)
+    trace = _current_trace.get()
+    if trace is not None:
+        with trace._lock:
+            trace.tokens["prompt"] += prompt_tokens
+            trace.tokens["completion"] += completion_tokens
+            trace.tokens["estimated_calls"] += int(estimated)
+
+
+def record_cache(cache: str, hit: bool, key: Optional[str] = None, trace: Optional[Trace] = None) -> None:
+    """Record a cache lookup; the trace (current one by default) keeps the latest result per cache and key."""
+    result = "hit" if hit else "miss"
+    CACHE_LOOKUPS.inc(cache=cache, result=result)
+    trace = trace or _current_trace.get()
+    if trace is not None:
+        with trace._lock:
+            trace.cache[f"{cache}:{key}" if key else cache] = result
+
+
+def record_retry(operation: str, sleep_seconds: float) -> None:
+    """Record one retry and the backoff sleep before it."""
+    RETRIES.inc(operation=operation)
+    RETRY_SLEEP.inc(sleep_seconds, operation=operation)
+    trace = _current_trace.get()
+    if trace is not None:
+        with trace._lock:
+            trace.retries += 1
+            trace.retry_sleep += sleep_seconds
+
+
+def record_rate_limit_wait(limiter_name: str, seconds: float) -> None:
+    """Record time spent waiting on a client-side rate limiter."""
+    RATE_LIMIT_WAIT.inc(seconds, limiter=limiter_name)
+    trace = _current_trace.get()
+    if trace is not None:
+        with trace._lock:
+            trace.rate_limit_wait += seconds
+
+
+add_wait_listener(record_rate_limit_wait)
+
+
+def configure_trace_log(path: Optional[str] = None) -> None:
+    """Write trace lines as bare JSON to stderr, or to a file when a path is given."""
+    if trace_logger.handlers:
+        return
+    handler = logging.FileHandler(path) if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    trace_logger.addHandler(handler)
+    trace_logger.setLevel(logging.INFO)
+    trace_logger.propagate = False
+
+
+# Returns the service's readiness and a JSON-friendly status for /ready (None: no check registered)
+_readiness_check: Optional[Callable[[], Tuple[bool, Dict[str, Any]]]] = None
+
+
+def register_readiness(check: Callable[[], Tuple[bool, Dict[str, Any]]]) -> None:
+    """Serve check()'s status at /ready, with 200 when ready and 503 while starting or failed."""
+    global _readiness_check
+    _readiness_check = check
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/ready" and _readiness_check is not None:
+            ready, status = _readiness_check()
+            body = json.dumps(status).encode("utf-8")
+            self.send_response(200 if ready else 503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the console
+        pass
+
+
+def start_metrics_server(host: str = "0.0.0.0", port: int = 9464) -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics in the Prometheus text format (and /ready when registered) from a daemon thread.
+
+    Returns:
+        The running server, or None if the port could not be bound.
+    """
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on {host}:{port}: {str(e)}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,271 @@
+"""
+Title canonicalization utilities.
+This module folds user-typed titles into a canonical key and keeps an in-memory
+alias index, backed by SQLite, that resolves variants and near-misses to a
+title that has already been seen.
+"""
+
+import re
+import math
+import sqlite3
+import threading
+import unicodedata
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Leading articles dropped during folding
+_ARTICLES = ("the", "a", "an")
+
+# Parenthetical qualifiers that describe the medium rather than the work
+_QUALIFIER_PATTERN = re.compile(
+    r"\((?:[^)]*\b(?:novel|book|film|movie|novella|series|edition)\b[^)]*)\)",
+    re.IGNORECASE
+)
+
+
+def normalize_title(title: str) -> str:
+    """
+    Fold a title to its canonical key.
+
+    Applies Unicode, case, punctuation, whitespace and leading article folding and
+    drops medium qualifiers such as "(novel)" or "(2021 film)".
+    """
+    title = _QUALIFIER_PATTERN.sub(" ", title)
+    title = unicodedata.normalize("NFKD", title)
+    title = "".join(ch for ch in title if not unicodedata.combining(ch))
+    title = title.casefold().replace("&", " and ")
+    # Join possessives and contractions so "Schindler's" folds to "schindlers"
+    title = re.sub(r"['’]", "", title)
+    title = re.sub(r"[^\w\s]", " ", title)
+    words = title.split()
+    if len(words) > 1 and words[0] in _ARTICLES:
+        words = words[1:]
+    return " ".join(words)
+
+
+# Subtitles that describe the medium or edition rather than name a different work
+_DESCRIPTOR_SUBTITLE = re.compile(
+    r"^(?:(?:an?|the)\s+)?(?:[a-z]+\s+){0,2}(?:novel|novella|book|film|movie|memoir|play|screenplay|edition)$",
+    re.IGNORECASE
+)
+
+# An author after "by": two or more capitalized names ("F. Scott Fitzgerald"), not "Stand by Me"
+_AUTHOR_NAME = re.compile(r"^[A-Z][\w.'’-]*(?:\s+[A-Z][\w.'’-]*)+$")
+
+# Words that make a title a sequel or a numbered part of a series
+_NUMBER_WORDS = {
+    word: number for number, words in enumerate([
+        (), ("one", "first", "i"), ("two", "second", "ii"), ("three", "third", "iii"), ("four", "fourth", "iv"),
+        ("five", "fifth", "v"), ("six", "sixth", "vi"), ("seven", "seventh", "vii"), ("eight", "eighth", "viii"),
+        ("nine", "ninth", "ix"), ("ten", "tenth", "x"),
+    ]) for word in words
+}
+
+
+def _sequel_markers(key: str) -> List[int]:
+    """Return the numbers in a normalized title, written as digits, words or roman numerals."""
+    markers = []
+    for word in key.split():
+        if word.isdigit():
+            markers.append(int(word))
+        elif word in _NUMBER_WORDS:
+            markers.append(_NUMBER_WORDS[word])
+    return markers
+
+
+def _variants(title: str) -> List[str]:
+    """Return stripped forms of a raw title that may name a known work."""
+    variants = []
+    # "The Great Gatsby by F. Scott Fitzgerald"
+    by_match = re.match(r"^(.+?)\s+by\s+(.+)$", title)
+    if by_match and _AUTHOR_NAME.match(by_match.group(2).strip()):
+        variants.append(by_match.group(1))
+    # "F. Scott Fitzgerald's The Great Gatsby", but not "Charlotte's Web"
+    possessive_match = re.match(r"^.+?['’]s\s+(.+)$", title)
+    if possessive_match and len(normalize_title(possessive_match.group(1)).split()) > 1:
+        variants.append(possessive_match.group(1))
+    # "Great Gatsby: A Novel", but not "Alien: Covenant" or "Dune: Part Two"
+    colon_match = re.match(r"^(.+?)\s*[:\-–—]\s+(.+)$", title)
+    if colon_match and _DESCRIPTOR_SUBTITLE.match(colon_match.group(2).strip()):
+        variants.append(colon_match.group(1))
+    return variants
+
+
+def _trigrams(key: str) -> Set[str]:
+    """Return the character trigrams of a padded key."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """In-memory alias and trigram index mapping title variants to canonical keys."""
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 threshold: float = 0.8):
+        """
+        Initialize the TitleIndex.
+
+        Args:
+            path: Optional SQLite database file used to persist titles and aliases.
+            threshold: Minimum Dice trigram similarity for a fuzzy match (0-1).
+        """
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self._aliases: Dict[str, str] = {}
+        self._canonical: List[str] = []
+        self._canonical_ids: Dict[str, int] = {}
+        self._trigram_sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS title_aliases (alias TEXT PRIMARY KEY, canonical TEXT NOT NULL)"
+            )
+            self._load()
+
+    def _load(self) -> None:
+        """Load persisted aliases into memory."""
+        rows = self._conn.execute("SELECT alias, canonical FROM title_aliases").fetchall()
+        for alias, canonical in rows:
+            self._add_canonical(canonical)
+            self._aliases[alias] = canonical
+        logger.info(f"Loaded {len(self._canonical)} titles and {len(rows)} aliases")
+
+    def _add_canonical(self, canonical: str) -> None:
+        if canonical in self._canonical_ids:
+            return
+        canonical_id = len(self._canonical)
+        self._canonical.append(canonical)
+        self._canonical_ids[canonical] = canonical_id
+        self._aliases.setdefault(canonical, canonical)
+        grams = _trigrams(canonical)
+        self._trigram_sizes.append(len(grams))
+        for gram in grams:
+            self._postings[gram].append(canonical_id)
+
+    def _persist(self, alias: str, canonical: str) -> None:
+        if self._conn is not None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO title_aliases (alias, canonical) VALUES (?, ?)", (alias, canonical)
+            )
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def add(self, title: str) -> str:
+        """Register a title as canonical (if not already known) and return its key."""
+        key = normalize_title(title)
+        if not key:
+            return key
+        with self._lock:
+            if key in self._aliases:
+                return self._aliases[key]
+            self._add_canonical(key)
+            self._persist(key, key)
+        return key
+
+    def add_alias(self, title: str, canonical: str) -> None:
+        """Record that title resolves to an existing canonical key."""
+        key = normalize_title(title)
+        if not key or key == canonical:
+            return
+        with self._lock:
+            self._add_canonical(canonical)
+            self._aliases[key] = canonical
+            self._persist(key, canonical)
+
+    def lookup(self, title: str) -> Optional[Tuple[str, float]]:
+        """
+        Resolve a title to a known canonical key.
+
+        Args:
+            title: The raw title as typed by the user.
+
+        Returns:
+            A tuple of (canonical key, confidence) or None if nothing is close enough.
+        """
+        match = self._match(title)
+        return None if match is None else match[:2]
+
+    def _match(self, title: str) -> Optional[Tuple[str, float, str]]:
+        """Return (canonical key, confidence, how it matched: "exact", "variant" or "fuzzy")."""
+        key = normalize_title(title)
+        if not key:
+            return None
+
+        # Exact alias hit: a single dictionary lookup
+        canonical = self._aliases.get(key)
+        if canonical is not None:
+            return canonical, 1.0, "exact"
+
+        # Author and edition decorations around a known title; a sequel number in what
+        # is left must still match the known title's
+        for variant in _variants(title):
+            variant_key = normalize_title(variant)
+            canonical = self._aliases.get(variant_key)
+            if canonical is not None and _sequel_markers(variant_key) == _sequel_markers(canonical):
+                return canonical, 0.95, "variant"
+
+        match = self._fuzzy_lookup(key)
+        return None if match is None else (match[0], match[1], "fuzzy")
+
+    def _fuzzy_lookup(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return the best trigram match for key above the threshold."""
+        grams = _trigrams(key)
+        query_size = len(grams)
+
+        # A Dice score >= t needs at least t*q/(2-t) shared trigrams, so any match must
+        # share one of the (q - min_shared + 1) rarest query trigrams (prefix filtering)
+        min_shared = math.ceil(self.threshold * query_size / (2.0 - self.threshold))
+        ordered = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        prefix = ordered[:max(query_size - min_shared + 1, 1)]
+
+        # Candidate titles must also have a compatible trigram count
+        min_size = query_size * self.threshold / (2.0 - self.threshold)
+        max_size = query_size * (2.0 - self.threshold) / self.threshold
+
+        candidates = set()
+        for gram in prefix:
+            for canonical_id in self._postings.get(gram, ()):
+                if min_size <= self._trigram_sizes[canonical_id] <= max_size:
+                    candidates.add(canonical_id)
+
+        # Sequels and remakes differ only by a number, so numbers must match exactly
+        numbers = _sequel_markers(key)
+        best_id, best_score = None, 0.0
+        for canonical_id in candidates:
+            canonical = self._canonical[canonical_id]
+            if _sequel_markers(canonical) != numbers:
+                continue
+            shared = len(grams & _trigrams(canonical))
+            score = 2.0 * shared / (query_size + self._trigram_sizes[canonical_id])
+            if score > best_score:
+                best_id, best_score = canonical_id, score
+
+        if best_id is None or best_score < self.threshold:
+            return None
+        return self._canonical[best_id], best_score
+
+    def resolve(self, title: str) -> str:
+        """
+        Return the canonical key for a title, remembering new aliases.
+
+        Unknown titles resolve to their own normalized key without being registered;
+        call add() once a title is confirmed to be a real work. Only fuzzy matches are
+        remembered: a variant match depends on the stripped text, which the alias
+        would lose.
+        """
+        match = self._match(title)
+        if match is None:
+            return normalize_title(title)
+        canonical, _, how = match
+        if how == "fuzzy":
+            self.add_alias(title, canonical)
+        return canonical